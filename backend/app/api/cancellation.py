@@ -0,0 +1,63 @@
+"""Run heavy endpoint work so it stops when the client goes away."""
+
+import asyncio
+from functools import partial
+from typing import Any, Callable
+
+from fastapi import HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.cancellation import (
+    CancellationToken,
+    OperationCancelledError,
+    supersession_registry,
+)
+
+# Optional client header identifying a browser tab/session. A newer request with
+# the same key and operation supersedes (cancels) the older one.
+SESSION_KEY_HEADER = "X-Session-Key"
+
+# Non-standard status used by nginx for "client closed request"
+HTTP_499_CLIENT_CLOSED_REQUEST = 499
+
+DISCONNECT_POLL_SECONDS = 0.1
+
+
+async def _cancel_on_disconnect(request: Request, token: CancellationToken) -> None:
+    """Poll the ASGI connection and cancel the token once the client disconnects."""
+    while not token.cancelled:
+        if await request.is_disconnected():
+            token.cancel("client disconnected")
+            return
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+async def run_cancellable(
+    request: Request, operation: str, func: Callable[..., Any], *args, **kwargs
+) -> Any:
+    """
+    Run a blocking computation in the threadpool with a cancellation token.
+
+    The callable receives the token as the ``cancel_token`` keyword argument
+    and is expected to check it between units of work.
+    """
+    session_key = request.headers.get(SESSION_KEY_HEADER)
+    if session_key:
+        token = supersession_registry.register(session_key, operation)
+    else:
+        token = CancellationToken()
+
+    watcher = asyncio.create_task(_cancel_on_disconnect(request, token))
+    try:
+        return await run_in_threadpool(partial(func, *args, cancel_token=token, **kwargs))
+    except OperationCancelledError as e:
+        if e.reason == "superseded":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Request superseded by a newer request",
+            )
+        raise HTTPException(status_code=HTTP_499_CLIENT_CLOSED_REQUEST, detail=str(e))
+    finally:
+        watcher.cancel()
+        if session_key:
+            supersession_registry.release(session_key, operation, token)
@@ -2,28 +2,40 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.database import get_db
+from app.database import get_async_db, get_db, get_session_factory
+from app.repositories.account_repository import AsyncAccountRepository
+from app.schemas.bulk_import import ImportResult
 from app.schemas.account import Account, AccountCreate, AccountUpdate
 from app.services.account_service import AccountService
+from app.services.import_service import ImportService
+from app.services.retirement_scenario_service import refresh_outcomes_in_background
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
 
 @router.get("", response_model=list[Account])
-def list_accounts(db: Session = Depends(get_db)):
+async def list_accounts(db: AsyncSession = Depends(get_async_db)):
     """Get all accounts."""
-    service = AccountService(db)
-    return service.get_all_accounts()
+    return await AsyncAccountRepository(db).get_all()
 
 
 @router.get("/{account_id}", response_model=Account)
-def get_account(account_id: UUID, db: Session = Depends(get_db)):
+async def get_account(account_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Get account by ID."""
-    service = AccountService(db)
-    account = service.get_account_by_id(account_id)
+    account = await AsyncAccountRepository(db).get_by_id(account_id)
     if not account:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -32,20 +44,54 @@ def get_account(account_id: UUID, db: Session = Depends(get_db)):
     return account
 
 
+@router.post("/import", response_model=ImportResult)
+def import_accounts(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="CSV with a header row, or a JSON array"),
+    partial: bool = Query(False, description="Import the valid rows even if some are invalid"),
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """
+    Bulk import accounts from a CSV or JSON (.json) upload.
+
+    Runs in one transaction and reports every invalid row; without partial,
+    any invalid row means nothing is imported. Saved scenario outcomes are
+    recomputed in the background after an import.
+    """
+    service = ImportService(db)
+    try:
+        result = service.import_accounts(file.file, file.filename, partial=partial)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if result.imported:
+        background_tasks.add_task(refresh_outcomes_in_background, session_factory)
+    return result
+
+
 @router.post("", response_model=Account, status_code=status.HTTP_201_CREATED)
-def create_account(account_data: AccountCreate, db: Session = Depends(get_db)):
-    """Create a new account."""
+def create_account(
+    account_data: AccountCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """Create a new account; saved scenario outcomes are recomputed in the background."""
     service = AccountService(db)
-    return service.create_account(account_data)
+    account = service.create_account(account_data)
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
+    return account
 
 
 @router.put("/{account_id}", response_model=Account)
 def update_account(
     account_id: UUID,
     account_data: AccountUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
 ):
-    """Update an existing account."""
+    """Update an existing account; saved scenario outcomes are recomputed in the background."""
     service = AccountService(db)
     account = service.update_account(account_id, account_data)
     if not account:
@@ -53,12 +99,18 @@ def update_account(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Account with id {account_id} not found",
         )
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
     return account
 
 
 @router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_account(account_id: UUID, db: Session = Depends(get_db)):
-    """Delete an account."""
+def delete_account(
+    account_id: UUID,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """Delete an account; saved scenario outcomes are recomputed in the background."""
     service = AccountService(db)
     success = service.delete_account(account_id)
     if not success:
@@ -66,4 +118,5 @@ def delete_account(account_id: UUID, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Account with id {account_id} not found",
         )
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
     return None
@@ -2,16 +2,21 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.database import get_db
+from app.database import get_db, get_session_factory
 from app.models.fixed_expense import FixedExpense as FixedExpenseModel
+from app.models.scenario import SavedScenario as SavedScenarioModel
+from app.schemas.batch import BatchRequest, BatchResult
 from app.schemas.fixed_expense import (
     FixedExpense,
+    FixedExpenseBatchUpdate,
     FixedExpenseCreate,
     FixedExpenseUpdate,
 )
+from app.services.batch_writer import apply_batch
+from app.services.retirement_scenario_service import refresh_outcomes_in_background
 
 router = APIRouter(prefix="/fixed-expenses", tags=["fixed-expenses"])
 
@@ -43,9 +48,11 @@ def get_fixed_expense(
 @router.post("", response_model=FixedExpense, status_code=status.HTTP_201_CREATED)
 def create_fixed_expense(
     expense: FixedExpenseCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
 ):
-    """Create a new fixed expense."""
+    """Create a new fixed expense; its scenario's outcome is recomputed in the background."""
     # Validate end_year > start_year if both are set
     if expense.end_year and expense.end_year < expense.start_year:
         raise HTTPException(
@@ -64,6 +71,9 @@ def create_fixed_expense(
     db.add(db_expense)
     db.commit()
     db.refresh(db_expense)
+    background_tasks.add_task(
+        refresh_outcomes_in_background, session_factory, [db_expense.scenario_id]
+    )
     return db_expense
 
 
@@ -71,9 +81,11 @@ def create_fixed_expense(
 def update_fixed_expense(
     expense_id: UUID,
     expense: FixedExpenseUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
 ):
-    """Update a fixed expense."""
+    """Update a fixed expense; its scenario's outcome is recomputed in the background."""
     db_expense = db.query(FixedExpenseModel).filter(FixedExpenseModel.id == expense_id).first()
     if not db_expense:
         raise HTTPException(status_code=404, detail="Fixed expense not found")
@@ -94,18 +106,81 @@ def update_fixed_expense(
     
     db.commit()
     db.refresh(db_expense)
+    background_tasks.add_task(
+        refresh_outcomes_in_background, session_factory, [db_expense.scenario_id]
+    )
     return db_expense
 
 
 @router.delete("/{expense_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_fixed_expense(
     expense_id: UUID,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
 ):
-    """Delete a fixed expense."""
+    """Delete a fixed expense; its scenario's outcome is recomputed in the background."""
     db_expense = db.query(FixedExpenseModel).filter(FixedExpenseModel.id == expense_id).first()
     if not db_expense:
         raise HTTPException(status_code=404, detail="Fixed expense not found")
     
+    scenario_id = db_expense.scenario_id
     db.delete(db_expense)
     db.commit()
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory, [scenario_id])
+
+
+@router.patch(":batch", response_model=BatchResult)
+def batch_fixed_expenses(
+    batch: BatchRequest[FixedExpenseCreate, FixedExpenseBatchUpdate],
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """
+    Create, update and delete fixed expenses in one transaction.
+
+    Every item is validated first; if any is invalid nothing is applied and
+    the per-item results say which. Outcomes of the scenarios whose expenses
+    changed are recomputed in the background.
+    """
+    scenario_ids = {expense.scenario_id for expense in batch.create}
+    known = (
+        {
+            row.id
+            for row in db.query(SavedScenarioModel.id)
+            .filter(SavedScenarioModel.id.in_(scenario_ids))
+            .all()
+        }
+        if scenario_ids
+        else set()
+    )
+
+    def check_years(start_year: int, end_year: int | None) -> None:
+        if end_year and end_year < start_year:
+            raise ValueError("End year must be greater than or equal to start year")
+
+    def check_create(expense: FixedExpenseCreate) -> None:
+        if expense.scenario_id not in known:
+            raise ValueError(f"Scenario {expense.scenario_id} not found")
+        check_years(expense.start_year, expense.end_year)
+
+    def check_update(expense: FixedExpenseModel, changes: dict) -> None:
+        check_years(
+            changes.get("start_year", expense.start_year),
+            changes.get("end_year", expense.end_year),
+        )
+
+    # Scenarios of the updated and deleted expenses, read before they change
+    changed = [expense.id for expense in batch.update] + batch.delete
+    affected = known | {
+        row.scenario_id
+        for row in db.query(FixedExpenseModel.scenario_id)
+        .filter(FixedExpenseModel.id.in_(changed))
+        .all()
+    }
+
+    result = apply_batch(db, FixedExpenseModel, batch, check_create, check_update)
+    if result.applied and affected:
+        background_tasks.add_task(refresh_outcomes_in_background, session_factory, list(affected))
+    return result
@@ -2,27 +2,42 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.database import get_db
+from app.database import get_async_db, get_db, get_session_factory
+from app.repositories.holding_repository import AsyncHoldingRepository
+from app.schemas.batch import BatchRequest, BatchResult
+from app.schemas.bulk_import import ImportResult
 from app.schemas.holding import (
     AccountHoldingsSummary,
     Holding,
+    HoldingBatchUpdate,
     HoldingCreate,
     HoldingUpdate,
     PortfolioAllocation,
 )
 from app.services.holding_service import HoldingService
+from app.services.import_service import ImportService
+from app.services.retirement_scenario_service import refresh_outcomes_in_background
 
 router = APIRouter(prefix="/holdings", tags=["holdings"])
 
 
 @router.get("", response_model=list[Holding])
-def list_holdings(db: Session = Depends(get_db)):
+async def list_holdings(db: AsyncSession = Depends(get_async_db)):
     """Get all holdings across all accounts."""
-    service = HoldingService(db)
-    return service.get_all_holdings()
+    return await AsyncHoldingRepository(db).get_all()
 
 
 @router.get("/portfolio-allocation", response_model=PortfolioAllocation)
@@ -33,10 +48,9 @@ def get_portfolio_allocation(db: Session = Depends(get_db)):
 
 
 @router.get("/account/{account_id}", response_model=list[Holding])
-def get_account_holdings(account_id: UUID, db: Session = Depends(get_db)):
+async def get_account_holdings(account_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Get all holdings for a specific account."""
-    service = HoldingService(db)
-    return service.get_holdings_by_account(account_id)
+    return await AsyncHoldingRepository(db).get_by_account(account_id)
 
 
 @router.get("/account/{account_id}/summary", response_model=AccountHoldingsSummary)
@@ -53,10 +67,9 @@ def get_account_holdings_summary(account_id: UUID, db: Session = Depends(get_db)
 
 
 @router.get("/{holding_id}", response_model=Holding)
-def get_holding(holding_id: UUID, db: Session = Depends(get_db)):
+async def get_holding(holding_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Get holding by ID."""
-    service = HoldingService(db)
-    holding = service.get_holding_by_id(holding_id)
+    holding = await AsyncHoldingRepository(db).get_by_id(holding_id)
     if not holding:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -65,23 +78,57 @@ def get_holding(holding_id: UUID, db: Session = Depends(get_db)):
     return holding
 
 
+@router.post("/import", response_model=ImportResult)
+def import_holdings(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="CSV with a header row, or a JSON array"),
+    partial: bool = Query(False, description="Import the valid rows even if some are invalid"),
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """
+    Bulk import holdings from a CSV or JSON (.json) upload.
+
+    Runs in one transaction and reports every invalid row; without partial,
+    any invalid row means nothing is imported. Saved scenario outcomes are
+    recomputed in the background after an import.
+    """
+    service = ImportService(db)
+    try:
+        result = service.import_holdings(file.file, file.filename, partial=partial)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if result.imported:
+        background_tasks.add_task(refresh_outcomes_in_background, session_factory)
+    return result
+
+
 @router.post("", response_model=Holding, status_code=status.HTTP_201_CREATED)
-def create_holding(holding_data: HoldingCreate, db: Session = Depends(get_db)):
-    """Create a new holding."""
+def create_holding(
+    holding_data: HoldingCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """Create a new holding; saved scenario outcomes are recomputed in the background."""
     service = HoldingService(db)
     try:
-        return service.create_holding(holding_data)
+        holding = service.create_holding(holding_data)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
+    return holding
 
 
 @router.put("/{holding_id}", response_model=Holding)
 def update_holding(
     holding_id: UUID,
     holding_data: HoldingUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
 ):
-    """Update an existing holding."""
+    """Update an existing holding; saved scenario outcomes are recomputed in the background."""
     service = HoldingService(db)
     holding = service.update_holding(holding_id, holding_data)
     if not holding:
@@ -89,12 +136,18 @@ def update_holding(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Holding {holding_id} not found",
         )
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
     return holding
 
 
 @router.delete("/{holding_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_holding(holding_id: UUID, db: Session = Depends(get_db)):
-    """Delete a holding."""
+def delete_holding(
+    holding_id: UUID,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """Delete a holding; saved scenario outcomes are recomputed in the background."""
     service = HoldingService(db)
     success = service.delete_holding(holding_id)
     if not success:
@@ -102,4 +155,26 @@ def delete_holding(holding_id: UUID, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Holding {holding_id} not found",
         )
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
     return None
+
+
+@router.patch(":batch", response_model=BatchResult)
+def batch_holdings(
+    batch: BatchRequest[HoldingCreate, HoldingBatchUpdate],
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """
+    Create, update and delete holdings in one transaction.
+
+    Every item is validated first; if any is invalid nothing is applied and
+    the per-item results say which. Saved scenario outcomes are recomputed
+    in the background once a batch is applied.
+    """
+    service = HoldingService(db)
+    result = service.apply_batch(batch)
+    if result.applied:
+        background_tasks.add_task(refresh_outcomes_in_background, session_factory)
+    return result
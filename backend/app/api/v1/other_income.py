@@ -3,18 +3,21 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.database import get_db
+from app.database import get_db, get_session_factory
+from app.schemas.batch import BatchRequest, BatchResult
 from app.schemas.other_income import (
     OtherIncome,
+    OtherIncomeBatchUpdate,
     OtherIncomeCreate,
     OtherIncomeProjection,
     OtherIncomeSummary,
     OtherIncomeUpdate,
 )
 from app.services.other_income_service import OtherIncomeService
+from app.services.retirement_scenario_service import refresh_outcomes_in_background
 
 router = APIRouter(prefix="/other-income", tags=["other-income"])
 
@@ -84,22 +87,37 @@ def get_other_income(income_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("", response_model=OtherIncome, status_code=status.HTTP_201_CREATED)
-def create_other_income(income_data: OtherIncomeCreate, db: Session = Depends(get_db)):
-    """Create a new other income source."""
+def create_other_income(
+    income_data: OtherIncomeCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """
+    Create a new other income source; saved scenario outcomes are
+    recomputed in the background.
+    """
     service = OtherIncomeService(db)
     try:
-        return service.create_income(income_data)
+        income = service.create_income(income_data)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
+    return income
 
 
 @router.put("/{income_id}", response_model=OtherIncome)
 def update_other_income(
     income_id: UUID,
     income_data: OtherIncomeUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
 ):
-    """Update an existing other income source."""
+    """
+    Update an existing other income source; saved scenario outcomes are
+    recomputed in the background.
+    """
     service = OtherIncomeService(db)
     income = service.update_income(income_id, income_data)
     if not income:
@@ -107,12 +125,18 @@ def update_other_income(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Other income with id {income_id} not found",
         )
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
     return income
 
 
 @router.delete("/{income_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_other_income(income_id: UUID, db: Session = Depends(get_db)):
-    """Delete an other income source."""
+def delete_other_income(
+    income_id: UUID,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """Delete an other income source; saved scenario outcomes are recomputed in the background."""
     service = OtherIncomeService(db)
     success = service.delete_income(income_id)
     if not success:
@@ -120,4 +144,26 @@ def delete_other_income(income_id: UUID, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Other income with id {income_id} not found",
         )
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
     return None
+
+
+@router.patch(":batch", response_model=BatchResult)
+def batch_other_income(
+    batch: BatchRequest[OtherIncomeCreate, OtherIncomeBatchUpdate],
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """
+    Create, update and delete other income sources in one transaction.
+
+    Every item is validated first; if any is invalid nothing is applied and
+    the per-item results say which. Saved scenario outcomes are recomputed
+    in the background once a batch is applied.
+    """
+    service = OtherIncomeService(db)
+    result = service.apply_batch(batch)
+    if result.applied:
+        background_tasks.add_task(refresh_outcomes_in_background, session_factory)
+    return result
@@ -1,9 +1,11 @@
 """Planned spending API endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_async_db, get_db, get_read_db
+from app.repositories.planned_spending_repository import AsyncPlannedSpendingRepository
 from app.schemas.planned_spending import (
     PlannedSpending,
     PlannedSpendingCreate,
@@ -15,10 +17,9 @@ router = APIRouter(prefix="/planned-spending", tags=["planned-spending"])
 
 
 @router.get("", response_model=PlannedSpending | None)
-def get_planned_spending(db: Session = Depends(get_db)):
+async def get_planned_spending(db: AsyncSession = Depends(get_async_db)):
     """Get the planned spending configuration."""
-    service = PlannedSpendingService(db)
-    return service.get_planned_spending()
+    return await AsyncPlannedSpendingRepository(db).get()
 
 
 @router.post("", response_model=PlannedSpending, status_code=status.HTTP_201_CREATED)
@@ -56,7 +57,7 @@ def delete_planned_spending(db: Session = Depends(get_db)):
 
 
 @router.get("/total-annual")
-def get_total_annual_spending(db: Session = Depends(get_db)):
+def get_total_annual_spending(db: Session = Depends(get_read_db)):
     """Get total annual spending (monthly * 12 + annual lump sum)."""
     service = PlannedSpendingService(db)
     total = service.get_total_annual_spending()
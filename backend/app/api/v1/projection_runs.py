@@ -0,0 +1,51 @@
+"""Stored projection runs API endpoints."""
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.projection_run import ProjectionRunDiff, ProjectionRunSummary
+from app.schemas.scenario import ScenarioProjectionResult
+from app.services.projection_run_service import ProjectionRunService
+
+# Runs are stored on the primary by the projection a client has just requested,
+# so these endpoints read there (get_db) rather than from a lagging replica
+router = APIRouter(prefix="/projection-runs", tags=["projection-runs"])
+
+
+@router.get("", response_model=list[ProjectionRunSummary])
+def list_runs(
+    scenario_id: UUID = Query(..., description="Saved scenario whose runs to list"),
+    db: Session = Depends(get_db),
+):
+    """Get the stored projection runs of a scenario, newest first."""
+    service = ProjectionRunService(db)
+    return service.list_runs(scenario_id)
+
+
+@router.get("/{run_id}", response_model=ScenarioProjectionResult)
+def get_run(run_id: UUID, db: Session = Depends(get_db)):
+    """Get the full result of a stored run."""
+    service = ProjectionRunService(db)
+    result = service.get_result(run_id)
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Projection run {run_id} not found",
+        )
+    return result
+
+
+@router.get("/{run_id}/diff/{other_run_id}", response_model=ProjectionRunDiff)
+def diff_runs(run_id: UUID, other_run_id: UUID, db: Session = Depends(get_db)):
+    """Compare two stored runs without recomputing either (other minus base)."""
+    service = ProjectionRunService(db)
+    diff = service.diff_runs(run_id, other_run_id)
+    if not diff:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Projection run {run_id} or {other_run_id} not found",
+        )
+    return diff
@@ -10,10 +10,12 @@ from app.api.v1 import (
     other_income,
     planned_fixed_expenses,
     planned_spending,
+    projection_runs,
     saved_scenarios,
     scenarios,
     social_security,
     tax_config,
+    tax_lots,
     tax_tables,
 )
 
@@ -21,10 +23,12 @@ api_router = APIRouter()
 
 api_router.include_router(accounts.router)
 api_router.include_router(holdings.router)
+api_router.include_router(tax_lots.router)
 api_router.include_router(social_security.router)
 api_router.include_router(asset_projections.router)
 api_router.include_router(scenarios.router)
 api_router.include_router(saved_scenarios.router)
+api_router.include_router(projection_runs.router)
 api_router.include_router(fixed_expenses.router)
 api_router.include_router(planned_fixed_expenses.router)
 api_router.include_router(planned_spending.router)
@@ -1,35 +1,96 @@
 """Saved Scenarios API endpoints."""
 
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.database import get_db
+from app.api.cancellation import run_cancellable
+from app.database import get_async_db, get_db, get_session_factory
+from app.repositories.scenario_repository import AsyncScenarioRepository
 from app.schemas.scenario import (
+    InflationModel,
+    LifeTableSex,
+    MortalityMode,
     SavedScenario,
     SavedScenarioCreate,
+    SavedScenarioSummary,
     SavedScenarioUpdate,
+    ScenarioListFields,
+    ScenarioOutcomeFilter,
     ScenarioProjectionResult,
     ScenarioComparisonResult,
+    ScenarioVariantsCreate,
+    SimulationResult,
+    RothConversionRequest,
+    RothConversionResult,
+    WithdrawalStrategyComparison,
+)
+from app.services.retirement_scenario_service import (
+    RetirementScenarioService,
+    list_scenarios_async,
+    refresh_outcomes_in_background,
+)
+from app.services.roth_conversion_service import RothConversionService
+from app.services.simulation_service import (
+    DEFAULT_PATHS,
+    DEFAULT_STRATEGY_PATHS,
+    MAX_PATHS,
+    MAX_STRATEGY_PATHS,
+    SimulationService,
 )
-from app.services.retirement_scenario_service import RetirementScenarioService
 
 router = APIRouter(prefix="/saved-scenarios", tags=["saved-scenarios"])
 
+# Response header carrying the cursor of the next page of scenarios
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
-@router.get("", response_model=list[SavedScenario])
-def list_scenarios(db: Session = Depends(get_db)):
-    """Get all saved scenarios."""
-    service = RetirementScenarioService(db)
-    return service.get_all_scenarios()
+
+@router.get("", response_model=list[SavedScenario] | list[SavedScenarioSummary])
+async def list_scenarios(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=500, description="Page size (all when omitted)"),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
+    fields: ScenarioListFields = Query(
+        "full", description="summary leaves out the allocation and other JSON settings"
+    ),
+    outcome: ScenarioOutcomeFilter = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get saved scenarios, most recently updated first.
+
+    Pages are keyset-paginated: the X-Next-Cursor response header, when
+    present, fetches the next page. Each scenario carries the cached
+    headline of its last projection, and the outcome bounds (min_final,
+    max_depletion_year, ...) search on it with indexed queries.
+    """
+    try:
+        scenarios, next_cursor = await list_scenarios_async(
+            db, limit, cursor, summary=fields == "summary", outcome=outcome
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return scenarios
 
 
 @router.get("/{scenario_id}", response_model=SavedScenario)
-def get_scenario(scenario_id: UUID, db: Session = Depends(get_db)):
+async def get_scenario(scenario_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Get a saved scenario by ID."""
-    service = RetirementScenarioService(db)
-    scenario = service.get_scenario_by_id(scenario_id)
+    scenario = await AsyncScenarioRepository(db).get_by_id(scenario_id)
     if not scenario:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -38,20 +99,41 @@ def get_scenario(scenario_id: UUID, db: Session = Depends(get_db)):
     return scenario
 
 
+@router.post("/outcomes/refresh", status_code=status.HTTP_202_ACCEPTED)
+def refresh_scenario_outcomes(
+    background_tasks: BackgroundTasks, session_factory: sessionmaker = Depends(get_session_factory)
+):
+    """
+    Re-project every scenario in the background to refresh cached outcomes,
+    e.g. after data was changed outside the API.
+    """
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
+    return {"status": "accepted"}
+
+
 @router.post("", response_model=SavedScenario, status_code=status.HTTP_201_CREATED)
-def create_scenario(scenario_data: SavedScenarioCreate, db: Session = Depends(get_db)):
-    """Create a new saved scenario."""
+def create_scenario(
+    scenario_data: SavedScenarioCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """Create a new saved scenario; its outcome is computed in the background."""
     service = RetirementScenarioService(db)
-    return service.create_scenario(scenario_data)
+    scenario = service.create_scenario(scenario_data)
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory, [scenario.id])
+    return scenario
 
 
 @router.put("/{scenario_id}", response_model=SavedScenario)
 def update_scenario(
     scenario_id: UUID,
     scenario_data: SavedScenarioUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
 ):
-    """Update an existing scenario."""
+    """Update an existing scenario; its outcome is recomputed in the background."""
     service = RetirementScenarioService(db)
     scenario = service.update_scenario(scenario_id, scenario_data)
     if not scenario:
@@ -59,6 +141,7 @@ def update_scenario(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Scenario {scenario_id} not found",
         )
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory, [scenario.id])
     return scenario
 
 
@@ -78,8 +161,10 @@ def delete_scenario(scenario_id: UUID, db: Session = Depends(get_db)):
 @router.post("/{scenario_id}/duplicate", response_model=SavedScenario)
 def duplicate_scenario(
     scenario_id: UUID,
+    background_tasks: BackgroundTasks,
     new_name: str = Query(..., min_length=1, description="Name for the duplicated scenario"),
     db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
 ):
     """Duplicate an existing scenario with a new name."""
     service = RetirementScenarioService(db)
@@ -89,32 +174,163 @@ def duplicate_scenario(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Scenario {scenario_id} not found",
         )
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory, [scenario.id])
     return scenario
 
 
+@router.post(
+    "/{scenario_id}/variants",
+    response_model=list[SavedScenario],
+    status_code=status.HTTP_201_CREATED,
+)
+def clone_scenario_variants(
+    scenario_id: UUID,
+    variants_data: ScenarioVariantsCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """Clone a scenario into several variants, each with its own overrides, in one transaction."""
+    service = RetirementScenarioService(db)
+    scenarios = service.clone_variants(scenario_id, variants_data.variants)
+    if scenarios is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scenario {scenario_id} not found",
+        )
+    background_tasks.add_task(
+        refresh_outcomes_in_background, session_factory, [s.id for s in scenarios]
+    )
+    return scenarios
+
+
 @router.get("/{scenario_id}/projection", response_model=ScenarioProjectionResult)
-def get_scenario_projection(scenario_id: UUID, db: Session = Depends(get_db)):
+async def get_scenario_projection(
+    scenario_id: UUID, request: Request, db: Session = Depends(get_db)
+):
     """Generate projection for a saved scenario."""
     service = RetirementScenarioService(db)
     try:
-        return service.generate_projection(scenario_id=scenario_id)
+        return await run_cancellable(
+            request,
+            f"projection:{scenario_id}",
+            service.generate_projection,
+            scenario_id=scenario_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{scenario_id}/simulation", response_model=SimulationResult)
+async def simulate_scenario(
+    scenario_id: UUID,
+    request: Request,
+    paths: int = Query(DEFAULT_PATHS, ge=1, le=MAX_PATHS, description="Number of return paths"),
+    seed: int | None = Query(None, ge=0, description="Random seed for a reproducible run"),
+    mortality: MortalityMode | None = Query(
+        None, description="Sample a lifetime per path: single, or joint (last survivor)"
+    ),
+    sex: LifeTableSex = Query("unisex", description="Life table for the person"),
+    spouse_sex: LifeTableSex = Query("unisex", description="Life table for the spouse (joint)"),
+    inflation: InflationModel = Query(
+        "fixed", description="Fixed scenario rate, or stochastic inflation drawn with returns"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Run a Monte Carlo simulation for a saved scenario."""
+    service = SimulationService(db)
+    try:
+        return await run_cancellable(
+            request,
+            f"simulation:{scenario_id}",
+            service.run_simulation,
+            scenario_id=scenario_id,
+            n_paths=paths,
+            seed=seed,
+            mortality=mortality,
+            sex=sex,
+            spouse_sex=spouse_sex,
+            inflation=inflation,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{scenario_id}/withdrawal-strategies", response_model=WithdrawalStrategyComparison)
+async def compare_withdrawal_strategies(
+    scenario_id: UUID,
+    request: Request,
+    rank_by: Literal["after_tax_wealth", "lifetime_tax", "depletion_year"] = Query(
+        "after_tax_wealth", description="Metric that orders the strategies"
+    ),
+    paths: int = Query(
+        DEFAULT_STRATEGY_PATHS,
+        ge=0,
+        le=MAX_STRATEGY_PATHS,
+        description="Simulated paths per strategy for success probability (0 to skip)",
+    ),
+    seed: int | None = Query(None, ge=0, description="Random seed for a reproducible run"),
+    pretax_tax_rate_percent: float = Query(
+        22.0, ge=0, le=50, description="Tax rate charged on pretax money left at the end"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Evaluate and rank every withdrawal strategy for a saved scenario."""
+    service = SimulationService(db)
+    try:
+        return await run_cancellable(
+            request,
+            f"withdrawal-strategies:{scenario_id}",
+            service.compare_withdrawal_strategies,
+            scenario_id=scenario_id,
+            rank_by=rank_by,
+            n_paths=paths,
+            seed=seed,
+            pretax_tax_rate=pretax_tax_rate_percent / 100,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{scenario_id}/optimize/roth-conversions", response_model=RothConversionResult)
+async def optimize_roth_conversions(
+    scenario_id: UUID,
+    request: Request,
+    options: RothConversionRequest | None = None,
+    db: Session = Depends(get_db),
+):
+    """Search bracket-filling Roth conversion policies for a saved scenario."""
+    service = RothConversionService(db)
+    try:
+        return await run_cancellable(
+            request,
+            f"roth-conversions:{scenario_id}",
+            service.optimize,
+            scenario_id=scenario_id,
+            options=options,
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("/projection", response_model=ScenarioProjectionResult)
-def generate_adhoc_projection(scenario_data: SavedScenarioCreate, db: Session = Depends(get_db)):
+async def generate_adhoc_projection(
+    scenario_data: SavedScenarioCreate, request: Request, db: Session = Depends(get_db)
+):
     """Generate projection for ad-hoc scenario data (without saving)."""
     service = RetirementScenarioService(db)
     try:
-        return service.generate_projection(scenario_data=scenario_data)
+        return await run_cancellable(
+            request, "adhoc-projection", service.generate_projection, scenario_data=scenario_data
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("/compare", response_model=ScenarioComparisonResult)
-def compare_scenarios(
+async def compare_scenarios(
     scenario_ids: list[UUID],
+    request: Request,
     db: Session = Depends(get_db),
 ):
     """Compare multiple saved scenarios."""
@@ -124,7 +340,7 @@ def compare_scenarios(
             detail="At least 2 scenarios required for comparison",
         )
     service = RetirementScenarioService(db)
-    return service.compare_scenarios(scenario_ids)
+    return await run_cancellable(request, "compare", service.compare_scenarios, scenario_ids)
 
 
 @router.post("/default", response_model=SavedScenario, status_code=status.HTTP_201_CREATED)
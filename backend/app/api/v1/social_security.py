@@ -1,37 +1,57 @@
 """Social Security API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.database import get_db
+from app.database import get_async_db, get_db, get_read_db, get_session_factory
+from app.repositories.social_security_repository import AsyncSocialSecurityRepository
 from app.schemas.social_security import (
     SocialSecurity,
     SocialSecurityCreate,
     SocialSecurityPaymentProjection,
     SocialSecurityUpdate,
 )
+from app.services.retirement_scenario_service import refresh_outcomes_in_background
 from app.services.social_security_service import SocialSecurityService
 
 router = APIRouter(prefix="/social-security", tags=["social-security"])
 
 
 @router.get("", response_model=SocialSecurity | None)
-def get_social_security(db: Session = Depends(get_db)):
+async def get_social_security(db: AsyncSession = Depends(get_async_db)):
     """Get Social Security configuration."""
-    service = SocialSecurityService(db)
-    return service.get_social_security()
+    return await AsyncSocialSecurityRepository(db).get()
 
 
 @router.post("", response_model=SocialSecurity, status_code=status.HTTP_201_CREATED)
-def create_social_security(ss_data: SocialSecurityCreate, db: Session = Depends(get_db)):
-    """Create or update Social Security configuration."""
+def create_social_security(
+    ss_data: SocialSecurityCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """
+    Create or update Social Security configuration; saved scenario outcomes
+    are recomputed in the background.
+    """
     service = SocialSecurityService(db)
-    return service.create_social_security(ss_data)
+    ss = service.create_social_security(ss_data)
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
+    return ss
 
 
 @router.put("", response_model=SocialSecurity)
-def update_social_security(ss_data: SocialSecurityUpdate, db: Session = Depends(get_db)):
-    """Update Social Security configuration."""
+def update_social_security(
+    ss_data: SocialSecurityUpdate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """
+    Update Social Security configuration; saved scenario outcomes are
+    recomputed in the background.
+    """
     service = SocialSecurityService(db)
     ss = service.update_social_security(ss_data)
     if not ss:
@@ -39,11 +59,16 @@ def update_social_security(ss_data: SocialSecurityUpdate, db: Session = Depends(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Social Security configuration not found. Create it first.",
         )
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
     return ss
 
 
 @router.delete("", status_code=status.HTTP_204_NO_CONTENT)
-def delete_social_security(db: Session = Depends(get_db)):
+def delete_social_security(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
     """Delete Social Security configuration."""
     service = SocialSecurityService(db)
     success = service.delete_social_security()
@@ -52,11 +77,12 @@ def delete_social_security(db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Social Security configuration not found",
         )
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
     return None
 
 
 @router.get("/projections", response_model=list[SocialSecurityPaymentProjection])
-def get_payment_projections(db: Session = Depends(get_db)):
+def get_payment_projections(db: Session = Depends(get_read_db)):
     """Get Social Security payment projections from age 62 to 70."""
     service = SocialSecurityService(db)
     ss = service.get_social_security()
@@ -2,10 +2,12 @@
 
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.database import get_db
+from app.database import get_async_db, get_db, get_read_db, get_session_factory
+from app.repositories.tax_config_repository import AsyncTaxConfigRepository
 from app.schemas.tax_config import (
     SeniorDeductionBreakdown,
     TaxConfig,
@@ -13,6 +15,7 @@ from app.schemas.tax_config import (
     TaxConfigUpdate,
 )
 from app.services.other_income_service import OtherIncomeService
+from app.services.retirement_scenario_service import refresh_outcomes_in_background
 from app.services.social_security_service import SocialSecurityService
 from app.services.tax_config_service import TaxConfigService
 
@@ -20,40 +23,64 @@ router = APIRouter(prefix="/tax-config", tags=["tax-config"])
 
 
 @router.get("", response_model=TaxConfig | None)
-def get_tax_config(db: Session = Depends(get_db)):
+async def get_tax_config(db: AsyncSession = Depends(get_async_db)):
     """Get the tax configuration."""
-    service = TaxConfigService(db)
-    return service.get_tax_config()
+    return await AsyncTaxConfigRepository(db).get()
 
 
 @router.post("", response_model=TaxConfig, status_code=status.HTTP_201_CREATED)
-def create_tax_config(tax_config_data: TaxConfigCreate, db: Session = Depends(get_db)):
-    """Create a new tax configuration."""
+def create_tax_config(
+    tax_config_data: TaxConfigCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """
+    Create a new tax configuration; saved scenario outcomes are recomputed
+    in the background.
+    """
     service = TaxConfigService(db)
     try:
-        return service.create_tax_config(tax_config_data)
+        tax_config = service.create_tax_config(tax_config_data)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
+    return tax_config
 
 
 @router.put("", response_model=TaxConfig)
-def update_tax_config(tax_config_data: TaxConfigUpdate, db: Session = Depends(get_db)):
-    """Update existing tax configuration."""
+def update_tax_config(
+    tax_config_data: TaxConfigUpdate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    """
+    Update existing tax configuration; saved scenario outcomes are
+    recomputed in the background.
+    """
     service = TaxConfigService(db)
     try:
-        return service.update_tax_config(tax_config_data)
+        tax_config = service.update_tax_config(tax_config_data)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
+    return tax_config
 
 
 @router.delete("", status_code=status.HTTP_204_NO_CONTENT)
-def delete_tax_config(db: Session = Depends(get_db)):
+def delete_tax_config(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
     """Delete tax configuration."""
     service = TaxConfigService(db)
     try:
         service.delete_tax_config()
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    background_tasks.add_task(refresh_outcomes_in_background, session_factory)
 
 
 @router.get("/senior-deductions", response_model=SeniorDeductionBreakdown)
@@ -74,7 +101,7 @@ def calculate_senior_deductions(
 
 
 @router.get("/estimated-annual-income")
-def get_estimated_annual_income(db: Session = Depends(get_db)):
+def get_estimated_annual_income(db: Session = Depends(get_read_db)):
     """
     Calculate estimated annual income from Social Security and Other Income sources.
 
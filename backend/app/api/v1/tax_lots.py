@@ -0,0 +1,68 @@
+"""Tax lots API endpoints."""
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.tax_lot import TaxLot, TaxLotCreate, TaxLotUpdate
+from app.services.tax_lot_service import TaxLotService
+
+router = APIRouter(prefix="/tax-lots", tags=["tax-lots"])
+
+
+@router.get("/holding/{holding_id}", response_model=list[TaxLot])
+def get_holding_lots(holding_id: UUID, db: Session = Depends(get_db)):
+    """Get all tax lots of a holding."""
+    service = TaxLotService(db)
+    return service.get_lots_by_holding(holding_id)
+
+
+@router.get("/{lot_id}", response_model=TaxLot)
+def get_lot(lot_id: UUID, db: Session = Depends(get_db)):
+    """Get tax lot by ID."""
+    service = TaxLotService(db)
+    lot = service.get_lot_by_id(lot_id)
+    if not lot:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tax lot {lot_id} not found",
+        )
+    return lot
+
+
+@router.post("", response_model=TaxLot, status_code=status.HTTP_201_CREATED)
+def create_lot(lot_data: TaxLotCreate, db: Session = Depends(get_db)):
+    """Create a new tax lot."""
+    service = TaxLotService(db)
+    try:
+        return service.create_lot(lot_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.put("/{lot_id}", response_model=TaxLot)
+def update_lot(lot_id: UUID, lot_data: TaxLotUpdate, db: Session = Depends(get_db)):
+    """Update an existing tax lot."""
+    service = TaxLotService(db)
+    lot = service.update_lot(lot_id, lot_data)
+    if not lot:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tax lot {lot_id} not found",
+        )
+    return lot
+
+
+@router.delete("/{lot_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_lot(lot_id: UUID, db: Session = Depends(get_db)):
+    """Delete a tax lot."""
+    service = TaxLotService(db)
+    success = service.delete_lot(lot_id)
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tax lot {lot_id} not found",
+        )
+    return None
@@ -1,6 +1,7 @@
 """Tax tables API endpoints for reading tax bracket data."""
 
 import json
+from functools import lru_cache
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException
@@ -20,12 +21,18 @@ if not COLORADO_FILE.exists():
     COLORADO_FILE = BASE_DIR / "data" / "colorado_state_tax_tables.json"
 
 
+@lru_cache(maxsize=None)
+def _load_tables(path: Path) -> dict:
+    """Parsed tax tables file, read once per process (the data files are read-only)."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
 @router.get("/us-federal")
-def get_us_federal_tax_tables():
+async def get_us_federal_tax_tables():
     """Get US federal tax brackets and standard deductions."""
     try:
-        with open(US_FEDERAL_FILE, "r") as f:
-            data = json.load(f)
+        data = _load_tables(US_FEDERAL_FILE)
         return data
     except FileNotFoundError:
         raise HTTPException(
@@ -40,11 +47,10 @@ def get_us_federal_tax_tables():
 
 
 @router.get("/colorado")
-def get_colorado_tax_tables():
+async def get_colorado_tax_tables():
     """Get Colorado state tax information."""
     try:
-        with open(COLORADO_FILE, "r") as f:
-            data = json.load(f)
+        data = _load_tables(COLORADO_FILE)
         return data
     except FileNotFoundError:
         raise HTTPException(
@@ -59,11 +65,10 @@ def get_colorado_tax_tables():
 
 
 @router.get("/standard-deductions/{tax_year}")
-def get_standard_deductions(tax_year: int):
+async def get_standard_deductions(tax_year: int):
     """Get standard deductions for a specific tax year."""
     try:
-        with open(US_FEDERAL_FILE, "r") as f:
-            data = json.load(f)
+        data = _load_tables(US_FEDERAL_FILE)
 
         if str(tax_year) not in data.get("standard_deductions", {}):
             raise HTTPException(
@@ -1,5 +1,7 @@
 """Application configuration."""
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,10 +9,37 @@ class Settings(BaseSettings):
     """Application settings."""
 
     database_url: str
+    # Read replica for read-only sessions (get_read_db and the async path)
+    database_read_url: str | None = None
+    # Async driver URL for read-only endpoints; derived from the read URL when unset
+    async_database_url: str | None = None
+
+    # Connection pool, per engine
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800  # seconds; -1 keeps connections forever
+    # always pings on every checkout; idle only after db_pre_ping_idle_seconds in the pool
+    db_pre_ping: Literal["always", "idle", "never"] = "idle"
+    db_pre_ping_idle_seconds: float = 30.0
+    # Compiled SQL cached per engine, and asyncpg server-side prepared statements
+    db_query_cache_size: int = 500
+    db_prepared_statement_cache_size: int = 100
     environment: str = "development"
     debug: bool = False
     api_v1_prefix: str = "/api/v1"
 
+    # Precomputed Monte Carlo return paths (see scripts/build_path_library.py)
+    path_library_dir: str = "path_library"
+    path_library_seeds: list[int] = [0, 1, 2, 3]
+    path_library_paths: int = 25000
+    path_library_years: int = 50
+    path_library_build_on_startup: bool = False
+
+    # Monte Carlo worker processes (0 runs simulations in the request thread)
+    simulation_workers: int = 0
+    simulation_parallel_min_paths: int = 20000
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,18 +1,80 @@
 """Database configuration and session management."""
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
+from app.utils.pool_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, ping_when_idle
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    echo=settings.debug,
+# Async drivers for the sync URL's backend, used by the read-only async path
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """The URL of the same database through its async driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver for database backend: {backend}")
+    parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    if backend == "postgresql":
+        parsed = parsed.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.db_prepared_statement_cache_size)}
+        )
+    return parsed.render_as_string(hide_password=False)
+
+
+def engine_options(url: str, poolclass) -> dict:
+    """Engine keyword arguments for a URL, from the pool settings."""
+    options = {"echo": settings.debug, "query_cache_size": settings.db_query_cache_size}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options  # one shared in-memory connection, nothing to size
+    return options | {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pre_ping == "always",
+    }
+
+
+def create_database_engine(url: str) -> Engine:
+    """Engine with the configured pool, checkout metrics and pre-ping strategy."""
+    engine = create_engine(url, **engine_options(url, TimedQueuePool))
+    if settings.db_pre_ping == "idle":
+        ping_when_idle(engine, settings.db_pre_ping_idle_seconds)
+    return engine
+
+
+def create_async_database_engine(url: str) -> AsyncEngine:
+    """Async engine with the configured pool, checkout metrics and pre-ping strategy."""
+    engine = create_async_engine(url, **engine_options(url, TimedAsyncAdaptedQueuePool))
+    if settings.db_pre_ping == "idle":
+        ping_when_idle(engine.sync_engine, settings.db_pre_ping_idle_seconds)
+    return engine
+
+
+engine = create_database_engine(settings.database_url)
+# Read-only sessions go to the replica when one is configured
+read_engine = (
+    create_database_engine(settings.database_read_url) if settings.database_read_url else engine
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+async_engine = create_async_database_engine(
+    settings.async_database_url
+    or async_database_url(settings.database_read_url or settings.database_url)
+)
+
+# Loaded objects stay readable after the session closes (no lazy refresh)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
 
 Base = declarative_base()
 
@@ -24,3 +86,59 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """
+    Dependency for getting a session for read-only endpoints.
+
+    Reads go to the replica when DATABASE_READ_URL is set, so they may lag
+    writes slightly; anything that writes or must read its own writes uses
+    get_db.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_session_factory() -> sessionmaker:
+    """
+    Dependency for work that outlives the request, such as background tasks,
+    which opens sessions of its own rather than using the request's.
+    """
+    return SessionLocal
+
+
+async def get_async_db():
+    """
+    Dependency for getting an async database session, for read-only endpoints.
+
+    Requests wait on the database without holding a threadpool slot; writes
+    keep using get_db. Like get_read_db, it reads from the replica when one
+    is configured.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_status() -> dict:
+    """Size, connections in use and checkout metrics of each engine's pool."""
+    engines = {"primary": engine, "async": async_engine.sync_engine}
+    if read_engine is not engine:
+        engines["replica"] = read_engine
+    status = {}
+    for name, pooled in engines.items():
+        pool = pooled.pool
+        if not hasattr(pool, "metrics"):  # in-memory SQLite: one static connection
+            status[name] = {"pool": pool.status()}
+            continue
+        status[name] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            **pool.metrics.snapshot(),
+        }
+    return status
@@ -0,0 +1 @@
+"""Vectorized numerical engine for simulations and batch evaluation."""
@@ -0,0 +1,89 @@
+"""Time-segmented cash / balanced / stocks bucket strategy as batched array state."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.engine.glide_path import TEN_YEAR_EXPECTED_RETURNS, allocation_vector
+
+# Segments within every account, in the order they are spent
+SEGMENTS = ("cash", "balanced", "stocks")
+CASH_SEGMENT, BALANCED_SEGMENT, STOCKS_SEGMENT = range(len(SEGMENTS))
+SEGMENT_ORDER = (CASH_SEGMENT, BALANCED_SEGMENT, STOCKS_SEGMENT)
+
+# What each segment holds (percent by asset class); stocks carry a foreign tilt
+SEGMENT_ALLOCATIONS = (
+    {"cash": 100},
+    {"total_us_stock": 30, "total_foreign_stock": 20, "bonds": 50},
+    {"total_us_stock": 60, "total_foreign_stock": 40},
+)
+
+
+def segment_allocation_matrix() -> np.ndarray:
+    """Percent weights of each segment, shape (3, 13)."""
+    return np.stack([allocation_vector(allocation) for allocation in SEGMENT_ALLOCATIONS])
+
+
+def segment_expected_returns() -> np.ndarray:
+    """Expected annual return (percent) of each segment."""
+    return segment_allocation_matrix() @ TEN_YEAR_EXPECTED_RETURNS / 100.0
+
+
+@dataclass
+class BucketPlan:
+    """
+    Cash covers the next cash_years of net spending, balanced the following
+    balanced_years, and stocks hold the rest.
+
+    After a year in which stocks rose, every account is rebalanced to its
+    segment targets, which sells equities to refill cash and balanced. After a
+    down year equities are left alone and only the balanced segment tops up
+    cash; withdrawals beyond the cash segment fall through to balanced, then
+    stocks.
+    """
+
+    cash_years: int = 3
+    balanced_years: int = 4
+
+    def targets(self, need: np.ndarray) -> np.ndarray:
+        """
+        Cash and balanced targets at the start of each year, shape (years + 1, 2).
+
+        need is the planned net withdrawal of each year; row i sums it over the
+        cash and balanced windows starting at year index i.
+        """
+        n_years = len(need)
+        covered = np.concatenate([[0.0], np.cumsum(need)])
+        start = np.arange(n_years + 1)
+        cash_end = np.minimum(start + self.cash_years, n_years)
+        balanced_end = np.minimum(cash_end + self.balanced_years, n_years)
+        return np.stack(
+            [covered[cash_end] - covered[start], covered[balanced_end] - covered[cash_end]],
+            axis=1,
+        )
+
+    def fractions(self, targets: np.ndarray, total: np.ndarray) -> np.ndarray:
+        """Share of the portfolio (batch, 3) each segment should hold."""
+        safe_total = np.where(total > 0, total, 1.0)
+        cash = np.where(total > 0, np.minimum(targets[0] / safe_total, 1.0), 1.0)
+        balanced = np.where(total > 0, np.minimum(targets[1] / safe_total, 1.0 - cash), 0.0)
+        return np.stack([cash, balanced, 1.0 - cash - balanced], axis=1)
+
+    def split(self, balances: np.ndarray, fractions: np.ndarray) -> np.ndarray:
+        """Divide account balances (batch, accounts) into segments (batch, accounts, 3)."""
+        return balances[:, :, None] * fractions[:, None, :]
+
+    def refill(
+        self, segments: np.ndarray, fractions: np.ndarray, equities_up: np.ndarray
+    ) -> np.ndarray:
+        """Year-end refill of every account's segments toward the target fractions."""
+        targets = segments.sum(axis=2, keepdims=True) * fractions[:, None, :]
+        topped_up = segments.copy()
+        moved = np.clip(
+            targets[..., CASH_SEGMENT] - segments[..., CASH_SEGMENT],
+            0.0,
+            segments[..., BALANCED_SEGMENT],
+        )
+        topped_up[..., CASH_SEGMENT] += moved
+        topped_up[..., BALANCED_SEGMENT] -= moved
+        return np.where(equities_up[:, None, None], targets, topped_up)
@@ -0,0 +1,136 @@
+"""Cached loaders for the static data files under data/."""
+
+import csv
+import hashlib
+import json
+from datetime import date
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+
+# Files are mounted at /app/data/ in Docker container
+DATA_DIR = Path("/app/data")
+
+# Fallback for local development (files in data/ directory)
+if not DATA_DIR.exists():
+    DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
+
+HISTORICAL_RETURNS_CSV = DATA_DIR / "historical_returns.csv"
+HISTORICAL_ASSET_CLASS_FILE = DATA_DIR / "historical_asset_class_returns.json"
+UNIFORM_LIFETIME_FILE = DATA_DIR / "irs_uniform_lifetime_table.json"
+FEDERAL_TAX_FILE = DATA_DIR / "us_federal_tax_tables.json"
+LIFE_TABLE_FILE = DATA_DIR / "ssa_period_life_table.json"
+
+
+def parse_approx_number(value) -> float | None:
+    """Parse numbers like 10.32, "~10.0" or "16.39%" from the data files."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().lstrip("~").rstrip("%").strip()
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+@cache
+def load_json(path: Path) -> dict:
+    """Load and cache a JSON data file."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+@cache
+def historical_return_table() -> tuple[np.ndarray, tuple[str, ...], np.ndarray]:
+    """
+    Load data/historical_returns.csv.
+
+    Returns (years, column_names, returns) where returns has shape
+    (n_years, n_series) as decimal fractions, sorted by ascending year.
+    The arrays are read-only because they are shared by every caller.
+    """
+    with open(HISTORICAL_RETURNS_CSV, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for row in reader if row and row[0].strip()]
+
+    rows.sort(key=lambda row: int(row[0]))
+    years = np.array([int(row[0]) for row in rows], dtype=np.int64)
+    returns = np.array(
+        [[parse_approx_number(cell) / 100.0 for cell in row[1:]] for row in rows],
+        dtype=np.float64,
+    )
+    years.setflags(write=False)
+    returns.setflags(write=False)
+    return years, tuple(name.strip() for name in header[1:]), returns
+
+
+@cache
+def file_digest(path: Path) -> str:
+    """SHA-256 of a data file, used to detect derived artifacts built from stale data."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def historical_asset_classes() -> dict:
+    """Long-term historical asset class statistics (historical_asset_class_returns.json)."""
+    return load_json(HISTORICAL_ASSET_CLASS_FILE)
+
+
+def federal_tax_tables() -> dict:
+    """Federal brackets, deductions and capital gains tables (us_federal_tax_tables.json)."""
+    return load_json(FEDERAL_TAX_FILE)
+
+
+@cache
+def uniform_lifetime_divisors() -> np.ndarray:
+    """
+    IRS Uniform Lifetime distribution periods as a dense array indexed by age.
+
+    Ages below the table are inf (no distribution); the last entry covers
+    every older age, so callers clip ages to len - 1. Read-only and shared.
+    """
+    periods = {
+        int(age): float(divisor)
+        for age, divisor in load_json(UNIFORM_LIFETIME_FILE)["distribution_periods"].items()
+    }
+    divisors = np.full(max(periods) + 1, np.inf)
+    for age, divisor in periods.items():
+        divisors[age] = divisor
+    divisors.setflags(write=False)
+    return divisors
+
+
+def rmd_start_year(birth_date: date) -> int:
+    """
+    Calendar year of the first Required Minimum Distribution for a birth date.
+
+    That is the year the start age is reached: 70 1/2 for those born before
+    July 1, 1949, then 72, 73 or 75 by birth year.
+    """
+    for rule in load_json(UNIFORM_LIFETIME_FILE)["start_age_by_birth_date"]:
+        born_before = rule["born_before"]
+        if born_before is None or birth_date < date.fromisoformat(born_before):
+            months = round(rule["start_age"] * 12) + birth_date.month - 1
+            return birth_date.year + months // 12
+    raise ValueError(f"No RMD start age for birth date {birth_date}")
+
+
+@cache
+def death_probabilities(sex: str) -> np.ndarray:
+    """
+    SSA period life table q_x for "male" or "female" as a dense array indexed by age.
+
+    The last age is terminal (q = 1), so every sampled life ends within the
+    table. Read-only and shared.
+    """
+    table = load_json(LIFE_TABLE_FILE)["death_probabilities"]
+    if sex not in table:
+        raise ValueError(f"No life table for sex: {sex}")
+    rates = {int(age): float(q) for age, q in table[sex].items()}
+    q = np.array([rates[age] for age in range(max(rates) + 1)])
+    q[-1] = 1.0
+    q.setflags(write=False)
+    return q
@@ -0,0 +1,100 @@
+"""Per-year allocation weights and expected returns, including glide paths."""
+
+import numpy as np
+
+from app.engine.return_model import ASSET_CLASS_FIELDS
+
+# 10-year expected returns by asset class (Vanguard ETFs), percent, in ASSET_CLASS_FIELDS order
+TEN_YEAR_EXPECTED_RETURNS = np.array(
+    [
+        7.5,  # total_us_stock (VTI)
+        8.5,  # us_small_cap_value (VBR)
+        7.0,  # total_foreign_stock (VXUS)
+        8.0,  # international_small_cap_value (VSS)
+        6.5,  # developed_markets (VEA)
+        8.0,  # emerging_markets (VWO)
+        9.5,  # reits (VNQ)
+        4.5,  # bonds (BND)
+        4.0,  # short_term_treasuries (VGSH)
+        4.2,  # intermediate_term_treasuries (VGIT)
+        3.5,  # municipal_bonds (VTEB, tax-exempt)
+        3.5,  # cash (VMFXX)
+        5.0,  # other (default assumption)
+    ]
+)
+TEN_YEAR_EXPECTED_RETURNS.setflags(write=False)
+
+# Long-term historical average return, percent
+HISTORICAL_AVERAGE_RETURN = 10.0
+
+# Used when the allocation is empty
+DEFAULT_RETURN = 6.0
+
+
+def allocation_vector(allocation) -> np.ndarray:
+    """Allocation (AssetAllocation or dict of percentages) as a (13,) percent vector."""
+    if hasattr(allocation, "model_dump"):
+        allocation = allocation.model_dump()
+    allocation = allocation or {}
+    return np.array([float(allocation.get(field, 0) or 0) for field in ASSET_CLASS_FIELDS])
+
+
+def allocation_matrix(
+    allocation, glide_path, n_years: int, start_age: int | None = None
+) -> np.ndarray:
+    """
+    Percent weights per projection year, shape (n_years, 13).
+
+    Without a glide path every row is the static allocation. With one, each
+    asset class is linearly interpolated between keyframes (held flat before
+    the first and after the last); age keyframes are placed at the year in
+    which that age is reached.
+    """
+    if glide_path is None:
+        return np.broadcast_to(allocation_vector(allocation), (n_years, len(ASSET_CLASS_FIELDS)))
+
+    if glide_path.basis == "age":
+        if start_age is None:
+            raise ValueError("Age-based glide path requires the current age")
+        positions = [keyframe.age - start_age + 1 for keyframe in glide_path.keyframes]
+    else:
+        positions = [keyframe.year for keyframe in glide_path.keyframes]
+
+    order = np.argsort(positions)
+    positions = np.asarray(positions, dtype=np.float64)[order]
+    keyframes = np.stack([allocation_vector(k.allocation) for k in glide_path.keyframes])[order]
+
+    if len(positions) == 1:
+        return np.broadcast_to(keyframes[0], (n_years, len(ASSET_CLASS_FIELDS)))
+
+    # Interpolation weight of the right-hand keyframe for every year, shared by all columns
+    years = np.arange(1, n_years + 1, dtype=np.float64)
+    right = np.clip(np.searchsorted(positions, years, side="right"), 1, len(positions) - 1)
+    left = right - 1
+    span = positions[right] - positions[left]
+    t = np.clip((years - positions[left]) / span, 0.0, 1.0)[:, None]
+    return keyframes[left] * (1.0 - t) + keyframes[right] * t
+
+
+def expected_return_path(scenario, n_years: int, start_age: int | None = None) -> np.ndarray:
+    """
+    Expected annual return (percent) for each projection year.
+
+    Allocation-based returns are one matrix-vector product of the per-year
+    weight matrix with the asset-class expected returns.
+    """
+    return_source = getattr(scenario, "return_source", "10_year_projections")
+    custom = getattr(scenario, "custom_return_percent", None)
+    if return_source == "custom" and custom is not None:
+        return np.full(n_years, float(custom))
+    if return_source == "historical_average":
+        return np.full(n_years, HISTORICAL_AVERAGE_RETURN)
+
+    weights = allocation_matrix(
+        getattr(scenario, "asset_allocation", None),
+        getattr(scenario, "glide_path", None),
+        n_years,
+        start_age,
+    )
+    blended = weights @ TEN_YEAR_EXPECTED_RETURNS / 100.0
+    return np.where(blended > 0, blended, DEFAULT_RETURN)
@@ -0,0 +1,59 @@
+"""Cash flows re-indexed to each path's realized inflation."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class InflationIndexing:
+    """
+    Which cash flows follow inflation, and from which projection year.
+
+    Amounts are projected at the assumed rate. Along a path, each flow is
+    rescaled by how far realized inflation has outrun the assumed rate since
+    the flow started compounding (a year index, 0 for flows compounding from
+    year 1; earlier starts are clipped to 0).
+    """
+
+    rate: float  # assumed annual inflation, fraction
+    spending: np.ndarray  # (years,) variable spending and lump sums
+    ss_start: int  # year index Social Security COLAs compound from
+    other_income: np.ndarray  # (k, years) income sources with a COLA
+    other_starts: np.ndarray  # (k,) year index each source compounds from
+
+    def surprise(self, inflation: np.ndarray, start: int) -> np.ndarray:
+        """
+        Realized over assumed price growth (batch, years) for a flow compounding from start.
+
+        Year t has compounded with the inflation of years start .. t - 1, so
+        the ratio is a difference of cumulative log growth.
+        """
+        batch, years = inflation.shape
+        growth = np.zeros((batch, years + 1))
+        np.cumsum(np.log1p(inflation), axis=1, out=growth[:, 1:])
+        t = np.arange(years)
+        since = np.minimum(max(start, 0), t)
+        return np.exp(growth[:, t] - growth[:, since] - (t - since) * np.log1p(self.rate))
+
+    def realized(
+        self, inflation: np.ndarray, ss_income: np.ndarray, other_income: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Spending index, Social Security and other income (batch, years) along each path.
+
+        The spending index multiplies the inflation-linked spending; ss_income
+        and other_income are the (years,) amounts projected at the assumed rate.
+        """
+        indexes = {0: self.surprise(inflation, 0)}
+
+        def index(start: int) -> np.ndarray:
+            start = max(int(start), 0)
+            if start not in indexes:
+                indexes[start] = self.surprise(inflation, start)
+            return indexes[start]
+
+        other = np.broadcast_to(other_income, inflation.shape).copy()
+        for amounts, start in zip(self.other_income, self.other_starts):
+            other += amounts * (index(start) - 1.0)
+        return indexes[0], ss_income * index(self.ss_start), other
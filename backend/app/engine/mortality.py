@@ -0,0 +1,57 @@
+"""Survival curves and sampled death years from the SSA period life table."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.engine.data_registry import death_probabilities
+
+# "unisex" averages the male and female death probabilities
+SEXES = ("male", "female", "unisex")
+
+
+@dataclass(frozen=True)
+class Life:
+    """A person whose lifetime bounds the plan."""
+
+    sex: str
+    age: int
+
+
+def yearly_death_probabilities(life: Life, n_years: int) -> np.ndarray:
+    """q for each of the next n_years, starting at the life's current age."""
+    if life.sex == "unisex":
+        q = (death_probabilities("male") + death_probabilities("female")) / 2
+    elif life.sex in SEXES:
+        q = death_probabilities(life.sex)
+    else:
+        raise ValueError(f"Unknown sex: {life.sex}")
+    ages = np.minimum(np.arange(life.age, life.age + n_years), len(q) - 1)
+    return q[ages]
+
+
+def survival_curve(lives, n_years: int) -> np.ndarray:
+    """
+    Probability that anyone in lives is alive at the end of each year (n_years,).
+
+    Lives are independent, so the household ends when the last one dies.
+    """
+    all_dead = np.ones(n_years)
+    for life in lives:
+        all_dead *= 1.0 - np.cumprod(1.0 - yearly_death_probabilities(life, n_years))
+    return 1.0 - all_dead
+
+
+def sample_death_years(lives, n_paths: int, n_years: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Projection year (1-based) in which the last of lives dies, per path.
+
+    Each life is drawn by inverting its cumulative death distribution with one
+    uniform per path; 0 means someone is still alive at the end of the horizon.
+    """
+    last = np.zeros(n_paths, dtype=np.int32)
+    for life in lives:
+        died_by = 1.0 - np.cumprod(1.0 - yearly_death_probabilities(life, n_years))
+        year = np.searchsorted(died_by, rng.random(n_paths), side="right") + 1
+        last = np.maximum(last, np.where(year > n_years, n_years + 1, year))
+    return np.where(last > n_years, 0, last).astype(np.int32)
@@ -0,0 +1,254 @@
+"""Chunked simulation runs, in-process or on a process pool writing to shared memory."""
+
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from app.engine.mortality import sample_death_years
+from app.engine.path_library import library_at
+from app.engine.return_model import get_return_model
+from app.engine.simulation import PathInputs, simulate_paths
+
+# Paths per task; cancellation is checked between chunks
+CHUNK_PATHS = 2000
+
+# How often the parent wakes up to check cancellation while workers run
+WAIT_POLL_SECONDS = 0.1
+
+# Spawn key of the random stream for death years, apart from the per-chunk return streams
+MORTALITY_STREAM = 1
+
+
+@dataclass
+class SimulationJob:
+    """Everything a worker needs to simulate any chunk of a run (small enough to pickle)."""
+
+    inputs: PathInputs
+    weights: np.ndarray  # series weights (n_series,), per year or per bucket segment
+    expected_return: float | np.ndarray  # fraction: scalar, per year or per bucket segment
+    seed: int
+    n_paths: int
+    library_dir: str | None = None  # None samples paths instead of reading the library
+    expected_inflation: float | None = None  # fraction; None keeps the projection's fixed rate
+
+    @property
+    def n_years(self) -> int:
+        """Number of projection years."""
+        return self.inputs.years
+
+    def chunks(self, chunk_paths: int = CHUNK_PATHS) -> list[tuple[int, int, int]]:
+        """(index, start, size) of each chunk."""
+        return [
+            (index, start, min(chunk_paths, self.n_paths - start))
+            for index, start in enumerate(range(0, self.n_paths, chunk_paths))
+        ]
+
+    def draws(self, index: int, start: int, size: int) -> tuple[np.ndarray, np.ndarray | None]:
+        """
+        Portfolio returns (size, n_years) for one chunk, or per-segment returns
+        (size, n_years, 3) when the inputs carry a bucket plan, and the
+        inflation (size, n_years) drawn with them when inflation is simulated.
+
+        Sampled chunks get their own generator seeded from (seed, index), so a
+        run is reproducible however its chunks are spread across workers.
+        """
+        model = get_return_model()
+        if self.library_dir is not None:
+            library = library_at(self.library_dir)
+            asset_returns = library.paths(self.seed, start, size, self.n_years)
+        else:
+            rng = np.random.default_rng([self.seed, index])
+            asset_returns = model.sample(
+                size, self.n_years, rng, inflation=self.expected_inflation is not None
+            )
+        inflation = None
+        if self.expected_inflation is not None:
+            inflation = model.inflation_rates(asset_returns, self.expected_inflation)
+        if self.inputs.bucket_plan is not None:
+            returns = model.segment_returns(asset_returns, self.weights, self.expected_return)
+        else:
+            returns = model.portfolio_returns(asset_returns, self.weights, self.expected_return)
+        return returns, inflation
+
+    def returns(self, index: int, start: int, size: int) -> np.ndarray:
+        """Portfolio (or per-segment) returns for one chunk."""
+        return self.draws(index, start, size)[0]
+
+    def death_years(self, lives) -> np.ndarray:
+        """
+        Year the last of lives dies on each of the run's paths (0 if alive at the end).
+
+        Drawn for every path at once from a stream of the job's seed that the
+        return chunks never use, so adding mortality leaves the returns unchanged.
+        """
+        rng = np.random.default_rng(
+            np.random.SeedSequence(self.seed, spawn_key=(MORTALITY_STREAM,))
+        )
+        return sample_death_years(lives, self.n_paths, self.n_years, rng)
+
+
+def run_chunk(
+    job: SimulationJob,
+    index: int,
+    start: int,
+    size: int,
+    ending_balance: np.ndarray,
+    depletion_year: np.ndarray,
+    spending: np.ndarray,
+):
+    """Simulate one chunk and write its rows into the result arrays."""
+    returns, inflation = job.draws(index, start, size)
+    results = simulate_paths(job.inputs, returns, inflation=inflation)
+    ending_balance[start : start + size] = results.ending_balance
+    depletion_year[start : start + size] = results.depletion_year
+    spending[start : start + size] = results.spending
+
+
+@dataclass(frozen=True)
+class SharedArrayRef:
+    """Picklable handle to a numpy array living in a shared-memory block."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    def attach(self) -> tuple[SharedMemory, np.ndarray]:
+        """Map the block in this process and view it as an array."""
+        # Pool workers share the parent's resource tracker, so attaching does not
+        # add a second owner; the parent unlinks the block when the run ends
+        shm = SharedMemory(name=self.name)
+        return shm, np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+
+
+class ResultBuffers:
+    """
+    Per-path result arrays for a run.
+
+    With shared=True the arrays live in shared-memory blocks that pool workers
+    write into directly, so results never pass through the result queue.
+    Use as a context manager; the blocks are released on exit.
+    """
+
+    def __init__(self, n_paths: int, n_years: int, shared: bool = False):
+        """Allocate ending-balance, depletion-year and spending arrays."""
+        self.shared = shared
+        self._blocks: list[SharedMemory] = []
+        self.refs: list[SharedArrayRef] = []
+        self.ending_balance = self._allocate((n_paths, n_years), np.float64)
+        self.depletion_year = self._allocate((n_paths,), np.int32)
+        self.spending = self._allocate((n_paths, n_years), np.float64)
+
+    def _allocate(self, shape: tuple[int, ...], dtype) -> np.ndarray:
+        """Allocate one array, in shared memory if requested."""
+        if not self.shared:
+            return np.zeros(shape, dtype=dtype)
+        nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        shm = SharedMemory(create=True, size=nbytes)
+        self._blocks.append(shm)
+        self.refs.append(SharedArrayRef(shm.name, shape, np.dtype(dtype).str))
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    def close(self):
+        """Drop the arrays and unlink any shared-memory blocks."""
+        self.ending_balance = None
+        self.depletion_year = None
+        self.spending = None
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "ResultBuffers":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _run_chunk_in_worker(
+    job: SimulationJob, index: int, start: int, size: int, refs: list[SharedArrayRef]
+) -> tuple[int, int]:
+    """Pool task: simulate a chunk into the parent's shared buffers; return only metadata."""
+    blocks, arrays = zip(*(ref.attach() for ref in refs))
+    try:
+        run_chunk(job, index, start, size, *arrays)
+    finally:
+        # Views must go before the mapping does
+        del arrays
+        for shm in blocks:
+            shm.close()
+    return start, size
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by all requests, created on first use."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # forkserver avoids forking a multi-threaded server process
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("forkserver")
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def execute_job(
+    job: SimulationJob,
+    buffers: ResultBuffers,
+    workers: int = 0,
+    cancel_token=None,
+    chunk_paths: int = CHUNK_PATHS,
+):
+    """
+    Fill buffers with every chunk of job.
+
+    With workers > 0 and shared buffers, chunks run on the process pool;
+    otherwise they run in the calling thread. Either way the cancel token is
+    checked between chunks and results are identical.
+    """
+    chunks = job.chunks(chunk_paths)
+    if workers <= 0 or not buffers.shared:
+        for index, start, size in chunks:
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            run_chunk(
+                job,
+                index,
+                start,
+                size,
+                buffers.ending_balance,
+                buffers.depletion_year,
+                buffers.spending,
+            )
+        return
+
+    pool = get_worker_pool(workers)
+    pending: set[Future] = {
+        pool.submit(_run_chunk_in_worker, job, index, start, size, buffers.refs)
+        for index, start, size in chunks
+    }
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=WAIT_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                future.result()
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        # Running chunks still write into the buffers; let them finish before release
+        wait(pending)
+        raise
@@ -0,0 +1,180 @@
+"""Precomputed bootstrap return paths, memory-mapped read-only from disk."""
+
+import json
+import os
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+
+from app.engine.data_registry import HISTORICAL_RETURNS_CSV, file_digest, historical_return_table
+
+LIBRARY_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+# Consecutive historical years kept together, preserving some serial correlation
+BLOCK_YEARS = 5
+
+# Paths generated per write; bounds memory use while building
+BUILD_CHUNK_PATHS = 5000
+
+# Paths are stored as float32: half the pages, and far more precision than the data
+PATH_DTYPE = np.float32
+
+
+def bootstrap_paths(
+    returns: np.ndarray,
+    n_paths: int,
+    n_years: int,
+    rng: np.random.Generator,
+    block_years: int = BLOCK_YEARS,
+) -> np.ndarray:
+    """
+    Circular block bootstrap of historical return rows.
+
+    Returns shape (n_paths, n_years, n_series). Whole rows are resampled, so
+    the cross-asset correlation of each historical year is kept intact.
+    """
+    n_history = len(returns)
+    n_blocks = -(-n_years // block_years)
+    starts = rng.integers(0, n_history, size=(n_paths, n_blocks))
+    rows = (starts[:, :, None] + np.arange(block_years)) % n_history
+    rows = rows.reshape(n_paths, n_blocks * block_years)[:, :n_years]
+    return returns[rows]
+
+
+def _seed_file(directory: Path, seed: int) -> Path:
+    """Path of the array file holding one seed's paths."""
+    return directory / f"paths_seed_{seed}.npy"
+
+
+def _manifest(seeds, n_paths: int, n_years: int) -> dict:
+    """Description of a library built from the current historical data."""
+    _, series, _ = historical_return_table()
+    return {
+        "version": LIBRARY_VERSION,
+        "source_sha256": file_digest(HISTORICAL_RETURNS_CSV),
+        "series": list(series),
+        "block_years": BLOCK_YEARS,
+        "dtype": np.dtype(PATH_DTYPE).name,
+        "seeds": sorted(int(seed) for seed in seeds),
+        "n_paths": n_paths,
+        "n_years": n_years,
+    }
+
+
+def read_manifest(directory: Path) -> dict | None:
+    """Manifest of the library in directory, or None if there is none."""
+    try:
+        with open(Path(directory) / MANIFEST_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def library_is_current(directory: Path, seeds, n_paths: int, n_years: int) -> bool:
+    """Whether directory holds a library matching these parameters and the current data."""
+    return read_manifest(directory) == _manifest(seeds, n_paths, n_years)
+
+
+def build_path_library(directory: Path, seeds, n_paths: int, n_years: int) -> dict:
+    """
+    Generate one array file per seed and write the manifest.
+
+    Files are written through a memory map in chunks and moved into place
+    atomically, so readers never see a partially written library.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    _, _, returns = historical_return_table()
+    manifest = _manifest(seeds, n_paths, n_years)
+
+    for seed in manifest["seeds"]:
+        target = _seed_file(directory, seed)
+        partial = target.with_suffix(".partial.npy")
+        out = np.lib.format.open_memmap(
+            partial,
+            mode="w+",
+            dtype=PATH_DTYPE,
+            shape=(n_paths, n_years, returns.shape[1]),
+        )
+        rng = np.random.default_rng(seed)
+        for start in range(0, n_paths, BUILD_CHUNK_PATHS):
+            size = min(BUILD_CHUNK_PATHS, n_paths - start)
+            out[start : start + size] = bootstrap_paths(returns, size, n_years, rng)
+        out.flush()
+        del out
+        os.replace(partial, target)
+
+    partial_manifest = directory / f"{MANIFEST_FILE}.partial"
+    with open(partial_manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(partial_manifest, directory / MANIFEST_FILE)
+    return manifest
+
+
+class PathLibrary:
+    """
+    Read-only view of a built path library.
+
+    Each seed's file is memory-mapped, so every worker process shares the
+    same physical pages and slicing paths copies nothing.
+    """
+
+    def __init__(self, directory: Path, manifest: dict):
+        """Memory-map each seed's array file."""
+        self.directory = Path(directory)
+        self.seeds = tuple(manifest["seeds"])
+        self.n_paths = manifest["n_paths"]
+        self.n_years = manifest["n_years"]
+        self._arrays = {
+            seed: np.load(_seed_file(self.directory, seed), mmap_mode="r") for seed in self.seeds
+        }
+
+    def covers(self, seed: int, n_paths: int, n_years: int) -> bool:
+        """Whether the library can serve this many paths and years for seed."""
+        return seed in self._arrays and n_paths <= self.n_paths and n_years <= self.n_years
+
+    def paths(self, seed: int, start: int, n_paths: int, n_years: int) -> np.ndarray:
+        """Zero-copy view of shape (n_paths, n_years, n_series) starting at path start."""
+        return self._arrays[seed][start : start + n_paths, :n_years]
+
+
+def open_path_library(directory: Path) -> PathLibrary | None:
+    """Open the library in directory, or None if it is missing or built from other data."""
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+    if manifest != _manifest(manifest["seeds"], manifest["n_paths"], manifest["n_years"]):
+        return None
+    try:
+        return PathLibrary(directory, manifest)
+    except (OSError, ValueError):
+        return None
+
+
+@cache
+def library_at(directory: str) -> PathLibrary | None:
+    """The library in directory, opened once per process (workers included)."""
+    return open_path_library(Path(directory))
+
+
+def get_path_library() -> PathLibrary | None:
+    """The configured path library."""
+    from app.config import settings
+
+    return library_at(settings.path_library_dir)
+
+
+def ensure_path_library() -> PathLibrary | None:
+    """Build the configured library if it is missing or stale, then open it."""
+    from app.config import settings
+
+    directory = Path(settings.path_library_dir)
+    seeds = settings.path_library_seeds
+    n_paths = settings.path_library_paths
+    n_years = settings.path_library_years
+    if not library_is_current(directory, seeds, n_paths, n_years):
+        build_path_library(directory, seeds, n_paths, n_years)
+    library_at.cache_clear()
+    return get_path_library()
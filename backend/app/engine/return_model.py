@@ -0,0 +1,288 @@
+"""Multi-asset return model estimated from historical data."""
+
+from functools import lru_cache
+
+import numpy as np
+
+from app.engine.data_registry import (
+    historical_asset_classes,
+    historical_return_table,
+    parse_approx_number,
+)
+
+# Historical series, in the column order of data/historical_returns.csv
+SERIES = ("us_stock", "intl_stock", "us_small_cap_value", "us_bonds", "cash", "inflation")
+
+# CPI inflation rides along with the asset returns but is never held
+INFLATION = SERIES.index("inflation")
+
+# The 13 AssetAllocation fields, in schema order
+ASSET_CLASS_FIELDS = (
+    "total_us_stock",
+    "us_small_cap_value",
+    "total_foreign_stock",
+    "international_small_cap_value",
+    "developed_markets",
+    "emerging_markets",
+    "reits",
+    "bonds",
+    "short_term_treasuries",
+    "intermediate_term_treasuries",
+    "municipal_bonds",
+    "cash",
+    "other",
+)
+
+# How each allocation field is represented by the historical series.
+# Weights per field sum to 1.
+ASSET_CLASS_SERIES: dict[str, dict[str, float]] = {
+    "total_us_stock": {"us_stock": 1.0},
+    "us_small_cap_value": {"us_small_cap_value": 1.0},
+    "total_foreign_stock": {"intl_stock": 1.0},
+    "international_small_cap_value": {"intl_stock": 0.5, "us_small_cap_value": 0.5},
+    "developed_markets": {"intl_stock": 1.0},
+    "emerging_markets": {"intl_stock": 1.0},
+    "reits": {"us_small_cap_value": 0.5, "us_stock": 0.5},
+    "bonds": {"us_bonds": 1.0},
+    "short_term_treasuries": {"us_bonds": 0.5, "cash": 0.5},
+    "intermediate_term_treasuries": {"us_bonds": 1.0},
+    "municipal_bonds": {"us_bonds": 1.0},
+    "cash": {"cash": 1.0},
+    "other": {"us_stock": 0.5, "us_bonds": 0.5},
+}
+
+# Long-run geometric averages in historical_asset_class_returns.json, per series
+LONG_RUN_SOURCES = {
+    "us_stock": ("us_equities", "total_us_stock", "since_1926"),
+    "intl_stock": ("international_equities", "total_foreign_stock", "since_1970"),
+    "us_small_cap_value": ("us_equities", "small_cap_value", "since_1926"),
+    "us_bonds": ("fixed_income", "us_aggregate_bonds", "since_1976"),
+    "cash": ("fixed_income", "cash_treasury_bills", "since_1928"),
+    "inflation": ("inflation", "cpi_all_urban", "since_1928"),
+}
+
+# Used when a scenario has no allocation at all
+DEFAULT_SERIES_WEIGHTS = {"us_stock": 0.6, "us_bonds": 0.4}
+
+
+def _asset_class_mapping() -> np.ndarray:
+    """Matrix of shape (13, n_series) mapping allocation fields to series weights."""
+    mapping = np.zeros((len(ASSET_CLASS_FIELDS), len(SERIES)))
+    for i, field in enumerate(ASSET_CLASS_FIELDS):
+        for series, weight in ASSET_CLASS_SERIES[field].items():
+            mapping[i, SERIES.index(series)] = weight
+    return mapping
+
+
+class ReturnModel:
+    """
+    Mean vector, covariance and Cholesky factor of annual asset-class returns.
+
+    Correlated return paths are drawn with a single matrix multiply per batch:
+    standard normals of shape (paths * years, n_series) times the transposed
+    Cholesky factor, plus the mean vector.
+
+    Inflation is persistent, so it is sampled as a fitted AR(1): the draw in
+    its column is the year's shock (correlated with that year's returns), and
+    shocks accumulate at the fitted persistence around the mean.
+    """
+
+    def __init__(self, returns: np.ndarray, long_run_geometric: np.ndarray | None = None):
+        """Estimate the model from an (n_observations, n_series) array of returns."""
+        self.mean = returns.mean(axis=0)
+        self.cov = np.cov(returns, rowvar=False)
+        self.cholesky = np.linalg.cholesky(self.cov)
+        self.volatility = np.sqrt(np.diag(self.cov))
+        self.inflation_persistence, self.sampling_cholesky = self._inflation_ar1(returns)
+        # Geometric to arithmetic: arithmetic mean is roughly geometric + variance / 2
+        if long_run_geometric is None:
+            self.long_run_mean = self.mean.copy()
+        else:
+            self.long_run_mean = long_run_geometric + np.diag(self.cov) / 2.0
+        self.asset_class_mapping = _asset_class_mapping()
+        for array in (
+            self.mean,
+            self.cov,
+            self.cholesky,
+            self.volatility,
+            self.long_run_mean,
+            self.asset_class_mapping,
+            self.sampling_cholesky,
+        ):
+            array.setflags(write=False)
+
+    def _inflation_ar1(self, returns: np.ndarray) -> tuple[float, np.ndarray]:
+        """
+        AR(1) persistence of inflation and the Cholesky factor to sample with.
+
+        The sampling covariance is the historical one with inflation replaced
+        by its AR(1) shocks. Inflation is the last series, so the asset block
+        of the factor matches the historical Cholesky factor.
+        """
+        deviation = returns[:, INFLATION] - self.mean[INFLATION]
+        persistence = float(deviation[1:] @ deviation[:-1] / (deviation[:-1] @ deviation[:-1]))
+        shocks = deviation[1:] - persistence * deviation[:-1]
+        joint = np.cov(np.column_stack([returns[1:, :INFLATION], shocks]), rowvar=False)
+        cov = self.cov.copy()
+        cov[INFLATION, :] = joint[INFLATION, :]
+        cov[:, INFLATION] = joint[:, INFLATION]
+        return persistence, np.linalg.cholesky(cov)
+
+    @property
+    def n_series(self) -> int:
+        """Number of historical series."""
+        return len(self.mean)
+
+    def asset_class_vector(self, allocation) -> np.ndarray:
+        """Allocation (AssetAllocation or dict of percentages) as a (13,) fraction vector."""
+        if hasattr(allocation, "model_dump"):
+            allocation = allocation.model_dump()
+        allocation = allocation or {}
+        return np.array(
+            [float(allocation.get(field, 0) or 0) / 100.0 for field in ASSET_CLASS_FIELDS]
+        )
+
+    def series_weights(self, asset_class_weights: np.ndarray) -> np.ndarray:
+        """
+        Map asset-class weights (..., 13) to series weights (..., n_series).
+
+        Rows are normalized to sum to 1; empty rows get the default 60/40 mix.
+        """
+        weights = np.asarray(asset_class_weights, dtype=np.float64) @ self.asset_class_mapping
+        totals = weights.sum(axis=-1, keepdims=True)
+        default = np.array([DEFAULT_SERIES_WEIGHTS.get(s, 0.0) for s in SERIES])
+        return np.where(totals > 0, weights / np.where(totals > 0, totals, 1.0), default)
+
+    def allocation_weights(self, allocation) -> np.ndarray:
+        """Series weights (n_series,) for a single allocation."""
+        return self.series_weights(self.asset_class_vector(allocation))
+
+    def portfolio_volatility(self, weights: np.ndarray) -> float:
+        """
+        Annual standard deviation of a portfolio with the given series weights.
+
+        For per-year weights (n_years, n_series) this is the average over years.
+        """
+        variance = np.einsum("...i,ij,...j->...", weights, self.cov, weights)
+        return float(np.mean(np.sqrt(variance)))
+
+    def sample(
+        self,
+        n_paths: int,
+        n_years: int,
+        rng: np.random.Generator,
+        mean: np.ndarray | None = None,
+        inflation: bool = False,
+    ) -> np.ndarray:
+        """
+        Draw correlated asset returns of shape (n_paths, n_years, n_series).
+
+        Asset returns take the first normals drawn from rng, so a seed gives
+        the same asset paths whether or not inflation is drawn. With inflation,
+        its AR(1) shocks are drawn next, correlated with each year's asset
+        returns; without, the inflation column holds its mean.
+        """
+        mean = self.mean if mean is None else mean
+        n_draws = n_paths * n_years
+        z = rng.standard_normal((n_draws, INFLATION))
+        draws = np.empty((n_paths, n_years, self.n_series))
+        assets = z @ self.cholesky[:INFLATION, :INFLATION].T
+        draws[:, :, :INFLATION] = assets.reshape(n_paths, n_years, INFLATION) + mean[:INFLATION]
+        draws[:, :, INFLATION] = mean[INFLATION]
+        if inflation:
+            # The shock's factor row: the part shared with the year's returns, then its own
+            factor = self.sampling_cholesky[INFLATION]
+            own = rng.standard_normal(n_draws)
+            shocks = (z @ factor[:INFLATION] + factor[INFLATION] * own).reshape(n_paths, n_years)
+            # Each year's inflation keeps part of last year's deviation from the mean
+            deviation = np.zeros(n_paths)
+            for year in range(n_years):
+                deviation = self.inflation_persistence * deviation + shocks[:, year]
+                draws[:, year, INFLATION] = mean[INFLATION] + deviation
+        return draws
+
+    def inflation_rates(self, asset_returns: np.ndarray, expected_inflation: float) -> np.ndarray:
+        """
+        Inflation (paths, years) from sampled or historical draws.
+
+        As with portfolio returns, the mean is shifted from the historical
+        mean to expected_inflation (a fraction).
+        """
+        return asset_returns[:, :, INFLATION] - self.mean[INFLATION] + expected_inflation
+
+    def sample_portfolio(
+        self,
+        n_paths: int,
+        n_years: int,
+        weights: np.ndarray,
+        expected_return: float | np.ndarray,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        """
+        Draw portfolio returns of shape (n_paths, n_years).
+
+        Volatility and correlation come from history; the mean is shifted so
+        the expected portfolio return equals expected_return (a fraction), which
+        keeps simulations consistent with the deterministic projection.
+        Weights may be (n_series,) or per-year (n_years, n_series), and
+        expected_return a scalar or per-year (n_years,) array.
+        """
+        return self.portfolio_returns(self.sample(n_paths, n_years, rng), weights, expected_return)
+
+    def portfolio_returns(
+        self,
+        asset_returns: np.ndarray,
+        weights: np.ndarray,
+        expected_return: float | np.ndarray,
+    ) -> np.ndarray:
+        """
+        Collapse asset returns (paths, years, n_series) to portfolio returns (paths, years).
+
+        Works on sampled draws and on historical bootstrap paths alike; the
+        mean is shifted from the historical portfolio mean to expected_return.
+        """
+        if weights.ndim == 1:
+            draws = asset_returns @ weights
+        else:
+            draws = np.einsum("pyk,yk->py", asset_returns, weights)
+        draws += expected_return - weights @ self.mean
+        return np.maximum(draws, -1.0)
+
+    def segment_returns(
+        self,
+        asset_returns: np.ndarray,
+        weights: np.ndarray,
+        expected_returns: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Returns of several sub-portfolios at once, shape (paths, years, n_segments).
+
+        weights is (n_segments, n_series); each segment's mean is shifted to its
+        entry of expected_returns (fractions), as in portfolio_returns.
+        """
+        draws = asset_returns @ weights.T
+        draws += expected_returns - weights @ self.mean
+        return np.maximum(draws, -1.0)
+
+
+def _long_run_geometric() -> np.ndarray | None:
+    """Long-run geometric means per series from historical_asset_class_returns.json."""
+    data = historical_asset_classes()
+    values = []
+    for series in SERIES:
+        section, key, period = LONG_RUN_SOURCES[series]
+        nominal = (
+            data.get(section, {}).get(key, {}).get("periods", {}).get(period, {}).get("nominal")
+        )
+        value = parse_approx_number(nominal)
+        if value is None:
+            return None
+        values.append(value / 100.0)
+    return np.array(values)
+
+
+@lru_cache(maxsize=1)
+def get_return_model() -> ReturnModel:
+    """Build the return model once per process from the bundled historical data."""
+    _, _, returns = historical_return_table()
+    return ReturnModel(returns, _long_run_geometric())
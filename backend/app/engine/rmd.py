@@ -0,0 +1,22 @@
+"""Required Minimum Distributions from the Uniform Lifetime table."""
+
+from datetime import date
+
+import numpy as np
+
+from app.engine.data_registry import rmd_start_year, uniform_lifetime_divisors
+
+
+def rmd_fractions(calendar_years, birth_date: date) -> np.ndarray:
+    """
+    Share of the start-of-year pretax balance that must be distributed, per year.
+
+    Each year uses the divisor for the age reached in that calendar year
+    (calendar year - birth year); years before the first RMD year for
+    birth_date are 0.
+    """
+    divisors = uniform_lifetime_divisors()
+    calendar_years = np.asarray(calendar_years, dtype=np.int64)
+    ages = calendar_years - birth_date.year
+    divisor = divisors[np.clip(ages, 0, len(divisors) - 1)]
+    return np.where(calendar_years >= rmd_start_year(birth_date), 1.0 / divisor, 0.0)
@@ -0,0 +1,85 @@
+"""Roth conversion policy search evaluated in one batch by the simulation kernel."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.engine.simulation import PathInputs, PathResults, simulate_paths
+from app.engine.tax import IncomeTaxSchedule
+
+# Candidates simulated per kernel call; cancellation is checked between batches
+CANDIDATE_BATCH = 2000
+
+
+@dataclass
+class ConversionCandidates:
+    """
+    "Fill to the top of a bracket" policies active over a window of years.
+
+    Row 0 is the baseline with no conversions. A rate of 0 converts only
+    while taxable income is below zero, filling the deductions.
+    """
+
+    rates: np.ndarray  # (n,) marginal rate filled, nan for the baseline
+    start_years: np.ndarray  # (n,) first conversion year (1-based), 0 for the baseline
+    end_years: np.ndarray  # (n,) last conversion year, 0 for the baseline
+    targets: np.ndarray  # (n, years) taxable-income target, -inf when not converting
+
+    def __len__(self) -> int:
+        return len(self.rates)
+
+
+def bracket_fill_candidates(
+    tax_schedule: IncomeTaxSchedule, rates, n_years: int
+) -> ConversionCandidates:
+    """Every bracket in rates crossed with every window of consecutive years."""
+    tops = [0.0 if rate == 0 else tax_schedule.federal.top_of_bracket(rate) for rate in rates]
+    start, end = np.triu_indices(n_years)
+    n_windows = len(start)
+
+    rate_column = np.concatenate(
+        [[np.nan], np.repeat(np.asarray(rates, dtype=np.float64), n_windows)]
+    )
+    top_column = np.concatenate([[-np.inf], np.repeat(tops, n_windows)])
+    start_years = np.concatenate([[0], np.tile(start + 1, len(rates))])
+    end_years = np.concatenate([[0], np.tile(end + 1, len(rates))])
+
+    years = np.arange(1, n_years + 1)
+    active = (years >= start_years[:, None]) & (years <= end_years[:, None])
+    targets = np.where(active, top_column[:, None], -np.inf)
+    return ConversionCandidates(rate_column, start_years, end_years, targets)
+
+
+def evaluate_candidates(
+    inputs: PathInputs,
+    annual_returns: np.ndarray,
+    candidates: ConversionCandidates,
+    cancel_token=None,
+) -> PathResults:
+    """Simulate every candidate along the same (years,) return path."""
+    batches = []
+    for start in range(0, len(candidates), CANDIDATE_BATCH):
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        targets = candidates.targets[start : start + CANDIDATE_BATCH]
+        returns = np.broadcast_to(annual_returns, targets.shape)
+        batches.append(simulate_paths(inputs, returns, conversion_targets=targets))
+    return PathResults(
+        **{
+            field: np.concatenate([getattr(batch, field) for batch in batches])
+            for field in PathResults.__dataclass_fields__
+        }
+    )
+
+
+def best_candidates(results: PathResults, scores: np.ndarray, count: int) -> np.ndarray:
+    """
+    Indices of the highest-scoring candidates, best first.
+
+    Candidates that run out of money earlier than the baseline (row 0) are
+    never preferred to it.
+    """
+    lasts = np.where(results.depletion_year == 0, np.iinfo(np.int32).max, results.depletion_year)
+    eligible = np.where(lasts >= lasts[0], scores, -np.inf)
+    order = np.argsort(-eligible, kind="stable")
+    return order[: min(count, int(np.isfinite(eligible).sum()))]
@@ -0,0 +1,337 @@
+"""Vectorized retirement cash-flow kernel over a batch of return paths."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.engine.buckets import SEGMENT_ORDER, STOCKS_SEGMENT, BucketPlan
+from app.engine.inflation import InflationIndexing
+from app.engine.spending import SpendingPolicy
+from app.engine.tax import IncomeTaxSchedule
+from app.engine.tax_lots import AverageCostBasis, LotBasis, ReliefCurve, cost_basis_tracker
+from app.engine.withdrawal import (
+    BUCKETS,
+    CASH,
+    PRETAX,
+    ROTH,
+    TAXABLE,
+    StrategyStack,
+    WithdrawalStrategy,
+    strategy_rows,
+    withdraw_in_order,
+)
+
+# Fixed-point iterations used to gross withdrawals up for the tax they trigger
+TAX_GROSS_UP_ITERATIONS = 3
+
+# Shortfalls below this are rounding noise, as in the deterministic projection
+SHORTFALL_TOLERANCE = 0.01
+
+# Ways to compare results, as scored by score_results
+OBJECTIVES = ("after_tax_wealth", "lifetime_tax")
+
+
+@dataclass
+class PathInputs:
+    """Balance-independent inputs of the kernel (per-year arrays are indexed by year - 1)."""
+
+    balances: np.ndarray  # (4,) starting balances in BUCKETS order
+    taxable_cost_basis: float
+    ss_income: np.ndarray  # (years,)
+    other_income: np.ndarray  # (years,)
+    spending: np.ndarray  # (years,) total spending including lump sums
+    deductions: float
+    tax_schedule: IncomeTaxSchedule
+    variable_spending: np.ndarray | None = None  # (years,) planned part a policy may adjust
+    spending_policy: SpendingPolicy | None = None  # None keeps the planned spending
+    bucket_plan: BucketPlan | None = None  # segments each account; returns are then per segment
+    withdrawal_strategy: WithdrawalStrategy | StrategyStack | None = None  # None: conventional
+    rmd_fractions: np.ndarray | None = None  # (years,) share of pretax forced out; None: no RMDs
+    relief_curve: ReliefCurve | None = None  # taxable basis by lot; None: average cost
+    inflation_indexing: InflationIndexing | None = None  # needed to simulate inflation
+
+    @property
+    def years(self) -> int:
+        """Number of projection years."""
+        return len(self.spending)
+
+    @property
+    def net_need(self) -> np.ndarray:
+        """Planned spending not covered by income, per year."""
+        return np.maximum(np.asarray(self.spending) - self.ss_income - self.other_income, 0.0)
+
+    def initial_segment_fractions(self) -> np.ndarray:
+        """Share of the starting portfolio (3,) in each bucket segment."""
+        total = np.array([float(np.sum(self.balances))])
+        return self.bucket_plan.fractions(self.bucket_plan.targets(self.net_need)[0], total)[0]
+
+
+@dataclass
+class PathResults:
+    """Kernel output for a batch of paths."""
+
+    ending_balance: np.ndarray  # (batch, years) total portfolio at year end
+    withdrawals: np.ndarray  # (batch, years)
+    taxes: np.ndarray  # (batch, years)
+    spending: np.ndarray  # (batch, years) total spending after any policy adjustment
+    conversions: np.ndarray  # (batch, years) pretax balance converted to Roth
+    rmds: np.ndarray  # (batch, years) required minimum distributions
+    final_balances: np.ndarray  # (batch, 4) in BUCKETS order
+    depletion_year: np.ndarray  # (batch,) 1-based year of depletion, 0 if never
+
+    @property
+    def success(self) -> np.ndarray:
+        """Whether each path funded spending through the whole horizon."""
+        return self.depletion_year == 0
+
+
+def _taxable_income(
+    inputs: PathInputs,
+    withdrawals: np.ndarray,
+    balances: np.ndarray,
+    cost_basis: AverageCostBasis | LotBasis,
+    taxable_ss: np.ndarray,
+    other_income: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Taxable income of a year and the long-term gains in it, given each bucket's withdrawal."""
+    # Only the gain portion of a taxable-account withdrawal is taxable
+    gains = cost_basis.gains(withdrawals[:, TAXABLE], balances[:, TAXABLE])
+    income = taxable_ss + withdrawals[:, PRETAX] + gains + other_income - inputs.deductions
+    return income, gains
+
+
+def _income_tax(inputs: PathInputs, *args) -> np.ndarray:
+    """Tax on a year's income given the withdrawal taken from each bucket."""
+    income, gains = _taxable_income(inputs, *args)
+    return inputs.tax_schedule.tax(income, gains, income + inputs.deductions)
+
+
+def _spending_plan(inputs: PathInputs, spending_index: np.ndarray | None = None):
+    """
+    Planned variable spending and the policy applied to it, or (None, None) if fixed.
+
+    With a spending index (batch, years) the plan is per path, shaped (years, batch).
+    """
+    policy = inputs.spending_policy
+    if policy is None or policy.name == "fixed" or inputs.variable_spending is None:
+        return None, None
+    planned = np.asarray(inputs.variable_spending, dtype=np.float64)
+    if spending_index is not None:
+        planned = planned[:, None] * spending_index.T
+    return planned, policy
+
+
+def _cash_flows(inputs: PathInputs, inflation: np.ndarray | None):
+    """
+    Spending, Social Security and other income as (rows, years) arrays.
+
+    Without inflation paths there is one row, broadcast over the batch;
+    otherwise each path's flows follow its own inflation. Also returns the
+    spending index (None without inflation paths).
+    """
+    spending = np.asarray(inputs.spending, dtype=np.float64)[None, :]
+    ss_income = np.asarray(inputs.ss_income, dtype=np.float64)[None, :]
+    other_income = np.asarray(inputs.other_income, dtype=np.float64)[None, :]
+    if inflation is None:
+        return spending, ss_income, other_income, None
+    indexing = inputs.inflation_indexing
+    if indexing is None:
+        raise ValueError("Simulating inflation needs the inputs' inflation indexing")
+    spending_index, ss_income, other_income = indexing.realized(inflation, ss_income, other_income)
+    spending = spending + indexing.spending * (spending_index - 1.0)
+    return spending, ss_income, other_income, spending_index
+
+
+def _withdraw(strategy, unforced, rmd, required, base_income) -> np.ndarray:
+    """The year's withdrawal: the RMD from pretax, then the strategy covers the rest of required."""
+    withdrawals = strategy.withdraw(unforced, np.maximum(required - rmd, 0.0), base_income + rmd)
+    withdrawals[:, PRETAX] += rmd
+    return withdrawals
+
+
+def simulate_paths(
+    inputs: PathInputs,
+    returns: np.ndarray,
+    conversion_targets: np.ndarray | None = None,
+    inflation: np.ndarray | None = None,
+) -> PathResults:
+    """
+    Run the projection for every row of returns (shape (batch, years), fractions).
+
+    inflation (batch, years) is each path's realized inflation; inflation-linked
+    spending, Social Security COLAs and other-income COLAs follow it instead
+    of the assumed rate they were projected with.
+
+    conversion_targets (batch, years) converts pretax money to Roth after each
+    year's withdrawals until taxable income reaches the target (-inf for no
+    conversion). The extra tax is paid from taxable, then cash, and otherwise
+    out of the conversion itself; gains realized to pay it are not taxed again.
+
+    Required minimum distributions come out of pretax first and count toward
+    the year's withdrawal; any part not needed for spending and tax is
+    reinvested in the taxable account as new cost basis.
+
+    With a bucket plan, returns has shape (batch, years, 3) with one column per
+    segment, and each account's withdrawal is taken cash first, then balanced,
+    then stocks.
+
+    Follows the deterministic projection's rules: spending net of income is
+    withdrawn following the withdrawal strategy (a StrategyStack gives each
+    row its own), grossed up for income tax, and each bucket earns the year's
+    return on the average of its starting and post-withdrawal balance. The
+    tax gross-up is iterated to a fixed point rather than estimated once and
+    topped up, so balances track the projection closely but not exactly, and
+    drift further apart in years the projection tops up a shortfall.
+    """
+    batch, years = returns.shape[:2]
+    balances = np.broadcast_to(
+        np.asarray(inputs.balances, dtype=np.float64), (batch, len(BUCKETS))
+    ).copy()
+    cost_basis = cost_basis_tracker(inputs.relief_curve, inputs.taxable_cost_basis, batch)
+
+    ending_balance = np.empty((batch, years))
+    withdrawals_out = np.empty((batch, years))
+    taxes_out = np.empty((batch, years))
+    spending_out = np.empty((batch, years))
+    conversions_out = np.zeros((batch, years))
+    rmds_out = np.zeros((batch, years))
+    depletion_year = np.zeros(batch, dtype=np.int32)
+
+    spending_rows, ss_rows, other_rows, spending_index = _cash_flows(inputs, inflation)
+    planned, policy = _spending_plan(inputs, spending_index)
+    if policy is not None:
+        policy_state = policy.start(planned, balances.sum(axis=1))
+
+    plan = inputs.bucket_plan
+    if plan is not None:
+        bucket_targets = plan.targets(inputs.net_need)
+        segments = plan.split(balances, plan.fractions(bucket_targets[0], balances.sum(axis=1)))
+
+    strategy = strategy_rows(inputs.withdrawal_strategy, batch, inputs.tax_schedule)
+
+    prior_return = np.zeros(batch)
+    for i in range(years):
+        ss_income = ss_rows[:, i]
+        other_income = other_rows[:, i]
+        spending = np.broadcast_to(spending_rows[:, i], (batch,)).copy()
+        if policy is not None:
+            adjusted = policy.variable_spending(
+                i, planned, balances.sum(axis=1), prior_return, policy_state
+            )
+            spending += adjusted - planned[i]
+        gross_needed = spending - ss_income - other_income
+        ss_taxable_pct = np.where(ss_income + gross_needed > 44000, 0.85, 0.50)
+        taxable_ss = ss_income * ss_taxable_pct
+
+        # The strategy covers whatever the required distribution does not
+        rmd_fraction = inputs.rmd_fractions[i] if inputs.rmd_fractions is not None else 0.0
+        rmd = balances[:, PRETAX] * rmd_fraction
+        unforced = balances.copy()
+        unforced[:, PRETAX] -= rmd
+
+        # Start from the tax on an all-pretax withdrawal, then iterate to a fixed point
+        base_income = taxable_ss + other_income - inputs.deductions
+        estimate = np.maximum(gross_needed, rmd)
+        tax = inputs.tax_schedule.tax(base_income + estimate)
+        required = np.maximum(gross_needed + tax, 0.0)
+        for _ in range(TAX_GROSS_UP_ITERATIONS):
+            withdrawals = _withdraw(strategy, unforced, rmd, required, base_income)
+            tax = _income_tax(inputs, withdrawals, balances, cost_basis, taxable_ss, other_income)
+            required = np.maximum(gross_needed + tax, 0.0)
+        # Fund the tax of the last iteration too, so that only money the accounts
+        # cannot supply shows up as a shortfall
+        withdrawals = _withdraw(strategy, unforced, rmd, required, base_income)
+        withdrawn = withdrawals.sum(axis=1)
+        reinvested = np.maximum(rmd - required, 0.0)
+        rmds_out[:, i] = rmd
+
+        converted_to_roth = 0.0
+        if conversion_targets is not None:
+            income, gains = _taxable_income(
+                inputs, withdrawals, balances, cost_basis, taxable_ss, other_income
+            )
+            remaining = balances - withdrawals
+            remaining[:, TAXABLE] += reinvested
+            # Targets are ordinary-income bracket tops; gains stack above them
+            conversion = np.clip(
+                conversion_targets[:, i] - (income - gains), 0.0, remaining[:, PRETAX]
+            )
+            converted_income = income + conversion
+            conversion_tax = (
+                inputs.tax_schedule.tax(
+                    converted_income, gains, converted_income + inputs.deductions
+                )
+                - tax
+            )
+            paid = withdraw_in_order(remaining, conversion_tax, (TAXABLE, CASH))
+            withdrawals = withdrawals + paid
+            withdrawals[:, PRETAX] += conversion
+            converted_to_roth = conversion - (conversion_tax - paid.sum(axis=1))
+            tax = tax + conversion_tax
+            conversions_out[:, i] = conversion
+
+        # Cost basis leaves the taxable bucket with the withdrawal (pro rata or by lot)
+        cost_basis.relieve(withdrawals[:, TAXABLE], balances[:, TAXABLE])
+
+        if plan is None:
+            after = balances - withdrawals
+            after[:, ROTH] += converted_to_roth
+            after[:, TAXABLE] += reinvested
+            growth = (balances + after) / 2.0 * returns[:, i, None]
+            balances = np.maximum(after + growth, 0.0)
+            prior_return = returns[:, i]
+        else:
+            # Each account's withdrawal drains its segments in order
+            taken = withdraw_in_order(
+                segments.reshape(-1, len(SEGMENT_ORDER)), withdrawals.reshape(-1), SEGMENT_ORDER
+            ).reshape(segments.shape)
+            after = segments - taken
+            # Converted money is long-horizon, so it lands in the Roth stocks segment
+            after[:, ROTH, STOCKS_SEGMENT] += converted_to_roth
+            after[:, TAXABLE, STOCKS_SEGMENT] += reinvested
+            average = (segments + after) / 2.0
+            growth = average * returns[:, i, None, :]
+            segments = np.maximum(after + growth, 0.0)
+            invested = average.sum(axis=(1, 2))
+            prior_return = np.divide(
+                growth.sum(axis=(1, 2)), invested, out=np.zeros(batch), where=invested > 0
+            )
+            fractions = plan.fractions(bucket_targets[i + 1], segments.sum(axis=(1, 2)))
+            segments = plan.refill(segments, fractions, returns[:, i, STOCKS_SEGMENT] > 0)
+            balances = segments.sum(axis=2)
+        cost_basis.add(reinvested)
+
+        total = balances.sum(axis=1)
+        failed = (total <= 0) | (required - withdrawn > SHORTFALL_TOLERANCE)
+        depletion_year = np.where((depletion_year == 0) & failed, i + 1, depletion_year)
+
+        ending_balance[:, i] = total
+        withdrawals_out[:, i] = withdrawn
+        taxes_out[:, i] = tax
+        spending_out[:, i] = spending
+
+    return PathResults(
+        ending_balance=ending_balance,
+        withdrawals=withdrawals_out,
+        taxes=taxes_out,
+        spending=spending_out,
+        conversions=conversions_out,
+        rmds=rmds_out,
+        final_balances=balances,
+        depletion_year=depletion_year,
+    )
+
+
+def score_results(results: PathResults, objective: str, pretax_tax_rate: float) -> np.ndarray:
+    """
+    Objective value of each row (higher is better).
+
+    Pretax money left at the end still owes tax, charged at pretax_tax_rate,
+    so both objectives compare results on a fully taxed basis.
+    """
+    deferred_tax = results.final_balances[:, PRETAX] * pretax_tax_rate
+    if objective == "after_tax_wealth":
+        return results.final_balances.sum(axis=1) - deferred_tax
+    if objective == "lifetime_tax":
+        return -(results.taxes.sum(axis=1) + deferred_tax)
+    raise ValueError(f"Unknown objective: {objective}")
@@ -0,0 +1,159 @@
+"""Dynamic spending rules evaluated on arrays of portfolio balances."""
+
+import numpy as np
+
+SPENDING_POLICIES = ("fixed", "guardrails", "constant_percentage", "floor_ceiling")
+
+
+def _rate(spending: np.ndarray, balance: np.ndarray) -> np.ndarray:
+    """Withdrawal rate spending / balance (infinite for an empty portfolio)."""
+    return np.divide(spending, balance, out=np.full_like(spending, np.inf), where=balance > 0)
+
+
+class SpendingPolicy:
+    """
+    Planned variable spending, unchanged by market performance.
+
+    Policies decide the variable (inflation-adjusted) part of each year's
+    spending from the start-of-year portfolio balance of every path at once.
+    Fixed expenses and lump sums are never adjusted.
+    """
+
+    name = "fixed"
+
+    def start(self, planned: np.ndarray, balance: np.ndarray) -> dict:
+        """
+        Per-path state before year 1.
+
+        planned is the planned variable spending, (years,) or (years, batch)
+        when each path has its own inflation.
+        """
+        return {}
+
+    def variable_spending(
+        self,
+        i: int,
+        planned: np.ndarray,
+        balance: np.ndarray,
+        prior_return: np.ndarray,
+        state: dict,
+    ) -> np.ndarray:
+        """Variable spending (batch,) for year index i given start-of-year balances."""
+        return np.full_like(balance, planned[i])
+
+
+class ConstantPercentagePolicy(SpendingPolicy):
+    """Spend a fixed percentage of the current portfolio each year."""
+
+    name = "constant_percentage"
+
+    def __init__(self, withdrawal_rate: float):
+        """withdrawal_rate is a fraction (0.04 for 4%)."""
+        self.withdrawal_rate = withdrawal_rate
+
+    def variable_spending(self, i, planned, balance, prior_return, state):
+        """Variable spending for year index i."""
+        return self.withdrawal_rate * np.maximum(balance, 0.0)
+
+
+class FloorCeilingPolicy(ConstantPercentagePolicy):
+    """Constant percentage of the portfolio, bounded by a floor and ceiling on the plan."""
+
+    name = "floor_ceiling"
+
+    def __init__(self, withdrawal_rate: float, floor: float, ceiling: float):
+        """Floor and ceiling are fractions of the planned spending (0.9, 1.2)."""
+        super().__init__(withdrawal_rate)
+        self.floor = floor
+        self.ceiling = ceiling
+
+    def variable_spending(self, i, planned, balance, prior_return, state):
+        """Variable spending for year index i."""
+        target = super().variable_spending(i, planned, balance, prior_return, state)
+        return np.clip(target, self.floor * planned[i], self.ceiling * planned[i])
+
+
+class GuardrailsPolicy(SpendingPolicy):
+    """
+    Guyton-Klinger guardrails.
+
+    Spending follows the plan's year-over-year growth, except that the
+    increase is skipped after a losing year while the withdrawal rate is above
+    its initial level. When the withdrawal rate drifts more than the upper
+    guardrail above its initial level spending is cut, and when it falls more
+    than the lower guardrail below it spending is raised.
+    """
+
+    name = "guardrails"
+
+    def __init__(self, upper_guardrail: float, lower_guardrail: float, adjustment: float):
+        """All parameters are fractions (0.2 for 20%)."""
+        self.upper_guardrail = upper_guardrail
+        self.lower_guardrail = lower_guardrail
+        self.adjustment = adjustment
+
+    def start(self, planned, balance):
+        """Start every path at the planned spending and record its initial rate."""
+        spending = np.full_like(balance, planned[0])
+        return {"spending": spending, "initial_rate": _rate(spending, balance)}
+
+    def variable_spending(self, i, planned, balance, prior_return, state):
+        """Variable spending for year index i."""
+        spending = state["spending"]
+        initial_rate = state["initial_rate"]
+        if i > 0:
+            growth = np.divide(
+                planned[i], planned[i - 1], out=np.ones_like(balance), where=planned[i - 1] > 0
+            )
+            freeze = (prior_return < 0) & (_rate(spending, balance) > initial_rate)
+            spending = np.where(freeze, spending, spending * growth)
+
+            rate = _rate(spending, balance)
+            spending = np.where(
+                rate > initial_rate * (1 + self.upper_guardrail),
+                spending * (1 - self.adjustment),
+                spending,
+            )
+            spending = np.where(
+                rate < initial_rate * (1 - self.lower_guardrail),
+                spending * (1 + self.adjustment),
+                spending,
+            )
+        state["spending"] = spending
+        return spending
+
+
+def make_spending_policy(name: str, params: dict | None = None) -> SpendingPolicy:
+    """
+    Build a policy from its name and percentage parameters.
+
+    params uses the SpendingPolicyParams field names, in percent; missing
+    values take the schema defaults.
+    """
+    params = {k: float(v) for k, v in (params or {}).items() if v is not None}
+    withdrawal_rate = params.get("withdrawal_rate", 4.0) / 100
+    if name == "fixed":
+        return SpendingPolicy()
+    if name == "constant_percentage":
+        return ConstantPercentagePolicy(withdrawal_rate)
+    if name == "floor_ceiling":
+        return FloorCeilingPolicy(
+            withdrawal_rate,
+            params.get("floor_percent", 90.0) / 100,
+            params.get("ceiling_percent", 120.0) / 100,
+        )
+    if name == "guardrails":
+        return GuardrailsPolicy(
+            params.get("upper_guardrail_percent", 20.0) / 100,
+            params.get("lower_guardrail_percent", 20.0) / 100,
+            params.get("adjustment_percent", 10.0) / 100,
+        )
+    raise ValueError(f"Unknown spending policy: {name}")
+
+
+def scenario_spending_policy(scenario) -> SpendingPolicy:
+    """The spending policy configured on a scenario schema."""
+    params = getattr(scenario, "spending_policy_params", None)
+    if hasattr(params, "model_dump"):
+        params = params.model_dump()
+    return make_spending_policy(getattr(scenario, "spending_policy", "fixed") or "fixed", params)
@@ -0,0 +1,157 @@
+"""Income tax schedules evaluable on arrays."""
+
+from decimal import Decimal
+
+import numpy as np
+
+from app.engine.data_registry import federal_tax_tables
+
+# 2024 Federal Tax Brackets as (upper limit, rate); the last limit is effectively unbounded.
+# Kept as strings so the Decimal projection engine uses the exact same values.
+FEDERAL_BRACKETS_2024: dict[str, tuple[tuple[str, str], ...]] = {
+    "married_filing_jointly": (
+        ("23200", "0.10"),
+        ("94300", "0.12"),
+        ("201050", "0.22"),
+        ("383900", "0.24"),
+        ("487450", "0.32"),
+        ("731200", "0.35"),
+        ("999999999", "0.37"),
+    ),
+    "single": (
+        ("11600", "0.10"),
+        ("47150", "0.12"),
+        ("100525", "0.22"),
+        ("191950", "0.24"),
+        ("243725", "0.32"),
+        ("609350", "0.35"),
+        ("999999999", "0.37"),
+    ),
+    # head_of_household, also used for any other filing status
+    "head_of_household": (
+        ("16550", "0.10"),
+        ("63100", "0.12"),
+        ("100500", "0.22"),
+        ("191950", "0.24"),
+        ("243700", "0.32"),
+        ("609350", "0.35"),
+        ("999999999", "0.37"),
+    ),
+}
+
+# Colorado flat income tax rate
+STATE_TAX_RATE = "0.044"
+
+# Year of the capital gains thresholds in the federal tax tables, matching the brackets above
+CAPITAL_GAINS_TAX_YEAR = "2024"
+
+
+def federal_brackets(filing_status: str) -> tuple[tuple[str, str], ...]:
+    """Bracket table for a filing status (head of household is the fallback)."""
+    return FEDERAL_BRACKETS_2024.get(filing_status, FEDERAL_BRACKETS_2024["head_of_household"])
+
+
+def capital_gains_brackets(filing_status: str) -> tuple[tuple[str, str], ...]:
+    """0/15/20% long-term capital gains brackets as (upper limit, rate) strings."""
+    tables = federal_tax_tables()["capital_gains_brackets"][CAPITAL_GAINS_TAX_YEAR]
+    rows = tables.get(filing_status, tables["head_of_household"])
+    return tuple(
+        (
+            str(row["max"]) if row["max"] is not None else "999999999",
+            str(Decimal(row["rate"]) / 100),
+        )
+        for row in rows
+    )
+
+
+def net_investment_income_tax(filing_status: str) -> tuple[str, str]:
+    """Net investment income tax (rate, MAGI threshold) as strings."""
+    niit = federal_tax_tables()["net_investment_income_tax"]
+    thresholds = niit["thresholds"]
+    threshold = thresholds.get(filing_status, thresholds["head_of_household"])
+    return str(Decimal(str(niit["rate"])) / 100), str(threshold)
+
+
+class BracketSchedule:
+    """
+    Progressive bracket schedule precompiled into threshold arrays.
+
+    Tax at any income is the cumulative tax at the bracket floor plus the
+    marginal rate times the income above it, so evaluation over an array of
+    incomes is one searchsorted and a few vector operations.
+    """
+
+    def __init__(self, brackets):
+        """Compile (upper limit, rate) pairs into floors, rates and cumulative tax."""
+        limits = np.array([float(limit) for limit, _ in brackets])
+        self.rates = np.array([float(rate) for _, rate in brackets])
+        self.floors = np.concatenate(([0.0], limits[:-1]))
+        self.cumulative = np.concatenate(([0.0], np.cumsum(np.diff(self.floors) * self.rates[:-1])))
+
+    def tax(self, income: np.ndarray) -> np.ndarray:
+        """Tax owed on each income (negative incomes owe nothing)."""
+        income = np.maximum(np.asarray(income, dtype=np.float64), 0.0)
+        idx = np.searchsorted(self.floors, income, side="right") - 1
+        return self.cumulative[idx] + (income - self.floors[idx]) * self.rates[idx]
+
+    def top_of_bracket(self, rate: float) -> float:
+        """Upper limit of the bracket taxed at the given marginal rate."""
+        matches = np.nonzero(np.isclose(self.rates, rate))[0]
+        if len(matches) == 0:
+            raise ValueError(f"No bracket with rate {rate}")
+        i = matches[0]
+        return float(self.floors[i + 1]) if i + 1 < len(self.floors) else float("inf")
+
+
+class CapitalGainsSchedule:
+    """
+    Long-term capital gains brackets stacked on ordinary income, plus NIIT.
+
+    Gains fill the 0/15/20% brackets starting where ordinary taxable income
+    ends, so their tax is the bracket tax at ordinary + gains minus the
+    bracket tax at ordinary alone: two searchsorted lookups per batch.
+    """
+
+    def __init__(self, filing_status: str):
+        """Compile the capital gains brackets and NIIT threshold for a filing status."""
+        self.brackets = BracketSchedule(capital_gains_brackets(filing_status))
+        rate, threshold = net_investment_income_tax(filing_status)
+        self.niit_rate = float(rate)
+        self.niit_threshold = float(threshold)
+
+    def tax(self, ordinary_income: np.ndarray, gains: np.ndarray, magi: np.ndarray) -> np.ndarray:
+        """
+        Federal tax on gains above ordinary taxable income, with NIIT on MAGI
+        over the threshold.
+        """
+        ordinary = np.maximum(ordinary_income, 0.0)
+        stacked = self.brackets.tax(ordinary_income + gains) - self.brackets.tax(ordinary)
+        niit = np.minimum(np.maximum(gains, 0.0), np.maximum(magi - self.niit_threshold, 0.0))
+        return stacked + niit * self.niit_rate
+
+
+class IncomeTaxSchedule:
+    """Federal brackets, capital gains brackets and flat state tax for one filing status."""
+
+    def __init__(self, filing_status: str, state_rate: float = float(STATE_TAX_RATE)):
+        """Compile the federal schedules for a filing status."""
+        self.federal = BracketSchedule(federal_brackets(filing_status))
+        self.capital_gains = CapitalGainsSchedule(filing_status)
+        self.state_rate = state_rate
+
+    def tax(self, taxable_income: np.ndarray, gains=0.0, magi=None) -> np.ndarray:
+        """
+        Federal plus state tax on taxable income (after deductions).
+
+        gains is the long-term capital gain included in taxable_income; it is
+        taxed federally on top of the ordinary part (NIIT uses magi, which
+        defaults to taxable income). The state taxes it like ordinary income.
+        """
+        total = np.maximum(taxable_income, 0.0)
+        if np.isscalar(gains) and gains == 0:
+            return self.federal.tax(total) + total * self.state_rate
+        ordinary = taxable_income - gains
+        federal = self.federal.tax(ordinary) + self.capital_gains.tax(
+            ordinary, gains, taxable_income if magi is None else magi
+        )
+        return federal + total * self.state_rate
@@ -0,0 +1,193 @@
+"""Tax-lot cost basis held as parallel arrays, with FIFO / HIFO / specific-ID relief."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# How basis leaves the taxable account on a sale; "average" ignores lots
+COST_BASIS_METHODS = ("average", "fifo", "hifo", "spec_id")
+
+
+@dataclass(frozen=True)
+class ReliefCurve:
+    """
+    Cumulative value and basis of the starting lots along their relief order.
+
+    Both arrays start at 0, so the basis of everything sold between two
+    points on the value axis is a difference of two interpolations.
+    Taxable money not covered by lots is carried separately at average cost.
+    """
+
+    value: np.ndarray  # (n + 1,) cumulative market value today
+    basis: np.ndarray  # (n + 1,) cumulative cost basis
+    extra_value: float = 0.0
+    extra_basis: float = 0.0
+
+    @property
+    def total(self) -> float:
+        """Market value of all lots today."""
+        return float(self.value[-1])
+
+    def basis_between(self, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+        """Basis of the lots sold from start to end along the value axis."""
+        return np.interp(end, self.value, self.basis) - np.interp(start, self.value, self.basis)
+
+
+@dataclass
+class TaxLotTable:
+    """
+    Lots of the taxable bucket as parallel arrays, one entry per lot.
+
+    A lot's market value is its share (by quantity) of its holding's amount.
+    """
+
+    acquired: np.ndarray  # (n,) datetime64[D]
+    value: np.ndarray  # (n,) market value today
+    basis: np.ndarray  # (n,) cost basis
+    priority: np.ndarray  # (n,) specific-identification order, inf when unset
+
+    @classmethod
+    def from_rows(cls, rows) -> "TaxLotTable":
+        """
+        Build from (holding_id, acquired_on, quantity, cost_basis, sale_priority,
+        holding amount) rows; lots worth nothing are dropped.
+        """
+        if not rows:
+            empty = np.zeros(0)
+            return cls(np.zeros(0, dtype="datetime64[D]"), empty, empty, empty)
+        holdings, acquired, quantity, basis, priority, amount = zip(*rows)
+        _, holding_index = np.unique([str(h) for h in holdings], return_inverse=True)
+        quantity = np.array(quantity, dtype=np.float64)
+        held = np.bincount(holding_index, weights=quantity)
+        value = np.array(amount, dtype=np.float64) * quantity / held[holding_index]
+        priority = np.array([np.inf if p is None else p for p in priority], dtype=np.float64)
+        keep = value > 0
+        return cls(
+            acquired=np.array(acquired, dtype="datetime64[D]")[keep],
+            value=value[keep],
+            basis=np.array(basis, dtype=np.float64)[keep],
+            priority=priority[keep],
+        )
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def relief_order(self, method: str) -> np.ndarray:
+        """Indices of the lots in the order they are sold."""
+        if method == "fifo":
+            return np.argsort(self.acquired, kind="stable")
+        if method == "hifo":
+            per_dollar = self.basis / self.value
+            return np.argsort(-per_dollar, kind="stable")
+        if method == "spec_id":
+            # Lots without a priority follow, oldest first
+            return np.lexsort((self.acquired, self.priority))
+        raise ValueError(f"Unknown cost basis method: {method}")
+
+    def relief_curve(
+        self, method: str, taxable_balance: float, taxable_cost_basis: float
+    ) -> ReliefCurve:
+        """
+        Cumulative relief curve for a method.
+
+        Taxable money beyond the lots keeps the account-level average cost.
+        """
+        order = self.relief_order(method)
+        value = np.concatenate([[0.0], np.cumsum(self.value[order])])
+        basis = np.concatenate([[0.0], np.cumsum(self.basis[order])])
+        extra_value = max(taxable_balance - float(value[-1]), 0.0)
+        ratio = min(taxable_cost_basis / taxable_balance, 1.0) if taxable_balance > 0 else 0.0
+        return ReliefCurve(value, basis, extra_value, extra_value * ratio)
+
+    def fingerprint(self) -> list:
+        """Lot data as plain lists, for input hashing."""
+        return [
+            self.acquired.astype(str).tolist(),
+            self.value.tolist(),
+            self.basis.tolist(),
+            self.priority.tolist(),
+        ]
+
+
+class AverageCostBasis:
+    """Taxable-account basis relieved in proportion to each sale (average cost)."""
+
+    def __init__(self, cost_basis: float, batch: int):
+        """Start every path with the account's cost basis."""
+        self.basis = np.full(batch, float(cost_basis))
+
+    def gains(self, amount: np.ndarray, balance: np.ndarray) -> np.ndarray:
+        """Gain realized by selling amount out of balance, per path."""
+        ratio = np.minimum(
+            np.divide(self.basis, balance, out=np.zeros_like(self.basis), where=balance > 0),
+            1.0,
+        )
+        return amount * (1.0 - ratio)
+
+    def relieve(self, amount: np.ndarray, balance: np.ndarray) -> None:
+        """Remove the basis of a sale of amount out of balance."""
+        self.basis -= self.basis * np.divide(
+            amount, balance, out=np.zeros_like(self.basis), where=balance > 0
+        )
+
+    def add(self, amount: np.ndarray) -> None:
+        """Invest new money, which is all basis."""
+        self.basis = np.maximum(self.basis, 0.0) + amount
+
+
+class LotBasis:
+    """
+    Taxable-account basis relieved lot by lot along a fixed order.
+
+    Every lot earns the taxable account's return, so the relief order never
+    changes. Measured in units worth $1 today, a path's state is how far
+    along the relief curve its sales have reached, plus an average-cost pool
+    (money not covered by lots and money added later) sold after the lots.
+    """
+
+    def __init__(self, curve: ReliefCurve, batch: int):
+        """Start every path with no lots sold."""
+        self.curve = curve
+        self.sold = np.zeros(batch)
+        self.pool_units = np.full(batch, curve.extra_value)
+        self.pool_basis = np.full(batch, curve.extra_basis)
+        self.price = np.ones(batch)
+
+    def _sale(self, amount: np.ndarray, balance: np.ndarray):
+        """Unit price, units sold from the lots and the pool, and the basis sold."""
+        held = self.curve.total - self.sold + self.pool_units
+        price = np.divide(balance, held, out=np.ones_like(self.sold), where=held > 0)
+        units = np.divide(amount, price, out=np.zeros_like(self.sold), where=price > 0)
+        from_lots = np.minimum(units, self.curve.total - self.sold)
+        from_pool = np.minimum(units - from_lots, self.pool_units)
+        pool_share = np.divide(
+            from_pool, self.pool_units, out=np.zeros_like(self.sold), where=self.pool_units > 0
+        )
+        lot_basis = self.curve.basis_between(self.sold, self.sold + from_lots)
+        return price, from_lots, from_pool, pool_share, lot_basis + self.pool_basis * pool_share
+
+    def gains(self, amount: np.ndarray, balance: np.ndarray) -> np.ndarray:
+        """Gain realized by selling amount out of balance, per path (losses count as 0)."""
+        basis = self._sale(amount, balance)[-1]
+        return np.maximum(amount - basis, 0.0)
+
+    def relieve(self, amount: np.ndarray, balance: np.ndarray) -> None:
+        """Sell amount out of balance, advancing along the relief order."""
+        self.price, from_lots, from_pool, pool_share, _ = self._sale(amount, balance)
+        self.sold += from_lots
+        self.pool_basis -= self.pool_basis * pool_share
+        self.pool_units -= from_pool
+
+    def add(self, amount: np.ndarray) -> None:
+        """Invest new money into the pool at the price of the last sale."""
+        self.pool_units += np.divide(
+            amount, self.price, out=np.zeros_like(self.sold), where=self.price > 0
+        )
+        self.pool_basis += amount
+
+
+def cost_basis_tracker(curve: ReliefCurve | None, cost_basis: float, batch: int):
+    """Lot-by-lot relief when there is a relief curve, otherwise average cost."""
+    if curve is None:
+        return AverageCostBasis(cost_basis, batch)
+    return LotBasis(curve, batch)
@@ -0,0 +1,150 @@
+"""Withdrawal sequencing strategies, stackable as a batch dimension of the kernel."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.engine.tax import IncomeTaxSchedule
+
+# Account buckets, in the column order used throughout the engine
+BUCKETS = ("pretax", "roth", "taxable", "cash")
+PRETAX, ROTH, TAXABLE, CASH = range(len(BUCKETS))
+
+# Conventional withdrawal sequence: pretax, then taxable, then cash, Roth last
+CONVENTIONAL_ORDER = (PRETAX, TAXABLE, CASH, ROTH)
+
+# Pretax money above a bracket-filling cap, drawn after every other account
+PRETAX_OVERFLOW = len(BUCKETS)
+
+
+def withdraw_in_order(
+    balances: np.ndarray, amount: np.ndarray, order=CONVENTIONAL_ORDER
+) -> np.ndarray:
+    """
+    Take amount from balances bucket by bucket in the given order.
+
+    Each bucket gives the part of the amount not covered by the buckets before
+    it, up to its balance; computed for all rows at once from a cumulative sum.
+    """
+    ordered = balances[:, order]
+    covered_before = np.cumsum(ordered, axis=1) - ordered
+    taken = np.clip(amount[:, None] - covered_before, 0.0, ordered)
+    withdrawals = np.zeros_like(balances)
+    withdrawals[:, order] = taken
+    return withdrawals
+
+
+@dataclass(frozen=True)
+class WithdrawalStrategy:
+    """
+    Which accounts fund a year's withdrawal.
+
+    Sequential strategies drain accounts in order. Proportional strategies
+    take the same share of every account. With a bracket rate, pretax money
+    comes first only until taxable income reaches the top of that bracket,
+    and the rest of the pretax balance is drawn last.
+    """
+
+    name: str
+    order: tuple[int, ...]
+    proportional: bool = False
+    bracket_rate: float | None = None
+
+
+STRATEGIES: dict[str, WithdrawalStrategy] = {
+    strategy.name: strategy
+    for strategy in (
+        WithdrawalStrategy("conventional", CONVENTIONAL_ORDER),
+        WithdrawalStrategy("proportional", CONVENTIONAL_ORDER, proportional=True),
+        WithdrawalStrategy("bracket_filling", CONVENTIONAL_ORDER, bracket_rate=0.12),
+        # Spend cash and taxable money before either retirement account
+        WithdrawalStrategy("roth_last", (CASH, TAXABLE, PRETAX, ROTH)),
+        WithdrawalStrategy("taxable_first", (TAXABLE, PRETAX, CASH, ROTH)),
+    )
+}
+
+
+def get_strategy(name: str | None) -> WithdrawalStrategy:
+    """Strategy by name (conventional when None)."""
+    try:
+        return STRATEGIES[name or "conventional"]
+    except KeyError:
+        raise ValueError(f"Unknown withdrawal strategy: {name}")
+
+
+class StrategyStack:
+    """
+    Per-row withdrawal parameters for a batch mixing several strategies.
+
+    Row r uses strategies[r // rows_each], so a batch of strategies x paths
+    evaluates every strategy on the same return paths in one kernel call.
+    """
+
+    def __init__(self, strategies, rows_each: int, tax_schedule: IncomeTaxSchedule | None = None):
+        """Compile each strategy to a virtual-account order, proportional flag and pretax cap."""
+        self.strategies = tuple(strategies)
+        self.rows_each = rows_each
+
+        orders, proportional, tops = [], [], []
+        for strategy in self.strategies:
+            orders.append(strategy.order + (PRETAX_OVERFLOW,))
+            proportional.append(strategy.proportional)
+            if strategy.bracket_rate is None:
+                tops.append(np.inf)
+            else:
+                if tax_schedule is None:
+                    raise ValueError("Bracket-filling withdrawals need a tax schedule")
+                tops.append(tax_schedule.federal.top_of_bracket(strategy.bracket_rate))
+        self.orders = np.repeat(np.array(orders), rows_each, axis=0)
+        self.proportional = np.repeat(np.array(proportional), rows_each)
+        self.pretax_tops = np.repeat(np.array(tops, dtype=np.float64), rows_each)
+
+        # One plain sequence for every row: the cumulative-sum fast path applies
+        first = self.strategies[0]
+        self.uniform_order = (
+            first.order
+            if len(self.strategies) == 1 and not first.proportional and first.bracket_rate is None
+            else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.strategies) * self.rows_each
+
+    def withdraw(
+        self, balances: np.ndarray, amount: np.ndarray, base_income: np.ndarray
+    ) -> np.ndarray:
+        """
+        Withdrawal (batch, 4) covering amount per row.
+
+        base_income is each row's taxable income before any withdrawal, which
+        sets how much pretax money fits under a bracket-filling cap.
+        """
+        if self.uniform_order is not None:
+            return withdraw_in_order(balances, amount, self.uniform_order)
+
+        # Split pretax into the part under the cap and the overflow drawn last
+        headroom = np.maximum(self.pretax_tops - base_income, 0.0)
+        capped = np.minimum(balances[:, PRETAX], headroom)
+        virtual = np.concatenate([balances, (balances[:, PRETAX] - capped)[:, None]], axis=1)
+        virtual[:, PRETAX] = capped
+
+        ordered = np.take_along_axis(virtual, self.orders, axis=1)
+        covered_before = np.cumsum(ordered, axis=1) - ordered
+        taken = np.clip(amount[:, None] - covered_before, 0.0, ordered)
+        sequential = np.empty_like(virtual)
+        np.put_along_axis(sequential, self.orders, taken, axis=1)
+        sequential[:, PRETAX] += sequential[:, PRETAX_OVERFLOW]
+        sequential = sequential[:, :PRETAX_OVERFLOW]
+
+        total = balances.sum(axis=1)
+        share = np.minimum(np.divide(amount, total, out=np.zeros_like(total), where=total > 0), 1.0)
+        return np.where(self.proportional[:, None], balances * share[:, None], sequential)
+
+
+def strategy_rows(strategy, batch: int, tax_schedule: IncomeTaxSchedule) -> StrategyStack:
+    """A stack for the kernel: a given stack as is, or one strategy on every row."""
+    if isinstance(strategy, StrategyStack):
+        if len(strategy) != batch:
+            raise ValueError(f"Strategy stack has {len(strategy)} rows for a batch of {batch}")
+        return strategy
+    return StrategyStack([strategy or STRATEGIES["conventional"]], batch, tax_schedule)
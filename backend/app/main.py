@@ -1,19 +1,39 @@
 """FastAPI application entry point."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
 from app.config import settings
-from app.database import Base, engine
+from app.database import Base, engine, get_session_factory, pool_status
+from app.engine.path_library import ensure_path_library
+from app.repositories.portfolio_snapshot_repository import PortfolioSnapshotRepository
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Reconcile the allocation snapshot with holdings written outside the API,
+    and build the Monte Carlo path library if configured and missing or stale.
+    """
+    session_factory = app.dependency_overrides.get(get_session_factory, get_session_factory)()
+    with session_factory() as db:
+        PortfolioSnapshotRepository(db).reconcile()
+    if settings.path_library_build_on_startup:
+        ensure_path_library()
+    yield
+
+
 app = FastAPI(
     title="Retirement Planner API",
     description="API for retirement planning and portfolio management",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -23,6 +43,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # scenario list pagination
 )
 
 # Include API routes
@@ -39,3 +60,9 @@ def root():
 def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/health/db-pool")
+def db_pool_health():
+    """Connection pool sizes, connections in use, checkout counts and wait times."""
+    return pool_status()
@@ -6,8 +6,11 @@ from app.models.holding import Holding
 from app.models.other_income import OtherIncome
 from app.models.planned_fixed_expense import PlannedFixedExpense
 from app.models.planned_spending import PlannedSpending
+from app.models.portfolio_snapshot import PortfolioAllocationSnapshot
+from app.models.projection_run import ProjectionRun
 from app.models.scenario import SavedScenario
 from app.models.social_security import SocialSecurity
+from app.models.tax_lot import TaxLot
 from app.models.tax_config import TaxConfig
 
 __all__ = [
@@ -17,7 +20,10 @@ __all__ = [
     "OtherIncome",
     "PlannedFixedExpense",
     "PlannedSpending",
+    "PortfolioAllocationSnapshot",
+    "ProjectionRun",
     "SavedScenario",
     "SocialSecurity",
+    "TaxLot",
     "TaxConfig",
 ]
@@ -51,3 +51,6 @@ class Holding(Base):
 
     # Relationship back to account
     account = relationship("Account", back_populates="holdings")
+
+    # Purchase lots, when tracked
+    tax_lots = relationship("TaxLot", back_populates="holding", cascade="all, delete-orphan")
@@ -0,0 +1,31 @@
+"""Materialized portfolio allocation snapshot database model."""
+
+from sqlalchemy import Column, DateTime, Integer, Numeric, String
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+# Key of the row holding the sum of all account balances
+TOTAL_KEY = "__total__"
+
+
+class PortfolioAllocationSnapshot(Base):
+    """Model for running portfolio totals, one row per asset class plus the total."""
+
+    __tablename__ = "portfolio_allocation_snapshot"
+
+    key = Column(
+        String(50),
+        primary_key=True,
+        comment="Asset class, or __total__ for the sum of account balances",
+    )
+    amount = Column(Numeric(15, 2), nullable=False, default=0, comment="Dollar amount")
+    count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Holdings in the asset class (accounts for the total row)",
+    )
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
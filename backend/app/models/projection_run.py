@@ -0,0 +1,32 @@
+"""Stored projection run database model."""
+
+import uuid
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, LargeBinary, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class ProjectionRun(Base):
+    """Model for a computed projection of a saved scenario, kept for history and diffs."""
+
+    __tablename__ = "projection_runs"
+    __table_args__ = (
+        Index("ix_projection_runs_scenario_id", "scenario_id"),
+        Index("ix_projection_runs_created_at", "created_at"),
+        Index("ix_projection_runs_input_hash", "input_hash"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    scenario_id = Column(
+        UUID(as_uuid=True), ForeignKey("saved_scenarios.id", ondelete="CASCADE"), nullable=False
+    )
+    input_hash = Column(String(64), nullable=False, comment="Canonical hash of every input")
+    engine_version = Column(String(20), nullable=False, comment="Projection engine version")
+    summary = Column(JSONB, nullable=False, comment="Summary metrics of the result")
+    year_columns = Column(
+        LargeBinary, nullable=False, comment="Per-year projection columns, zlib-compressed JSON"
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -4,7 +4,7 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import Column, Date, DateTime, Integer, Numeric, String, Text
+from sqlalchemy import Column, Date, DateTime, Index, Integer, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -16,6 +16,16 @@ class SavedScenario(Base):
     """Model for saved retirement scenarios."""
 
     __tablename__ = "saved_scenarios"
+    # Keyset pagination of the scenario list (newest first)
+    __table_args__ = (
+        Index("ix_saved_scenarios_updated_at_id", "updated_at", "id"),
+        # Outcome search (GET /saved-scenarios?min_final=...)
+        Index("ix_saved_scenarios_final_portfolio", "final_portfolio"),
+        Index("ix_saved_scenarios_years_until_depletion", "years_until_depletion"),
+        Index("ix_saved_scenarios_depletion_age", "depletion_age"),
+        Index("ix_saved_scenarios_lifetime_tax", "lifetime_tax"),
+        Index("ix_saved_scenarios_success_probability", "success_probability"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     name = Column(String(255), nullable=False)
@@ -49,12 +59,42 @@ class SavedScenario(Base):
     spending_reduction_start_year = Column(
         Integer, nullable=True, comment="Year to start spending reduction"
     )
+    spending_policy = Column(
+        String(50),
+        nullable=False,
+        default="fixed",
+        server_default="fixed",
+        comment="fixed, guardrails, constant_percentage or floor_ceiling",
+    )
+    spending_policy_params = Column(
+        JSONB, nullable=True, comment="Spending policy parameters (percentages)"
+    )
+    withdrawal_strategy = Column(
+        String(50),
+        nullable=False,
+        default="conventional",
+        server_default="conventional",
+        comment="Account withdrawal order (conventional, proportional, bracket_filling, ...)",
+    )
+    cost_basis_method = Column(
+        String(20),
+        nullable=False,
+        default="average",
+        server_default="average",
+        comment="Taxable basis relief: average, fifo, hifo or spec_id (tax lots)",
+    )
 
     # Time parameters
     projection_years = Column(Integer, nullable=False, default=30, comment="Years to project")
 
     # Asset allocation (stored as JSON)
     asset_allocation = Column(JSONB, nullable=False, default=dict)
+    glide_path = Column(
+        JSONB, nullable=True, comment="Allocation keyframes by year or age (overrides allocation)"
+    )
+    bucket_strategy = Column(
+        JSONB, nullable=True, comment="Cash/balanced/stocks bucket sizes in years of spending"
+    )
 
     # Return assumptions
     return_source = Column(String(50), nullable=False, default="10_year_projections")
@@ -67,6 +107,19 @@ class SavedScenario(Base):
         Numeric(5, 2), nullable=False, default=Decimal("2.5"), comment="Annual inflation rate"
     )
 
+    # Headline of the last projection, so the list page need not run one
+    final_portfolio = Column(Numeric(15, 2), nullable=True, comment="Cached final portfolio")
+    years_until_depletion = Column(Integer, nullable=True, comment="Cached years until depletion")
+    depletion_age = Column(Integer, nullable=True, comment="Cached age the portfolio runs out at")
+    lifetime_tax = Column(Numeric(15, 2), nullable=True, comment="Cached total tax over the plan")
+    success_probability = Column(
+        Numeric(5, 4), nullable=True, comment="Cached success probability of a default simulation"
+    )
+    outcome_input_hash = Column(
+        String(64), nullable=True, comment="Input hash the cached outcome was computed from"
+    )
+    outcome_computed_at = Column(DateTime(timezone=True), nullable=True)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(
@@ -74,4 +127,6 @@ class SavedScenario(Base):
     )
 
     # Relationships
-    fixed_expenses = relationship("FixedExpense", back_populates="scenario", cascade="all, delete-orphan")
+    fixed_expenses = relationship(
+        "FixedExpense", back_populates="scenario", cascade="all, delete-orphan"
+    )
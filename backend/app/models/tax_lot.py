@@ -0,0 +1,39 @@
+"""Tax lot database model."""
+
+import uuid
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class TaxLot(Base):
+    """Model for one purchase (tax lot) of a holding."""
+
+    __tablename__ = "tax_lots"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    holding_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("holdings.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    acquired_on = Column(Date, nullable=False, comment="Purchase date")
+    quantity = Column(Numeric(18, 6), nullable=False, comment="Shares or units bought")
+    cost_basis = Column(Numeric(15, 2), nullable=False, comment="Total purchase cost of the lot")
+    sale_priority = Column(
+        Integer,
+        nullable=True,
+        comment="Specific-identification order: lower numbers are sold first",
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    # Relationship back to holding
+    holding = relationship("Holding", back_populates="tax_lots")
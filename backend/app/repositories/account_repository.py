@@ -1,10 +1,17 @@
 """Account repository for database operations."""
 
+from decimal import Decimal
 from uuid import UUID
 
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.account import Account
+from app.repositories.portfolio_snapshot_repository import (
+    PortfolioSnapshotRepository,
+    holding_deltas,
+)
 from app.schemas.account import AccountCreate, AccountUpdate
 
 
@@ -14,6 +21,7 @@ class AccountRepository:
     def __init__(self, db: Session):
         """Initialize repository with database session."""
         self.db = db
+        self.snapshot = PortfolioSnapshotRepository(db)
 
     def get_all(self) -> list[Account]:
         """Get all accounts."""
@@ -23,24 +31,45 @@ class AccountRepository:
         """Get account by ID."""
         return self.db.query(Account).filter(Account.id == account_id).first()
 
+    def get_by_ids(self, account_ids) -> list[Account]:
+        """Get the accounts among account_ids that exist."""
+        if not account_ids:
+            return []
+        return self.db.query(Account).filter(Account.id.in_(account_ids)).all()
+
     def create(self, account_data: AccountCreate) -> Account:
         """Create a new account."""
         account = Account(**account_data.model_dump())
         self.db.add(account)
+        self.snapshot.adjust(balance=account.balance or 0, accounts=1)
         self.db.commit()
         self.db.refresh(account)
         return account
 
+    def bulk_create(self, accounts: list[AccountCreate]) -> int:
+        """
+        Insert accounts with one multi-row statement, without committing.
+
+        The caller commits, so several batches can share one transaction.
+        """
+        if not accounts:
+            return 0
+        self.db.execute(insert(Account), [a.model_dump() for a in accounts])
+        self.snapshot.adjust(balance=sum(a.balance for a in accounts), accounts=len(accounts))
+        return len(accounts)
+
     def update(self, account_id: UUID, account_data: AccountUpdate) -> Account | None:
         """Update an existing account."""
         account = self.get_by_id(account_id)
         if not account:
             return None
 
+        old_balance = account.balance
         update_data = account_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(account, field, value)
 
+        self.snapshot.adjust(balance=Decimal(str(account.balance or 0)) - Decimal(str(old_balance)))
         self.db.commit()
         self.db.refresh(account)
         return account
@@ -51,6 +80,26 @@ class AccountRepository:
         if not account:
             return False
 
+        # Holdings go with the account (delete-orphan cascade)
+        self.snapshot.adjust(
+            holding_deltas(account.holdings, sign=-1), balance=-account.balance, accounts=-1
+        )
         self.db.delete(account)
         self.db.commit()
         return True
+
+
+class AsyncAccountRepository:
+    """Read-only account queries for async sessions."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize repository with async database session."""
+        self.db = db
+
+    async def get_all(self) -> list[Account]:
+        """Get all accounts."""
+        return list(await self.db.scalars(select(Account)))
+
+    async def get_by_id(self, account_id: UUID) -> Account | None:
+        """Get account by ID."""
+        return await self.db.get(Account, account_id)
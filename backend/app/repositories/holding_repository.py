@@ -2,18 +2,25 @@
 
 from uuid import UUID
 
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.holding import Holding
+from app.repositories.portfolio_snapshot_repository import (
+    PortfolioSnapshotRepository,
+    holding_deltas,
+)
 from app.schemas.holding import HoldingCreate, HoldingUpdate
 
 
 class HoldingRepository:
-    """Repository for holding CRUD operations."""
+    """Repository for holding CRUD operations; writes keep the allocation snapshot current."""
 
     def __init__(self, db: Session):
         """Initialize repository with database session."""
         self.db = db
+        self.snapshot = PortfolioSnapshotRepository(db)
 
     def get_all(self) -> list[Holding]:
         """Get all holdings."""
@@ -31,20 +38,35 @@ class HoldingRepository:
         """Create a new holding."""
         holding = Holding(**holding_data.model_dump())
         self.db.add(holding)
+        self.snapshot.adjust(holding_deltas([holding]))
         self.db.commit()
         self.db.refresh(holding)
         return holding
 
+    def bulk_create(self, holdings: list[HoldingCreate]) -> int:
+        """
+        Insert holdings with one multi-row statement, without committing.
+
+        The caller commits, so several batches can share one transaction.
+        """
+        if not holdings:
+            return 0
+        self.db.execute(insert(Holding), [h.model_dump() for h in holdings])
+        self.snapshot.adjust(holding_deltas(holdings))
+        return len(holdings)
+
     def update(self, holding_id: UUID, holding_data: HoldingUpdate) -> Holding | None:
         """Update an existing holding."""
         holding = self.get_by_id(holding_id)
         if not holding:
             return None
 
+        deltas = holding_deltas([holding], sign=-1)
         update_data = holding_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(holding, field, value)
 
+        self.snapshot.adjust(holding_deltas([holding], deltas=deltas))
         self.db.commit()
         self.db.refresh(holding)
         return holding
@@ -56,11 +78,34 @@ class HoldingRepository:
             return False
 
         self.db.delete(holding)
+        self.snapshot.adjust(holding_deltas([holding], sign=-1))
         self.db.commit()
         return True
 
     def delete_by_account(self, account_id: UUID) -> int:
         """Delete all holdings for an account. Returns count deleted."""
+        holdings = self.get_by_account(account_id)
         count = self.db.query(Holding).filter(Holding.account_id == account_id).delete()
+        self.snapshot.adjust(holding_deltas(holdings, sign=-1))
         self.db.commit()
         return count
+
+
+class AsyncHoldingRepository:
+    """Read-only holding queries for async sessions."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize repository with async database session."""
+        self.db = db
+
+    async def get_all(self) -> list[Holding]:
+        """Get all holdings."""
+        return list(await self.db.scalars(select(Holding)))
+
+    async def get_by_id(self, holding_id: UUID) -> Holding | None:
+        """Get holding by ID."""
+        return await self.db.get(Holding, holding_id)
+
+    async def get_by_account(self, account_id: UUID) -> list[Holding]:
+        """Get all holdings for a specific account."""
+        return list(await self.db.scalars(select(Holding).where(Holding.account_id == account_id)))
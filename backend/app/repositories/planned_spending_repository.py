@@ -1,5 +1,7 @@
 """Repository for planned spending data access."""
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.planned_spending import PlannedSpending
@@ -37,3 +39,15 @@ class PlannedSpendingRepository:
         """Delete planned spending configuration."""
         self.db.delete(planned_spending)
         self.db.commit()
+
+
+class AsyncPlannedSpendingRepository:
+    """Read-only planned spending queries for async sessions."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize repository with async database session."""
+        self.db = db
+
+    async def get(self) -> PlannedSpending | None:
+        """Get the planned spending configuration (singleton)."""
+        return await self.db.scalar(select(PlannedSpending).limit(1))
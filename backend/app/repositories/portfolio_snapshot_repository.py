@@ -0,0 +1,150 @@
+"""Repository for the materialized portfolio allocation snapshot."""
+
+from decimal import Decimal
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.account import Account
+from app.models.holding import Holding
+from app.models.portfolio_snapshot import TOTAL_KEY, PortfolioAllocationSnapshot
+
+# INSERT constructs with ON CONFLICT support, per dialect
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class PortfolioSnapshotRepository:
+    """
+    Repository for running portfolio totals.
+
+    Holding and account writes apply their deltas with adjust() before they
+    commit, so the snapshot changes in the same transaction as the data.
+    Writes that bypass the repositories (bootstrap scripts, manual SQL) are
+    caught at startup by reconcile(), or fixed right away with rebuild().
+    """
+
+    def __init__(self, db: Session):
+        """Initialize repository with database session."""
+        self.db = db
+
+    def get(self) -> tuple[Decimal, dict[str, Decimal]]:
+        """Total of account balances and holding amount per asset class."""
+        total = Decimal("0")
+        by_asset_class: dict[str, Decimal] = {}
+        # adjust() writes through Core, so loaded rows are refreshed rather than reused
+        rows = (
+            self.db.query(PortfolioAllocationSnapshot)
+            .populate_existing()
+            .order_by(PortfolioAllocationSnapshot.key)
+        )
+        for row in rows:
+            if row.key == TOTAL_KEY:
+                total = _cents(row.amount)
+            elif row.count > 0:
+                by_asset_class[row.key] = _cents(row.amount)
+        return total, by_asset_class
+
+    def reconcile(self) -> bool:
+        """
+        Rebuild the snapshot if it disagrees with accounts and holdings,
+        returning whether it did.
+        """
+        stored = {
+            row.key: (_cents(row.amount), row.count)
+            for row in self.db.query(PortfolioAllocationSnapshot).populate_existing()
+            if row.key == TOTAL_KEY or row.count or row.amount
+        }
+        if stored == self._totals():
+            self.db.rollback()
+            return False
+        self.rebuild()
+        return True
+
+    def rebuild(self) -> None:
+        """
+        Recompute the snapshot from accounts and holdings.
+
+        On PostgreSQL the table is locked first, so concurrent rebuilds take
+        turns and adjustments wait until the new totals are committed.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            table = PortfolioAllocationSnapshot.__tablename__
+            self.db.execute(text(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE"))
+        self.db.query(PortfolioAllocationSnapshot).delete()
+        rows = [
+            {"key": key, "amount": amount, "count": count}
+            for key, (amount, count) in self._totals().items()
+        ]
+        self.db.execute(self._insert().values(rows))
+        self.db.commit()
+
+    def adjust(
+        self,
+        holdings: dict[str, tuple[Decimal, int]] | None = None,
+        balance: Decimal = Decimal("0"),
+        accounts: int = 0,
+    ) -> None:
+        """
+        Add deltas without committing: (amount, count) per asset class, and
+        the change in total account balance and number of accounts.
+
+        One upsert adds them, so the first write of an asset class creates
+        its row even when another transaction does the same.
+        """
+        deltas = dict(holdings or {})
+        deltas[TOTAL_KEY] = (Decimal(str(balance)), accounts)
+        rows = [
+            {"key": key, "amount": amount, "count": count}
+            for key, (amount, count) in deltas.items()
+            if amount or count
+        ]
+        if not rows:
+            return
+        statement = self._insert().values(rows)
+        self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[PortfolioAllocationSnapshot.key],
+                set_={
+                    "amount": PortfolioAllocationSnapshot.amount + statement.excluded.amount,
+                    "count": PortfolioAllocationSnapshot.count + statement.excluded.count,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    def _totals(self) -> dict[str, tuple[Decimal, int]]:
+        """(amount, count) of the accounts and of each asset class's holdings."""
+        balances, accounts = self.db.query(func.sum(Account.balance), func.count(Account.id)).one()
+        totals = {TOTAL_KEY: (_cents(balances), accounts)}
+        for asset_class, amount, count in (
+            self.db.query(Holding.asset_class, func.sum(Holding.amount), func.count(Holding.id))
+            .group_by(Holding.asset_class)
+            .all()
+        ):
+            totals[getattr(asset_class, "value", asset_class)] = (_cents(amount), count)
+        return totals
+
+    def _insert(self):
+        """INSERT into the snapshot table for this session's dialect."""
+        return _DIALECT_INSERTS[self.db.get_bind().dialect.name](PortfolioAllocationSnapshot)
+
+
+def holding_deltas(
+    holdings, sign: int = 1, deltas: dict[str, tuple[Decimal, int]] | None = None
+) -> dict[str, tuple[Decimal, int]]:
+    """
+    (amount, count) per asset class for adding (sign 1) or removing (-1)
+    holdings, accumulated into deltas when given.
+    """
+    deltas = {} if deltas is None else deltas
+    for h in holdings:
+        asset_class = getattr(h.asset_class, "value", h.asset_class)
+        amount, count = deltas.get(asset_class, (Decimal("0"), 0))
+        deltas[asset_class] = (amount + sign * Decimal(str(h.amount)), count + sign)
+    return deltas
+
+
+def _cents(total) -> Decimal:
+    """A stored or summed amount as Decimal cents (SQLite sums Numeric columns as floats)."""
+    return Decimal(str(total or 0)).quantize(Decimal("0.01"))
@@ -0,0 +1,63 @@
+"""Repository for stored projection run data access."""
+
+from uuid import UUID
+
+from sqlalchemy.orm import Session, defer
+
+from app.models.projection_run import ProjectionRun
+
+
+class ProjectionRunRepository:
+    """Repository for projection run database operations."""
+
+    def __init__(self, db: Session):
+        """Initialize repository with database session."""
+        self.db = db
+
+    def get_by_id(self, run_id: UUID) -> ProjectionRun | None:
+        """Get a run, including its per-year columns."""
+        return self.db.query(ProjectionRun).filter(ProjectionRun.id == run_id).first()
+
+    def find(self, scenario_id: UUID, input_hash: str, engine_version: str) -> ProjectionRun | None:
+        """Latest run of a scenario computed from these inputs by this engine version."""
+        return (
+            self.db.query(ProjectionRun)
+            .filter(
+                ProjectionRun.scenario_id == scenario_id,
+                ProjectionRun.input_hash == input_hash,
+                ProjectionRun.engine_version == engine_version,
+            )
+            .order_by(ProjectionRun.created_at.desc())
+            .first()
+        )
+
+    def list_by_scenario(self, scenario_id: UUID) -> list[ProjectionRun]:
+        """Runs of a scenario, newest first, without their per-year columns."""
+        return (
+            self.db.query(ProjectionRun)
+            .options(defer(ProjectionRun.year_columns))
+            .filter(ProjectionRun.scenario_id == scenario_id)
+            .order_by(ProjectionRun.created_at.desc(), ProjectionRun.id.desc())
+            .all()
+        )
+
+    def create(
+        self,
+        scenario_id: UUID,
+        input_hash: str,
+        engine_version: str,
+        summary: dict,
+        year_columns: bytes,
+    ) -> ProjectionRun:
+        """Store a run."""
+        run = ProjectionRun(
+            scenario_id=scenario_id,
+            input_hash=input_hash,
+            engine_version=engine_version,
+            summary=summary,
+            year_columns=year_columns,
+        )
+        self.db.add(run)
+        self.db.commit()
+        self.db.refresh(run)
+        return run
@@ -1,11 +1,44 @@
 """Repository for saved scenario data access."""
 
+import uuid
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, and_, func, insert, literal, or_, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
 
+from app.models.fixed_expense import FixedExpense
 from app.models.scenario import SavedScenario
-from app.schemas.scenario import SavedScenarioCreate, SavedScenarioUpdate
+from app.schemas.scenario import SavedScenarioCreate, SavedScenarioUpdate, ScenarioOutcomeFilter
+
+# Cached headline of the last projection, cleared whenever the scenario changes
+OUTCOME_COLUMNS = (
+    "final_portfolio",
+    "years_until_depletion",
+    "depletion_age",
+    "lifetime_tax",
+    "success_probability",
+    "outcome_input_hash",
+    "outcome_computed_at",
+)
+
+# Columns the list summary loads; the JSON columns are deferred
+SUMMARY_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "monthly_spending",
+    "projection_years",
+    "spending_policy",
+    "withdrawal_strategy",
+    *OUTCOME_COLUMNS,
+    "created_at",
+    "updated_at",
+)
+
+# Columns a copy gets afresh rather than from the original
+_FRESH_COLUMNS = ("id", "name", "created_at", "updated_at", *OUTCOME_COLUMNS)
 
 
 class ScenarioRepository:
@@ -19,6 +52,24 @@ class ScenarioRepository:
         """Get all saved scenarios."""
         return self.db.query(SavedScenario).order_by(SavedScenario.updated_at.desc()).all()
 
+    def get_page(
+        self,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        summary: bool = False,
+        outcome: ScenarioOutcomeFilter | None = None,
+    ) -> list[SavedScenario]:
+        """
+        Up to limit scenarios, most recently updated first, after a keyset position.
+
+        after is the (updated_at, id) of the last scenario of the previous
+        page; the ordering matches ix_saved_scenarios_updated_at_id. With
+        summary only SUMMARY_COLUMNS are loaded. outcome bounds the cached
+        outcomes, each of which has its own index.
+        """
+        statement = _page_statement(limit, after, summary, outcome, self.db.get_bind().dialect.name)
+        return list(self.db.scalars(statement))
+
     def get_by_id(self, scenario_id: UUID) -> SavedScenario | None:
         """Get scenario by ID."""
         return self.db.query(SavedScenario).filter(SavedScenario.id == scenario_id).first()
@@ -32,6 +83,14 @@ class ScenarioRepository:
         elif "asset_allocation" in data and isinstance(data["asset_allocation"], dict):
             # Convert Decimal to float for JSON serialization
             data["asset_allocation"] = {k: float(v) for k, v in data["asset_allocation"].items()}
+        if scenario_data.glide_path is not None:
+            data["glide_path"] = scenario_data.glide_path.model_dump(mode="json")
+        if scenario_data.bucket_strategy is not None:
+            data["bucket_strategy"] = scenario_data.bucket_strategy.model_dump(mode="json")
+        if scenario_data.spending_policy_params is not None:
+            data["spending_policy_params"] = scenario_data.spending_policy_params.model_dump(
+                mode="json"
+            )
 
         scenario = SavedScenario(**data)
         self.db.add(scenario)
@@ -45,24 +104,75 @@ class ScenarioRepository:
         if not scenario:
             return None
 
-        update_data = scenario_data.model_dump(exclude_unset=True)
-
-        # Handle asset_allocation conversion
-        if "asset_allocation" in update_data:
-            if hasattr(update_data["asset_allocation"], "model_dump"):
-                update_data["asset_allocation"] = update_data["asset_allocation"].model_dump()
-            elif isinstance(update_data["asset_allocation"], dict):
-                update_data["asset_allocation"] = {
-                    k: float(v) for k, v in update_data["asset_allocation"].items()
-                }
-
+        update_data = _column_values(scenario_data)
         for field, value in update_data.items():
             setattr(scenario, field, value)
+        if update_data:
+            for field in OUTCOME_COLUMNS:
+                setattr(scenario, field, None)
 
         self.db.commit()
         self.db.refresh(scenario)
         return scenario
 
+    def record_outcome(
+        self,
+        scenario_id: UUID,
+        input_hash: str,
+        final_portfolio,
+        years_until_depletion: int | None,
+        depletion_age: int | None = None,
+        lifetime_tax=None,
+    ) -> None:
+        """
+        Cache the headline of a projection unless it is already cached for
+        these inputs; a success probability simulated from other inputs is
+        dropped. Leaves updated_at alone, so the list order is kept.
+        """
+        self.db.execute(
+            update(SavedScenario)
+            .where(
+                SavedScenario.id == scenario_id,
+                or_(
+                    SavedScenario.outcome_input_hash.is_(None),
+                    SavedScenario.outcome_input_hash != input_hash,
+                ),
+            )
+            .values(
+                final_portfolio=final_portfolio,
+                years_until_depletion=years_until_depletion,
+                depletion_age=depletion_age,
+                lifetime_tax=lifetime_tax,
+                success_probability=None,
+                outcome_input_hash=input_hash,
+                outcome_computed_at=func.now(),
+                updated_at=SavedScenario.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def record_success_probability(
+        self, scenario_id: UUID, input_hash: str, success_probability
+    ) -> None:
+        """
+        Cache the success probability of a simulation, if the cached outcome
+        was projected from the same inputs. Leaves updated_at alone.
+        """
+        self.db.execute(
+            update(SavedScenario)
+            .where(
+                SavedScenario.id == scenario_id,
+                SavedScenario.outcome_input_hash == input_hash,
+            )
+            .values(
+                success_probability=success_probability,
+                updated_at=SavedScenario.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
     def delete(self, scenario_id: UUID) -> bool:
         """Delete a scenario."""
         scenario = self.get_by_id(scenario_id)
@@ -74,34 +184,178 @@ class ScenarioRepository:
         return True
 
     def duplicate(self, scenario_id: UUID, new_name: str) -> SavedScenario | None:
-        """Duplicate an existing scenario with a new name."""
-        original = self.get_by_id(scenario_id)
-        if not original:
+        """Duplicate an existing scenario, with its fixed expenses, under a new name."""
+        clones = self.clone(scenario_id, [(new_name, SavedScenarioUpdate())])
+        return clones[0] if clones else None
+
+    def clone(
+        self, scenario_id: UUID, variants: list[tuple[str, SavedScenarioUpdate]]
+    ) -> list[SavedScenario] | None:
+        """
+        Copy a scenario and its fixed expenses once per (name, overrides) variant.
+
+        The database does the copying with two INSERT ... SELECT statements in
+        one transaction; every column not overridden (glide path, spending
+        policy, buckets, withdrawal strategy, ...) comes across as stored.
+        """
+        scenarios = SavedScenario.__table__
+        copied = [c for c in scenarios.columns if c.name not in _FRESH_COLUMNS]
+        new_ids = [uuid.uuid4() for _ in variants]
+        overridden = [_column_values(overrides) for _, overrides in variants]
+        copies = [
+            select(
+                literal(new_id, scenarios.c.id.type),
+                literal(name, scenarios.c.name.type),
+                *(literal(overrides[c.name], c.type) if c.name in overrides else c for c in copied),
+            ).where(scenarios.c.id == scenario_id)
+            for new_id, (name, _), overrides in zip(new_ids, variants, overridden)
+        ]
+        inserted = self.db.execute(
+            insert(scenarios).from_select(
+                [scenarios.c.id, scenarios.c.name, *copied],
+                union_all(*copies) if len(copies) > 1 else copies[0],
+            )
+        )
+        if not inserted.rowcount:
+            self.db.rollback()
             return None
 
-        # Create new scenario with copied data
-        # Deep copy asset_allocation to avoid reference issues
-        asset_allocation_copy = {}
-        if original.asset_allocation:
-            asset_allocation_copy = {k: v for k, v in original.asset_allocation.items()}
-
-        new_scenario = SavedScenario(
-            name=new_name,
-            description=original.description,
-            ss_start_age_years=original.ss_start_age_years,
-            ss_start_age_months=original.ss_start_age_months,
-            monthly_spending=original.monthly_spending,
-            annual_lump_spending=original.annual_lump_spending,
-            inflation_adjusted_percent=original.inflation_adjusted_percent,
-            spending_reduction_percent=original.spending_reduction_percent,
-            spending_reduction_start_year=original.spending_reduction_start_year,
-            projection_years=original.projection_years,
-            asset_allocation=asset_allocation_copy,
-            return_source=original.return_source,
-            custom_return_percent=original.custom_return_percent,
-            inflation_rate=original.inflation_rate,
+        expenses = FixedExpense.__table__
+        expense_columns = ["name", "monthly_amount", "start_year", "end_year", "notes"]
+        self.db.execute(
+            insert(expenses).from_select(
+                ["id", "scenario_id", *expense_columns, "created_at", "updated_at"],
+                select(
+                    _new_uuid(self.db.get_bind().dialect.name),
+                    scenarios.c.id,
+                    *(expenses.c[name] for name in expense_columns),
+                    # The database clock, as the copied scenarios' server defaults use
+                    func.now(),
+                    func.now(),
+                )
+                .select_from(expenses.join(scenarios, scenarios.c.id.in_(new_ids)))
+                .where(expenses.c.scenario_id == scenario_id),
+            )
         )
-        self.db.add(new_scenario)
         self.db.commit()
-        self.db.refresh(new_scenario)
-        return new_scenario
+
+        clones = {
+            s.id: s
+            for s in self.db.query(SavedScenario).filter(SavedScenario.id.in_(new_ids)).all()
+        }
+        return [clones[new_id] for new_id in new_ids]
+
+
+def _column_values(scenario_data: SavedScenarioUpdate) -> dict:
+    """The fields set on an update, converted to column values."""
+    update_data = scenario_data.model_dump(exclude_unset=True)
+
+    # Handle asset_allocation conversion
+    if "asset_allocation" in update_data:
+        if hasattr(update_data["asset_allocation"], "model_dump"):
+            update_data["asset_allocation"] = update_data["asset_allocation"].model_dump()
+        elif isinstance(update_data["asset_allocation"], dict):
+            update_data["asset_allocation"] = {
+                k: float(v) for k, v in update_data["asset_allocation"].items()
+            }
+    if update_data.get("glide_path") is not None:
+        update_data["glide_path"] = scenario_data.glide_path.model_dump(mode="json")
+    if update_data.get("bucket_strategy") is not None:
+        update_data["bucket_strategy"] = scenario_data.bucket_strategy.model_dump(mode="json")
+    if update_data.get("spending_policy_params") is not None:
+        update_data["spending_policy_params"] = scenario_data.spending_policy_params.model_dump(
+            mode="json"
+        )
+    for field in ("spending_policy", "withdrawal_strategy", "cost_basis_method"):
+        if field in update_data and update_data[field] is None:
+            del update_data[field]
+    return update_data
+
+
+def _new_uuid(dialect: str):
+    """SQL expression generating a fresh UUID in the database."""
+    if dialect == "postgresql":
+        return func.gen_random_uuid()
+    # SQLite stores UUIDs as 32 hex digits
+    return func.lower(func.hex(func.randomblob(16)))
+
+
+def _outcome_conditions(outcome: ScenarioOutcomeFilter) -> list:
+    """
+    Filter conditions for outcome bounds, each usable with its column's index.
+
+    A NULL years_until_depletion or depletion_age on a projected scenario
+    means the money never runs out.
+    """
+    never_depletes = SavedScenario.years_until_depletion.is_(None)
+    conditions = [SavedScenario.outcome_input_hash.is_not(None)]
+    if outcome.min_final is not None:
+        conditions.append(SavedScenario.final_portfolio >= outcome.min_final)
+    if outcome.max_final is not None:
+        conditions.append(SavedScenario.final_portfolio <= outcome.max_final)
+    if outcome.min_depletion_year is not None:
+        conditions.append(
+            or_(never_depletes, SavedScenario.years_until_depletion >= outcome.min_depletion_year)
+        )
+    if outcome.max_depletion_year is not None:
+        conditions.append(SavedScenario.years_until_depletion <= outcome.max_depletion_year)
+    if outcome.min_depletion_age is not None:
+        conditions.append(
+            or_(never_depletes, SavedScenario.depletion_age >= outcome.min_depletion_age)
+        )
+    if outcome.max_lifetime_tax is not None:
+        conditions.append(SavedScenario.lifetime_tax <= outcome.max_lifetime_tax)
+    if outcome.min_success_probability is not None:
+        conditions.append(SavedScenario.success_probability >= outcome.min_success_probability)
+    return conditions
+
+
+class AsyncScenarioRepository:
+    """Read-only saved scenario queries for async sessions."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize repository with async database session."""
+        self.db = db
+
+    async def get_page(
+        self,
+        limit: int,
+        after: tuple[datetime, UUID] | None = None,
+        summary: bool = False,
+        outcome: ScenarioOutcomeFilter | None = None,
+    ) -> list[SavedScenario]:
+        """Up to limit scenarios after a keyset position (see ScenarioRepository.get_page)."""
+        statement = _page_statement(limit, after, summary, outcome, self.db.bind.dialect.name)
+        return list(await self.db.scalars(statement))
+
+    async def get_by_id(self, scenario_id: UUID) -> SavedScenario | None:
+        """Get scenario by ID."""
+        return await self.db.get(SavedScenario, scenario_id)
+
+
+def _page_statement(
+    limit: int | None,
+    after: tuple[datetime, UUID] | None,
+    summary: bool,
+    outcome: ScenarioOutcomeFilter | None,
+    dialect: str,
+):
+    """SELECT of a page of scenarios for ScenarioRepository.get_page."""
+    statement = select(SavedScenario)
+    if outcome is not None and not outcome.is_empty():
+        statement = statement.where(*_outcome_conditions(outcome))
+    if summary:
+        statement = statement.options(
+            load_only(*(getattr(SavedScenario, c) for c in SUMMARY_COLUMNS))
+        )
+    if after is not None:
+        updated_at, scenario_id = after
+        column, position = SavedScenario.updated_at, literal(updated_at, DateTime())
+        if dialect == "sqlite":
+            # Server-default timestamps are stored without microseconds while
+            # bound values carry them, so compare as Julian day numbers
+            column, position = func.julianday(column), func.julianday(position)
+        statement = statement.where(
+            or_(column < position, and_(column == position, SavedScenario.id < scenario_id))
+        )
+    return statement.order_by(SavedScenario.updated_at.desc(), SavedScenario.id.desc()).limit(limit)
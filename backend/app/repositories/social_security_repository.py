@@ -2,6 +2,8 @@
 
 from uuid import UUID
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.social_security import SocialSecurity
@@ -56,3 +58,15 @@ class SocialSecurityRepository:
         self.db.delete(ss)
         self.db.commit()
         return True
+
+
+class AsyncSocialSecurityRepository:
+    """Read-only Social Security queries for async sessions."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize repository with async database session."""
+        self.db = db
+
+    async def get(self) -> SocialSecurity | None:
+        """Get Social Security configuration (singleton - only one record)."""
+        return await self.db.scalar(select(SocialSecurity).limit(1))
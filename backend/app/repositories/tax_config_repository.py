@@ -2,6 +2,8 @@
 
 from decimal import Decimal
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.tax_config import TaxConfig
@@ -48,3 +50,15 @@ class TaxConfigRepository:
         """Delete tax configuration."""
         self.db.delete(tax_config)
         self.db.commit()
+
+
+class AsyncTaxConfigRepository:
+    """Read-only tax configuration queries for async sessions."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize repository with async database session."""
+        self.db = db
+
+    async def get(self) -> TaxConfig | None:
+        """Get the tax configuration (singleton)."""
+        return await self.db.scalar(select(TaxConfig).limit(1))
@@ -0,0 +1,89 @@
+"""Repository for tax lot data access."""
+
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.account import Account
+from app.models.holding import Holding
+from app.models.tax_lot import TaxLot
+from app.schemas.tax_lot import TaxLotCreate, TaxLotUpdate
+
+# Account types outside the taxable bucket (any other type counts as taxable)
+NON_TAXABLE_ACCOUNT_TYPES = ("pretax", "roth", "cash")
+
+
+class TaxLotRepository:
+    """Repository for tax lot CRUD operations."""
+
+    def __init__(self, db: Session):
+        """Initialize repository with database session."""
+        self.db = db
+
+    def get_by_id(self, lot_id: UUID) -> TaxLot | None:
+        """Get tax lot by ID."""
+        return self.db.query(TaxLot).filter(TaxLot.id == lot_id).first()
+
+    def get_by_holding(self, holding_id: UUID) -> list[TaxLot]:
+        """Get all lots of a holding, oldest first."""
+        return (
+            self.db.query(TaxLot)
+            .filter(TaxLot.holding_id == holding_id)
+            .order_by(TaxLot.acquired_on)
+            .all()
+        )
+
+    def get_taxable_lot_rows(self) -> list[tuple]:
+        """
+        Every lot held in a taxable account, in one query.
+
+        Rows are (holding_id, acquired_on, quantity, cost_basis, sale_priority,
+        holding amount) so the engine can price lots without loading ORM objects.
+        """
+        return (
+            self.db.query(
+                TaxLot.holding_id,
+                TaxLot.acquired_on,
+                TaxLot.quantity,
+                TaxLot.cost_basis,
+                TaxLot.sale_priority,
+                Holding.amount,
+            )
+            .join(Holding, TaxLot.holding_id == Holding.id)
+            .join(Account, Holding.account_id == Account.id)
+            .filter(func.lower(Account.account_type).notin_(NON_TAXABLE_ACCOUNT_TYPES))
+            .all()
+        )
+
+    def create(self, lot_data: TaxLotCreate) -> TaxLot:
+        """Create a new tax lot."""
+        lot = TaxLot(**lot_data.model_dump())
+        self.db.add(lot)
+        self.db.commit()
+        self.db.refresh(lot)
+        return lot
+
+    def update(self, lot_id: UUID, lot_data: TaxLotUpdate) -> TaxLot | None:
+        """Update an existing tax lot."""
+        lot = self.get_by_id(lot_id)
+        if not lot:
+            return None
+
+        update_data = lot_data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(lot, field, value)
+
+        self.db.commit()
+        self.db.refresh(lot)
+        return lot
+
+    def delete(self, lot_id: UUID) -> bool:
+        """Delete a tax lot."""
+        lot = self.get_by_id(lot_id)
+        if not lot:
+            return False
+
+        self.db.delete(lot)
+        self.db.commit()
+        return True
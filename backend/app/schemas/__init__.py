@@ -53,6 +53,7 @@ from app.schemas.tax_config import (
     TaxConfigCreate,
     TaxConfigUpdate,
 )
+from app.schemas.tax_lot import TaxLot, TaxLotCreate, TaxLotUpdate
 
 __all__ = [
     "Account",
@@ -90,6 +91,9 @@ __all__ = [
     "TaxConfigCreate",
     "TaxConfigUpdate",
     "SeniorDeductionBreakdown",
+    "TaxLot",
+    "TaxLotCreate",
+    "TaxLotUpdate",
     "AssetAllocation",
     "ScenarioCreate",
     "ScenarioPeriod",
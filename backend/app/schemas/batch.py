@@ -0,0 +1,37 @@
+"""Batch mutation Pydantic schemas."""
+
+from typing import Generic, Literal, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+CreateT = TypeVar("CreateT", bound=BaseModel)
+UpdateT = TypeVar("UpdateT", bound=BaseModel)
+
+BatchOperation = Literal["create", "update", "delete"]
+BatchItemStatus = Literal["created", "updated", "deleted", "error", "skipped"]
+
+
+class BatchRequest(BaseModel, Generic[CreateT, UpdateT]):
+    """Creates, updates (each with its id) and deletes applied in one transaction."""
+
+    create: list[CreateT] = Field(default_factory=list)
+    update: list[UpdateT] = Field(default_factory=list)
+    delete: list[UUID] = Field(default_factory=list)
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one item of a batch."""
+
+    operation: BatchOperation
+    index: int = Field(..., description="Position of the item in its operation list")
+    id: UUID | None = None
+    status: BatchItemStatus
+    error: str | None = None
+
+
+class BatchResult(BaseModel):
+    """Outcome of a batch; nothing is applied unless every item is valid."""
+
+    applied: bool
+    results: list[BatchItemResult]
@@ -0,0 +1,18 @@
+"""Bulk import Pydantic schemas."""
+
+from pydantic import BaseModel, Field
+
+
+class ImportRowError(BaseModel):
+    """Validation errors of one uploaded row."""
+
+    row: int = Field(..., description="1-based record number in the upload (header excluded)")
+    errors: list[str]
+
+
+class ImportResult(BaseModel):
+    """Outcome of a bulk import."""
+
+    imported: int = Field(..., description="Rows written")
+    rejected: int = Field(..., description="Rows with validation errors")
+    errors: list[ImportRowError]
@@ -34,6 +34,12 @@ class FixedExpenseUpdate(BaseModel):
     notes: Optional[str] = Field(None, max_length=500)
 
 
+class FixedExpenseBatchUpdate(FixedExpenseUpdate):
+    """Schema for one update of a fixed expense batch."""
+
+    id: UUID
+
+
 class FixedExpense(FixedExpenseBase):
     """Schema for fixed expense response."""
 
@@ -53,6 +53,12 @@ class HoldingUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class HoldingBatchUpdate(HoldingUpdate):
+    """Schema for one update of a holding batch."""
+
+    id: UUID
+
+
 class Holding(HoldingBase):
     """Schema for holding response."""
 
@@ -68,6 +68,12 @@ class OtherIncomeUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class OtherIncomeBatchUpdate(OtherIncomeUpdate):
+    """Schema for one update of an other income batch."""
+
+    id: UUID
+
+
 class OtherIncome(OtherIncomeBase):
     """Schema for other income response."""
 
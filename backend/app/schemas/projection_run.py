@@ -0,0 +1,37 @@
+"""Stored projection run Pydantic schemas."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class ProjectionRunSummary(BaseModel):
+    """A stored projection run without its per-year rows."""
+
+    id: UUID
+    scenario_id: UUID
+    input_hash: str = Field(
+        ..., description="Canonical hash of the inputs the run was computed from"
+    )
+    engine_version: str
+    initial_portfolio: Decimal
+    final_portfolio: Decimal
+    years_until_depletion: Optional[int] = None
+    created_at: datetime
+
+
+class ProjectionRunDiff(BaseModel):
+    """Differences of one stored run from another (other minus base)."""
+
+    base_run_id: UUID
+    other_run_id: UUID
+    summary: dict[str, Optional[Decimal]] = Field(
+        ..., description="Change in each summary metric (None when either side has no value)"
+    )
+    years: list[int] = Field(..., description="Projection years present in both runs")
+    columns: dict[str, list[Decimal]] = Field(
+        ..., description="Change in each per-year amount, aligned with years"
+    )
@@ -5,7 +5,7 @@ from decimal import Decimal
 from typing import Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class AssetAllocation(BaseModel):
@@ -62,6 +62,79 @@ class AssetAllocation(BaseModel):
         return abs(float(total) - 100.0) < 0.01
 
 
+class GlidePathKeyframe(BaseModel):
+    """Asset allocation at one point of a glide path."""
+
+    year: Optional[int] = Field(None, ge=1, le=50, description="Projection year (1-based)")
+    age: Optional[int] = Field(None, ge=0, le=120, description="Age at start of year")
+    allocation: AssetAllocation
+
+
+class GlidePath(BaseModel):
+    """Allocation keyframes by projection year or age, linearly interpolated between them."""
+
+    basis: Literal["year", "age"] = Field("year", description="Whether keyframes use year or age")
+    keyframes: list[GlidePathKeyframe] = Field(..., min_length=1)
+
+    @model_validator(mode="after")
+    def validate_keyframes(self) -> "GlidePath":
+        """Ensure every keyframe sets the basis field and positions are distinct."""
+        positions = [getattr(keyframe, self.basis) for keyframe in self.keyframes]
+        if any(position is None for position in positions):
+            raise ValueError(f"Every glide path keyframe needs a {self.basis}")
+        if len(set(positions)) != len(positions):
+            raise ValueError(f"Glide path keyframes must have distinct {self.basis}s")
+        return self
+
+
+class BucketStrategy(BaseModel):
+    """Cash / balanced / stocks buckets sized in years of net spending."""
+
+    cash_years: int = Field(3, ge=0, le=10, description="Years of spending held in cash")
+    balanced_years: int = Field(
+        4, ge=0, le=15, description="Following years of spending held in a 50/50 balanced mix"
+    )
+
+
+WithdrawalStrategyName = Literal[
+    "conventional", "proportional", "bracket_filling", "roth_last", "taxable_first"
+]
+
+CostBasisMethod = Literal["average", "fifo", "hifo", "spec_id"]
+
+# Inflation in simulations: the scenario's fixed rate, or drawn per path with returns
+InflationModel = Literal["fixed", "stochastic"]
+
+# Whose lifetimes bound a simulation, and which life table each one uses
+MortalityMode = Literal["single", "joint"]
+LifeTableSex = Literal["male", "female", "unisex"]
+
+SpendingPolicyName = Literal["fixed", "guardrails", "constant_percentage", "floor_ceiling"]
+
+
+class SpendingPolicyParams(BaseModel):
+    """Parameters of the dynamic spending policies (percentages)."""
+
+    withdrawal_rate: Decimal = Field(
+        Decimal("4"), gt=0, le=20, description="% of portfolio spent (percentage policies)"
+    )
+    floor_percent: Decimal = Field(
+        Decimal("90"), ge=0, le=100, description="Minimum spending as % of plan (floor_ceiling)"
+    )
+    ceiling_percent: Decimal = Field(
+        Decimal("120"), ge=100, le=300, description="Maximum spending as % of plan (floor_ceiling)"
+    )
+    upper_guardrail_percent: Decimal = Field(
+        Decimal("20"), ge=0, le=100, description="Rate rise over initial rate that cuts spending"
+    )
+    lower_guardrail_percent: Decimal = Field(
+        Decimal("20"), ge=0, le=100, description="Rate fall under initial rate that raises spending"
+    )
+    adjustment_percent: Decimal = Field(
+        Decimal("10"), ge=0, le=50, description="% spending change when a guardrail is hit"
+    )
+
+
 # ===== SAVED SCENARIO SCHEMAS =====
 
 
@@ -92,12 +165,32 @@ class SavedScenarioBase(BaseModel):
     spending_reduction_start_year: Optional[int] = Field(
         None, ge=1, description="Year to start reduction"
     )
+    spending_policy: SpendingPolicyName = Field(
+        "fixed", description="How variable spending responds to portfolio performance"
+    )
+    spending_policy_params: Optional[SpendingPolicyParams] = Field(
+        None, description="Policy parameters (defaults when omitted)"
+    )
+    withdrawal_strategy: WithdrawalStrategyName = Field(
+        "conventional", description="Order in which accounts fund withdrawals"
+    )
+    cost_basis_method: CostBasisMethod = Field(
+        "average",
+        description="How taxable sales relieve basis: account average, or tax lots by "
+        "FIFO, highest cost first or specific identification",
+    )
 
     # Time
     projection_years: int = Field(35, ge=1, le=50, description="Years to project (to age 100)")
 
     # Asset allocation
     asset_allocation: AssetAllocation = Field(default_factory=AssetAllocation)
+    glide_path: Optional[GlidePath] = Field(
+        None, description="Time-varying allocation (overrides asset_allocation when set)"
+    )
+    bucket_strategy: Optional[BucketStrategy] = Field(
+        None, description="Simulate time-segmented buckets instead of a single allocation"
+    )
 
     # Returns
     return_source: Literal["10_year_projections", "historical_average", "custom"] = Field(
@@ -131,14 +224,71 @@ class SavedScenarioUpdate(BaseModel):
     inflation_adjusted_percent: Optional[Decimal] = Field(None, ge=0, le=100)
     spending_reduction_percent: Optional[Decimal] = Field(None, ge=0, le=100)
     spending_reduction_start_year: Optional[int] = Field(None, ge=1)
+    spending_policy: Optional[SpendingPolicyName] = None
+    spending_policy_params: Optional[SpendingPolicyParams] = None
+    withdrawal_strategy: Optional[WithdrawalStrategyName] = None
+    cost_basis_method: Optional[CostBasisMethod] = None
     projection_years: Optional[int] = Field(None, ge=1, le=50)
     asset_allocation: Optional[AssetAllocation] = None
+    glide_path: Optional[GlidePath] = None
+    bucket_strategy: Optional[BucketStrategy] = None
     return_source: Optional[Literal["10_year_projections", "historical_average", "custom"]] = None
     custom_return_percent: Optional[Decimal] = Field(None, ge=-20, le=30)
     inflation_rate: Optional[Decimal] = Field(None, ge=0, le=15)
 
 
-class SavedScenario(SavedScenarioBase):
+class ScenarioVariant(BaseModel):
+    """A copy of a scenario under a new name with some fields overridden."""
+
+    name: str = Field(..., min_length=1, max_length=255)
+    overrides: SavedScenarioUpdate = Field(
+        default_factory=SavedScenarioUpdate, description="Fields to change (name is ignored)"
+    )
+
+
+class ScenarioVariantsCreate(BaseModel):
+    """Request to clone a scenario into several what-if variants at once."""
+
+    variants: list[ScenarioVariant] = Field(..., min_length=1, max_length=100)
+
+
+class ScenarioOutcome(BaseModel):
+    """Headline of a scenario's last projection, cached on the scenario."""
+
+    final_portfolio: Optional[Decimal] = Field(None, description="None until projected")
+    years_until_depletion: Optional[int] = None
+    depletion_age: Optional[int] = Field(None, description="Age the money runs out at")
+    lifetime_tax: Optional[Decimal] = Field(None, description="Total tax over the plan")
+    success_probability: Optional[Decimal] = Field(
+        None, description="From a default simulation of the same inputs as the cached outcome"
+    )
+    outcome_computed_at: Optional[datetime] = None
+
+
+class ScenarioOutcomeFilter(BaseModel):
+    """
+    Bounds on cached outcomes for scenario search.
+
+    Only projected scenarios match once any bound is set. A portfolio that
+    never runs out counts as depleting later than any year or age.
+    """
+
+    min_final: Optional[Decimal] = Field(None, description="Minimum final portfolio")
+    max_final: Optional[Decimal] = Field(None, description="Maximum final portfolio")
+    min_depletion_year: Optional[int] = Field(None, description="Earliest depletion year")
+    max_depletion_year: Optional[int] = Field(None, description="Latest depletion year")
+    min_depletion_age: Optional[int] = Field(None, description="Lowest age the money runs out at")
+    max_lifetime_tax: Optional[Decimal] = Field(None, description="Maximum total tax")
+    min_success_probability: Optional[Decimal] = Field(
+        None, ge=0, le=1, description="Minimum simulated success probability"
+    )
+
+    def is_empty(self) -> bool:
+        """Whether no bound is set."""
+        return all(value is None for value in self.model_dump().values())
+
+
+class SavedScenario(ScenarioOutcome, SavedScenarioBase):
     """Schema for saved scenario response."""
 
     id: UUID
@@ -149,6 +299,25 @@ class SavedScenario(SavedScenarioBase):
         from_attributes = True
 
 
+class SavedScenarioSummary(ScenarioOutcome):
+    """Scenario list entry without the allocation and other JSON settings."""
+
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    monthly_spending: Decimal
+    projection_years: int
+    spending_policy: SpendingPolicyName = "fixed"
+    withdrawal_strategy: WithdrawalStrategyName = "conventional"
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+ScenarioListFields = Literal["full", "summary"]
+
+
 # ===== SCENARIO PROJECTION SCHEMAS =====
 
 
@@ -210,6 +379,12 @@ class ScenarioYearProjection(BaseModel):
 
     # Portfolio activity
     portfolio_withdrawal: Decimal = Field(..., description="Amount withdrawn from portfolio")
+    required_minimum_distribution: Decimal = Field(
+        Decimal("0"), description="Required minimum distribution from pretax accounts"
+    )
+    rmd_reinvested: Decimal = Field(
+        Decimal("0"), description="RMD beyond spending and taxes, moved to the taxable account"
+    )
     investment_return: Decimal = Field(..., description="Investment gains/losses")
     return_percent: Decimal = Field(..., description="Return percentage for year")
 
@@ -241,6 +416,7 @@ class ScenarioProjectionResult(BaseModel):
 
     # Key metrics
     ss_start_age: str = Field(..., description="SS start age (e.g., '67 years 0 months')")
+    spending_policy: SpendingPolicyName = Field("fixed", description="Spending policy applied")
     average_return_percent: Decimal
     inflation_rate: Decimal
 
@@ -255,6 +431,157 @@ class ScenarioComparisonResult(BaseModel):
     comparison_summary: dict[str, dict]  # scenario_name -> summary metrics
 
 
+class SimulationYearBand(BaseModel):
+    """Distribution of simulated outcomes for one projection year."""
+
+    year: int = Field(..., description="Year number (1-based)")
+    calendar_year: int = Field(..., description="Actual calendar year")
+    age: int = Field(..., description="Age at start of year")
+    p10_balance: Decimal = Field(..., description="10th percentile ending balance")
+    p25_balance: Decimal = Field(..., description="25th percentile ending balance")
+    p50_balance: Decimal = Field(..., description="Median ending balance")
+    p75_balance: Decimal = Field(..., description="75th percentile ending balance")
+    p90_balance: Decimal = Field(..., description="90th percentile ending balance")
+    p10_spending: Decimal = Field(..., description="10th percentile total spending")
+    p50_spending: Decimal = Field(..., description="Median total spending")
+    p90_spending: Decimal = Field(..., description="90th percentile total spending")
+    funded_probability: Decimal = Field(
+        ..., description="Share of paths still funding spending at year end (0-1)"
+    )
+    survival_probability: Optional[Decimal] = Field(
+        None, description="Share of paths with someone alive at year end (with mortality)"
+    )
+
+
+class SimulationResult(BaseModel):
+    """Monte Carlo simulation result for a scenario."""
+
+    scenario_id: Optional[UUID] = Field(None, description="ID if saved")
+    scenario_name: str
+    n_paths: int = Field(..., description="Number of simulated return paths")
+    seed: int = Field(..., description="Random seed (pass it back to reproduce the run)")
+    path_source: Literal["library", "sampled"] = Field(
+        ..., description="Precomputed bootstrap library or freshly sampled normal paths"
+    )
+
+    # Summary
+    success_probability: Decimal = Field(
+        ..., description="Share of paths that fund spending through the horizon (0-1)"
+    )
+    median_final_portfolio: Decimal
+    median_depletion_year: Optional[int] = Field(
+        None, description="Median depletion year among failed paths"
+    )
+    expected_return_percent: Decimal
+    volatility_percent: Decimal
+    inflation: InflationModel = Field(
+        "fixed", description="Scenario's fixed rate or per-path inflation drawn with returns"
+    )
+
+    # Mortality
+    mortality: Optional[MortalityMode] = Field(
+        None, description="Lives sampled per path (None for a fixed horizon)"
+    )
+    probability_outliving_assets: Optional[Decimal] = Field(
+        None, description="Share of paths that run out of money while someone is alive (0-1)"
+    )
+
+    years: list[SimulationYearBand]
+
+
+# ===== WITHDRAWAL STRATEGY SCHEMAS =====
+
+
+class WithdrawalStrategyOutcome(BaseModel):
+    """Projected outcome of one withdrawal strategy."""
+
+    strategy: WithdrawalStrategyName
+    rank: int = Field(..., description="1 is best")
+    lifetime_tax: Decimal = Field(..., description="Tax paid plus tax deferred in pretax money")
+    after_tax_terminal_wealth: Decimal
+    final_portfolio: Decimal
+    years_until_depletion: Optional[int] = None
+    success_probability: Optional[Decimal] = Field(
+        None, description="Share of simulated paths funded through the horizon (0-1)"
+    )
+
+
+class WithdrawalStrategyComparison(BaseModel):
+    """All withdrawal strategies evaluated for one scenario, best first."""
+
+    scenario_id: Optional[UUID] = Field(None, description="ID if saved")
+    scenario_name: str
+    rank_by: Literal["after_tax_wealth", "lifetime_tax", "depletion_year"]
+    n_paths: int = Field(..., description="Simulated paths per strategy (0 for none)")
+    seed: Optional[int] = None
+    strategies: list[WithdrawalStrategyOutcome]
+
+
+# ===== ROTH CONVERSION SCHEMAS =====
+
+
+class RothConversionRequest(BaseModel):
+    """Options for the Roth conversion search."""
+
+    objective: Literal["after_tax_wealth", "lifetime_tax"] = Field(
+        "after_tax_wealth",
+        description="Maximize after-tax terminal wealth or minimize lifetime tax",
+    )
+    bracket_percents: list[Decimal] = Field(
+        [Decimal("0"), Decimal("10"), Decimal("12"), Decimal("22"), Decimal("24")],
+        min_length=1,
+        description="Federal brackets to fill (0 fills only the deductions)",
+    )
+    pretax_tax_rate_percent: Decimal = Field(
+        Decimal("22"),
+        ge=0,
+        le=50,
+        description="Tax rate charged on pretax money left at the end of the horizon",
+    )
+
+
+class RothConversionPlan(BaseModel):
+    """One conversion policy and its projected outcome."""
+
+    bracket_percent: Optional[Decimal] = Field(
+        None, description="Bracket filled each year (None for no conversions)"
+    )
+    start_year: Optional[int] = Field(None, description="First conversion year (1-based)")
+    end_year: Optional[int] = Field(None, description="Last conversion year")
+    total_converted: Decimal
+    lifetime_tax: Decimal = Field(..., description="Tax paid plus tax deferred in pretax money")
+    after_tax_terminal_wealth: Decimal
+    final_portfolio: Decimal
+    years_until_depletion: Optional[int] = None
+
+
+class RothConversionYear(BaseModel):
+    """Conversion and tax in one year of the recommended plan."""
+
+    year: int = Field(..., description="Year number (1-based)")
+    calendar_year: int
+    age: int
+    conversion: Decimal
+    total_tax: Decimal
+    ending_balance: Decimal
+
+
+class RothConversionResult(BaseModel):
+    """Best Roth conversion policy found for a scenario."""
+
+    scenario_id: Optional[UUID] = Field(None, description="ID if saved")
+    scenario_name: str
+    objective: Literal["after_tax_wealth", "lifetime_tax"]
+    candidates_evaluated: int
+    baseline: RothConversionPlan
+    best: RothConversionPlan
+    improvement: Decimal = Field(..., description="Objective gain of best over baseline")
+    alternatives: list[RothConversionPlan] = Field(
+        ..., description="Next best policies, best first"
+    )
+    years: list[RothConversionYear]
+
+
 # ===== LEGACY SCHEMAS (for backward compatibility) =====
 
 
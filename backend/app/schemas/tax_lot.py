@@ -0,0 +1,46 @@
+"""Tax lot Pydantic schemas."""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class TaxLotBase(BaseModel):
+    """Base schema for a tax lot."""
+
+    acquired_on: date = Field(..., description="Purchase date")
+    quantity: Decimal = Field(..., gt=0, description="Shares or units bought")
+    cost_basis: Decimal = Field(..., ge=0, description="Total purchase cost of the lot")
+    sale_priority: Optional[int] = Field(
+        None, ge=0, description="Specific-identification order (lower is sold first)"
+    )
+
+
+class TaxLotCreate(TaxLotBase):
+    """Schema for creating a tax lot."""
+
+    holding_id: UUID = Field(..., description="ID of the holding this lot belongs to")
+
+
+class TaxLotUpdate(BaseModel):
+    """Schema for updating a tax lot (all fields optional)."""
+
+    acquired_on: Optional[date] = None
+    quantity: Optional[Decimal] = Field(None, gt=0)
+    cost_basis: Optional[Decimal] = Field(None, ge=0)
+    sale_priority: Optional[int] = Field(None, ge=0)
+
+
+class TaxLot(TaxLotBase):
+    """Schema for tax lot response."""
+
+    id: UUID
+    holding_id: UUID
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
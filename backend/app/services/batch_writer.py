@@ -0,0 +1,93 @@
+"""Apply a batch of creates, updates and deletes to one table in a single transaction."""
+
+from collections.abc import Callable
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.schemas.batch import BatchItemResult, BatchRequest, BatchResult
+
+
+def apply_batch(
+    db: Session,
+    model,
+    batch: BatchRequest,
+    check_create: Callable[[BaseModel], None],
+    check_update: Callable[[object, dict], None],
+    before_commit: Callable[[list, list, list], None] | None = None,
+) -> BatchResult:
+    """
+    Validate every item, then apply all of them with one commit or none at all.
+
+    The rows to update or delete are loaded with one query. check_create gets
+    a create item and check_update a row with its changes; both raise
+    ValueError for an invalid item. before_commit gets the created rows,
+    (row, old values) pairs of the updated rows and the deleted rows, after
+    the batch is flushed, to keep derived data in the same transaction.
+    """
+    ids = [item.id for item in batch.update] + list(batch.delete)
+    rows = {row.id: row for row in db.query(model).filter(model.id.in_(ids)).all()} if ids else {}
+
+    results: list[BatchItemResult] = []
+    seen: set[UUID] = set()
+
+    def check(operation: str, index: int, item_id: UUID | None, validate) -> None:
+        """Record one item as valid (skipped until applied) or as an error."""
+        try:
+            if item_id is not None:
+                if item_id in seen:
+                    raise ValueError(f"{item_id} appears more than once in the batch")
+                seen.add(item_id)
+                if item_id not in rows:
+                    raise ValueError(f"{item_id} not found")
+            validate()
+        except ValueError as e:
+            results.append(
+                BatchItemResult(
+                    operation=operation, index=index, id=item_id, status="error", error=str(e)
+                )
+            )
+        else:
+            results.append(
+                BatchItemResult(operation=operation, index=index, id=item_id, status="skipped")
+            )
+
+    changes = [item.model_dump(exclude_unset=True, exclude={"id"}) for item in batch.update]
+    for index, item in enumerate(batch.create):
+        check("create", index, None, lambda: check_create(item))
+    for index, item in enumerate(batch.update):
+        check("update", index, item.id, lambda: check_update(rows[item.id], changes[index]))
+    for index, item_id in enumerate(batch.delete):
+        check("delete", index, item_id, lambda: None)
+
+    if any(result.status == "error" for result in results):
+        return BatchResult(applied=False, results=results)
+
+    try:
+        created = [model(**item.model_dump()) for item in batch.create]
+        db.add_all(created)
+        updated = []
+        for item, item_changes in zip(batch.update, changes):
+            row = rows[item.id]
+            updated.append((row, {field: getattr(row, field) for field in item_changes}))
+            for field, value in item_changes.items():
+                setattr(row, field, value)
+        deleted = [rows[item_id] for item_id in batch.delete]
+        for row in deleted:
+            db.delete(row)
+        db.flush()
+        if before_commit is not None:
+            before_commit(created, updated, deleted)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    status = {"create": "created", "update": "updated", "delete": "deleted"}
+    created_ids = iter(row.id for row in created)
+    for result in results:
+        result.status = status[result.operation]
+        if result.operation == "create":
+            result.id = next(created_ids)
+    return BatchResult(applied=True, results=results)
@@ -1,21 +1,30 @@
 """Service for holding business logic."""
 
 from decimal import Decimal
+from types import SimpleNamespace
 from uuid import UUID
 
 from sqlalchemy.orm import Session
 
+from app.models.account import Account as AccountModel
 from app.models.holding import Holding as HoldingModel
 from app.repositories.account_repository import AccountRepository
 from app.repositories.holding_repository import HoldingRepository
+from app.repositories.portfolio_snapshot_repository import (
+    PortfolioSnapshotRepository,
+    holding_deltas,
+)
+from app.schemas.batch import BatchRequest, BatchResult
 from app.schemas.holding import (
     AccountHoldingsSummary,
     Holding,
+    HoldingBatchUpdate,
     HoldingCreate,
     HoldingUpdate,
     HoldingWithAllocation,
     PortfolioAllocation,
 )
+from app.services.batch_writer import apply_batch
 
 
 class HoldingService:
@@ -26,6 +35,7 @@ class HoldingService:
         self.db = db
         self.repository = HoldingRepository(db)
         self.account_repository = AccountRepository(db)
+        self.snapshot_repository = PortfolioSnapshotRepository(db)
 
     def get_all_holdings(self) -> list[Holding]:
         """Get all holdings."""
@@ -65,6 +75,35 @@ class HoldingService:
         """Delete a holding."""
         return self.repository.delete(holding_id)
 
+    def apply_batch(self, batch: BatchRequest[HoldingCreate, HoldingBatchUpdate]) -> BatchResult:
+        """
+        Create, update and delete holdings in one transaction.
+
+        The allocation snapshot is adjusted once for the whole batch.
+        """
+        account_ids = {h.account_id for h in batch.create}
+        known = {a.id for a in self.account_repository.get_by_ids(account_ids)}
+
+        def check_create(holding: HoldingCreate) -> None:
+            if holding.account_id not in known:
+                raise ValueError(f"Account {holding.account_id} not found")
+
+        def adjust_snapshot(created, updated, deleted) -> None:
+            before = [
+                SimpleNamespace(
+                    asset_class=old.get("asset_class", row.asset_class),
+                    amount=old.get("amount", row.amount),
+                )
+                for row, old in updated
+            ]
+            deltas = holding_deltas(before + deleted, sign=-1)
+            holding_deltas(created + [row for row, _ in updated], deltas=deltas)
+            self.repository.snapshot.adjust(deltas)
+
+        return apply_batch(
+            self.db, HoldingModel, batch, check_create, lambda row, changes: None, adjust_snapshot
+        )
+
     def get_account_holdings_summary(self, account_id: UUID) -> AccountHoldingsSummary | None:
         """Get holdings summary for an account with allocation percentages."""
         account = self.account_repository.get_by_id(account_id)
@@ -72,8 +111,14 @@ class HoldingService:
             return None
 
         holdings = self.repository.get_by_account(account_id)
-        account_balance = Decimal(str(account.balance))
         holdings_total = sum(Decimal(str(h.amount)) for h in holdings)
+        return self._account_summary(account, holdings, holdings_total)
+
+    def _account_summary(
+        self, account: AccountModel, holdings: list[HoldingModel], holdings_total: Decimal
+    ) -> AccountHoldingsSummary:
+        """Summary of one account from its already loaded holdings and their total."""
+        account_balance = Decimal(str(account.balance))
 
         holdings_with_allocation = []
         for h in holdings:
@@ -103,21 +148,14 @@ class HoldingService:
             holdings=holdings_with_allocation,
         )
 
-    def get_portfolio_allocation(self) -> PortfolioAllocation:
-        """Get portfolio-wide allocation across all accounts."""
-        accounts = self.account_repository.get_all()
-        all_holdings = self.repository.get_all()
-
-        total_portfolio_value = sum(Decimal(str(a.balance)) for a in accounts)
-
-        # Aggregate by asset class
-        by_asset_class: dict[str, Decimal] = {}
-        for h in all_holdings:
-            asset_class = h.asset_class
-            amount = Decimal(str(h.amount))
-            by_asset_class[asset_class] = by_asset_class.get(asset_class, Decimal("0")) + amount
+    def get_asset_class_percentages(self) -> dict[str, Decimal]:
+        """Share of the portfolio in each asset class, read from the allocation snapshot."""
+        return self._asset_class_percentages(*self.snapshot_repository.get())
 
-        # Calculate percentages
+    def _asset_class_percentages(
+        self, total_portfolio_value: Decimal, by_asset_class: dict[str, Decimal]
+    ) -> dict[str, Decimal]:
+        """Percent of total_portfolio_value in each asset class."""
         by_asset_class_percent: dict[str, Decimal] = {}
         for asset_class, amount in by_asset_class.items():
             percent = (
@@ -126,17 +164,34 @@ class HoldingService:
                 else Decimal("0")
             )
             by_asset_class_percent[asset_class] = percent.quantize(Decimal("0.01"))
+        return by_asset_class_percent
+
+    def get_portfolio_allocation(self) -> PortfolioAllocation:
+        """
+        Get portfolio-wide allocation across all accounts.
+
+        A fixed number of queries however many accounts and holdings there
+        are: portfolio totals come from the allocation snapshot, and the
+        per-account breakdown from accounts and holdings grouped in memory.
+        """
+        total_portfolio_value, by_asset_class = self.snapshot_repository.get()
+
+        accounts = self.account_repository.get_all()
+        holdings_by_account: dict[UUID, list[HoldingModel]] = {}
+        for h in self.repository.get_all():
+            holdings_by_account.setdefault(h.account_id, []).append(h)
 
-        # Get per-account summaries
         account_summaries = []
         for account in accounts:
-            summary = self.get_account_holdings_summary(account.id)
-            if summary:
-                account_summaries.append(summary)
+            holdings = holdings_by_account.get(account.id, [])
+            holdings_total = sum((Decimal(str(h.amount)) for h in holdings), Decimal("0"))
+            account_summaries.append(self._account_summary(account, holdings, holdings_total))
 
         return PortfolioAllocation(
             total_portfolio_value=total_portfolio_value,
-            by_asset_class={k: v for k, v in by_asset_class.items()},
-            by_asset_class_percent=by_asset_class_percent,
+            by_asset_class=by_asset_class,
+            by_asset_class_percent=self._asset_class_percentages(
+                total_portfolio_value, by_asset_class
+            ),
             by_account=account_summaries,
         )
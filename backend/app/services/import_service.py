@@ -0,0 +1,207 @@
+"""Service for bulk importing accounts and holdings from CSV or JSON uploads."""
+
+import codecs
+import csv
+import json
+from collections.abc import Iterator
+from itertools import islice
+from typing import BinaryIO
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+
+from app.repositories.account_repository import AccountRepository
+from app.repositories.holding_repository import HoldingRepository
+from app.schemas.account import AccountCreate
+from app.schemas.bulk_import import ImportResult, ImportRowError
+from app.schemas.holding import HoldingCreate
+
+# Rows validated and inserted per statement
+BATCH_SIZE = 1000
+
+# Characters of a JSON upload read at a time
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+class ImportService:
+    """
+    Service for bulk imports.
+
+    Rows are parsed as they stream in, validated a batch at a time and each
+    batch is written with one multi-row insert. The whole upload is one
+    transaction: unless partial imports are allowed, a single invalid row
+    rolls everything back, and the report lists every invalid row either way.
+    """
+
+    def __init__(self, db: Session):
+        """Initialize service with database session."""
+        self.db = db
+        self.account_repository = AccountRepository(db)
+        self.holding_repository = HoldingRepository(db)
+
+    def import_accounts(
+        self, upload: BinaryIO, filename: str | None = None, partial: bool = False
+    ) -> ImportResult:
+        """Import accounts (name, account_type, balance, cost_basis)."""
+        return self._import(
+            read_records(upload, filename),
+            AccountCreate.model_validate,
+            self.account_repository.bulk_create,
+            partial,
+        )
+
+    def import_holdings(
+        self, upload: BinaryIO, filename: str | None = None, partial: bool = False
+    ) -> ImportResult:
+        """
+        Import holdings (account_id or account_name, asset_class, ticker, name,
+        amount, notes).
+        """
+        # Account names are not unique; a name shared by several accounts needs account_id
+        accounts_by_name: dict[str, list] = {}
+        for account in self.account_repository.get_all():
+            accounts_by_name.setdefault(account.name, []).append(account.id)
+        known_ids = {account_id for ids in accounts_by_name.values() for account_id in ids}
+
+        def validate(record: dict) -> HoldingCreate:
+            record = dict(record)
+            account_name = record.pop("account_name", None)
+            if record.get("account_id") is None:
+                if account_name is None:
+                    raise ValueError("account_id or account_name is required")
+                ids = accounts_by_name.get(account_name, [])
+                if not ids:
+                    raise ValueError(f"Account '{account_name}' not found")
+                if len(ids) > 1:
+                    raise ValueError(
+                        f"Account name '{account_name}' matches {len(ids)} accounts; "
+                        "use account_id"
+                    )
+                record["account_id"] = ids[0]
+            holding = HoldingCreate.model_validate(record)
+            if holding.account_id not in known_ids:
+                raise ValueError(f"Account {holding.account_id} not found")
+            return holding
+
+        return self._import(
+            read_records(upload, filename), validate, self.holding_repository.bulk_create, partial
+        )
+
+    def _import(self, records: Iterator[dict], validate, write, partial: bool) -> ImportResult:
+        """Validate and write records batch by batch in one transaction."""
+        imported = 0
+        errors: list[ImportRowError] = []
+        row = 0
+        try:
+            while batch := list(islice(records, BATCH_SIZE)):
+                valid: list[BaseModel] = []
+                for record in batch:
+                    row += 1
+                    try:
+                        valid.append(validate(record))
+                    except ValidationError as e:
+                        errors.append(ImportRowError(row=row, errors=_messages(e)))
+                    except ValueError as e:
+                        errors.append(ImportRowError(row=row, errors=[str(e)]))
+                # Once a strict import has failed, only validate the rest for the report
+                if partial or not errors:
+                    imported += write(valid)
+
+            if errors and not partial:
+                self.db.rollback()
+                imported = 0
+            else:
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return ImportResult(imported=imported, rejected=len(errors), errors=errors)
+
+
+def read_records(upload: BinaryIO, filename: str | None = None) -> Iterator[dict]:
+    """
+    Records of a CSV upload or a JSON array, parsed as they are read.
+
+    CSV cells are stripped and empty cells are left out, so optional fields
+    take their defaults. A malformed JSON upload raises ValueError once the
+    parser reaches the fault, which fails the whole import.
+    """
+    if filename and filename.lower().endswith(".json"):
+        return _json_array(upload, JSON_CHUNK_SIZE)
+
+    reader = csv.DictReader(codecs.iterdecode(upload, "utf-8-sig"))
+    return (
+        {
+            key.strip(): value.strip()
+            for key, value in record.items()
+            if key is not None and value is not None and value.strip()
+        }
+        for record in reader
+    )
+
+
+def _json_array(upload: BinaryIO, chunk_size: int) -> Iterator[dict]:
+    """
+    Objects of a JSON array, decoded one at a time.
+
+    The upload is read in chunks and only the unparsed tail is kept, so
+    memory does not grow with the number of rows.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer, position, done = "", 0, False
+
+    def read_more() -> bool:
+        nonlocal buffer, position, done
+        if done:
+            return False
+        chunk = upload.read(chunk_size)
+        done = not chunk
+        buffer, position = buffer[position:] + text.decode(chunk, final=done), 0
+        return True
+
+    def next_char() -> str:
+        """The next non-whitespace character, without consuming it ("" at the end)."""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or not read_more():
+                return buffer[position : position + 1]
+
+    def expect(allowed: str) -> str:
+        nonlocal position
+        char = next_char()
+        if not char or char not in allowed:
+            raise ValueError("JSON upload must be an array of objects")
+        position += 1
+        return char
+
+    expect("[")
+    if next_char() == "]":
+        position += 1
+    else:
+        while True:
+            while True:
+                next_char()
+                try:
+                    record, end = decoder.raw_decode(buffer, position)
+                    break
+                except json.JSONDecodeError as e:
+                    if not read_more():
+                        raise ValueError(f"Invalid JSON: {e.msg}")
+            if not isinstance(record, dict):
+                raise ValueError("JSON upload must be an array of objects")
+            position = end
+            yield record
+            if expect(",]") == "]":
+                break
+    if next_char():
+        raise ValueError("Invalid JSON: unexpected data after the array")
+
+
+def _messages(error: ValidationError) -> list[str]:
+    """One 'field: message' string per validation error."""
+    return [
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()
+    ]
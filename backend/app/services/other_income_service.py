@@ -8,14 +8,17 @@ from sqlalchemy.orm import Session
 
 from app.models.other_income import OtherIncome as OtherIncomeModel
 from app.repositories.other_income_repository import OtherIncomeRepository
+from app.schemas.batch import BatchRequest, BatchResult
 from app.schemas.other_income import (
     IncomeType,
     OtherIncome,
+    OtherIncomeBatchUpdate,
     OtherIncomeCreate,
     OtherIncomeProjection,
     OtherIncomeSummary,
     OtherIncomeUpdate,
 )
+from app.services.batch_writer import apply_batch
 
 
 class OtherIncomeService:
@@ -40,16 +43,12 @@ class OtherIncomeService:
 
     def create_income(self, income_data: OtherIncomeCreate) -> OtherIncome:
         """Create a new other income source."""
-        # Validate end date consistency
-        if (income_data.end_month is not None) != (income_data.end_year is not None):
-            raise ValueError("Both end_month and end_year must be set together or neither")
-
-        # Validate end date is after start date if set
-        if income_data.end_year is not None:
-            start_date_value = income_data.start_year * 12 + income_data.start_month
-            end_date_value = income_data.end_year * 12 + income_data.end_month
-            if end_date_value < start_date_value:
-                raise ValueError("End date must be on or after start date")
+        _validate_dates(
+            income_data.start_year,
+            income_data.start_month,
+            income_data.end_year,
+            income_data.end_month,
+        )
 
         income = self.repository.create(income_data)
         return OtherIncome.model_validate(income)
@@ -65,6 +64,25 @@ class OtherIncomeService:
         """Delete an other income source."""
         return self.repository.delete(income_id)
 
+    def apply_batch(
+        self, batch: BatchRequest[OtherIncomeCreate, OtherIncomeBatchUpdate]
+    ) -> BatchResult:
+        """Create, update and delete other income sources in one transaction."""
+
+        def check_create(income: OtherIncomeCreate) -> None:
+            _validate_dates(
+                income.start_year, income.start_month, income.end_year, income.end_month
+            )
+
+        def check_update(income: OtherIncomeModel, changes: dict) -> None:
+            merged = {
+                field: changes.get(field, getattr(income, field))
+                for field in ("start_year", "start_month", "end_year", "end_month")
+            }
+            _validate_dates(**merged)
+
+        return apply_batch(self.db, OtherIncomeModel, batch, check_create, check_update)
+
     def _is_income_active(
         self,
         income: OtherIncomeModel,
@@ -215,3 +233,40 @@ class OtherIncomeService:
                 total += amount
 
         return total
+
+    def get_total_annual_income(
+        self, year: int, incomes: list[OtherIncomeModel] | None = None
+    ) -> Decimal:
+        """
+        Get total other income for a calendar year.
+
+        Pass preloaded income sources to avoid re-querying them for every year
+        of a projection.
+        """
+        if incomes is None:
+            incomes = self.repository.get_all()
+        total = Decimal("0")
+
+        for income in incomes:
+            amount = self._calculate_amount_with_cola(income, year)
+            for month in range(1, 13):
+                if self._is_income_active(income, year, month):
+                    total += amount
+
+        return total
+
+
+def _validate_dates(
+    start_year: int, start_month: int, end_year: int | None, end_month: int | None
+) -> None:
+    """Raise ValueError unless the end date is complete and on or after the start."""
+    # Validate end date consistency
+    if (end_month is not None) != (end_year is not None):
+        raise ValueError("Both end_month and end_year must be set together or neither")
+
+    # Validate end date is after start date if set
+    if end_year is not None:
+        start_date_value = start_year * 12 + start_month
+        end_date_value = end_year * 12 + end_month
+        if end_date_value < start_date_value:
+            raise ValueError("End date must be on or after start date")
@@ -0,0 +1,113 @@
+"""Inputs of a retirement projection, loaded from the database once."""
+
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from app.engine.tax_lots import ReliefCurve, TaxLotTable
+from app.models.fixed_expense import FixedExpense
+from app.models.other_income import OtherIncome
+from app.schemas.scenario import SavedScenarioBase
+from app.utils.input_hash import canonical_input_hash
+
+
+@dataclass
+class ProjectionContext:
+    """Everything a projection reads besides the scenario parameters themselves."""
+
+    scenario_id: UUID | None
+    scenario: SavedScenarioBase
+    today: date
+    birth_date: date
+    ss_fra_amount: Decimal
+    initial_portfolio: Decimal
+    account_balances: dict[str, Decimal]
+    account_cost_basis: dict[str, Decimal]
+    filing_status: str
+    total_deductions: Decimal
+    fixed_expenses: list[FixedExpense]
+    other_incomes: list[OtherIncome]
+    # Lots of the taxable bucket, loaded only when the scenario relieves basis by lot
+    tax_lots: TaxLotTable | None = None
+    # Only bounds simulated lifetimes, so it is left out of the input hash
+    spouse_age: int | None = None
+
+    @property
+    def current_age(self) -> int:
+        """Age in whole years as of today."""
+        age = self.today.year - self.birth_date.year
+        if (self.today.month, self.today.day) < (self.birth_date.month, self.birth_date.day):
+            age -= 1
+        return age
+
+    def input_hash(self) -> str:
+        """Canonical hash of every input that can change the projection result."""
+        return canonical_input_hash(
+            {
+                "scenario_id": self.scenario_id,
+                # Settings only: timestamps and the cached outcome do not change results
+                "scenario": self.scenario.model_dump(include=set(SavedScenarioBase.model_fields)),
+                # Projections read today only as the calendar year and the age, so
+                # runs and cached outcomes go stale on new year's day and birthdays
+                "year": self.today.year,
+                "age": self.current_age,
+                "birth_date": self.birth_date,
+                "ss_fra_amount": self.ss_fra_amount,
+                "account_balances": self.account_balances,
+                "account_cost_basis": self.account_cost_basis,
+                "filing_status": self.filing_status,
+                "total_deductions": self.total_deductions,
+                "fixed_expenses": [
+                    [fe.monthly_amount, fe.start_year, fe.end_year] for fe in self.fixed_expenses
+                ],
+                "other_incomes": [
+                    [
+                        income.monthly_amount,
+                        income.start_month,
+                        income.start_year,
+                        income.end_month,
+                        income.end_year,
+                        income.cola_rate,
+                    ]
+                    for income in self.other_incomes
+                ],
+                "tax_lots": None if self.tax_lots is None else self.tax_lots.fingerprint(),
+            }
+        )
+
+    def relief_curve(self) -> ReliefCurve | None:
+        """Lot relief curve for the scenario's cost basis method (None for average cost)."""
+        if self.tax_lots is None or not len(self.tax_lots):
+            return None
+        return self.tax_lots.relief_curve(
+            self.scenario.cost_basis_method,
+            float(self.account_balances["taxable"]),
+            float(self.account_cost_basis["taxable"]),
+        )
+
+
+@dataclass
+class CashFlowSchedule:
+    """Per-year income and spending of a projection (index 0 = projection year 1)."""
+
+    calendar_years: list[int] = field(default_factory=list)
+    ages: list[int] = field(default_factory=list)
+    ss_income: list[Decimal] = field(default_factory=list)
+    other_income: list[Decimal] = field(default_factory=list)
+    # Monthly fixed spending (never inflated)
+    fixed_monthly: list[Decimal] = field(default_factory=list)
+    # Monthly variable spending after any reduction, before / after inflation
+    variable_monthly_base: list[Decimal] = field(default_factory=list)
+    variable_monthly: list[Decimal] = field(default_factory=list)
+    annual_lump: list[Decimal] = field(default_factory=list)
+    # Year index (0 = year 1) Social Security COLAs compound from
+    ss_cola_start: int = 0
+    # Other income sources with a COLA: year index each compounds from, and its amounts
+    cola_income_starts: list[int] = field(default_factory=list)
+    cola_income: list[list[Decimal]] = field(default_factory=list)
+
+    @property
+    def years(self) -> int:
+        """Number of projection years."""
+        return len(self.calendar_years)
@@ -0,0 +1,119 @@
+"""Service for stored projection runs."""
+
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models.projection_run import ProjectionRun
+from app.repositories.projection_run_repository import ProjectionRunRepository
+from app.schemas.projection_run import ProjectionRunDiff, ProjectionRunSummary
+from app.schemas.scenario import ScenarioProjectionResult
+from app.utils.columnar import columns_to_rows, pack_columns, unpack_columns
+
+# Bump whenever a change to the projection engine changes its results;
+# stored runs of other versions are then recomputed instead of served
+PROJECTION_ENGINE_VERSION = "2"
+
+# Per-year fields that identify a row rather than measure an amount
+_KEY_COLUMNS = ("year", "calendar_year", "age", "is_depleted")
+
+
+class ProjectionRunService:
+    """
+    Service for projection runs of saved scenarios.
+
+    Each run keeps its summary metrics as JSON and its per-year rows as
+    compressed columns, so a run can be served or diffed without recomputing.
+    """
+
+    def __init__(self, db: Session):
+        """Initialize service with database session."""
+        self.db = db
+        self.repository = ProjectionRunRepository(db)
+
+    def find_result(self, scenario_id: UUID, input_hash: str) -> ScenarioProjectionResult | None:
+        """Stored result for these inputs, computed by the current engine version."""
+        run = self.repository.find(scenario_id, input_hash, PROJECTION_ENGINE_VERSION)
+        return self.to_result(run) if run else None
+
+    def save(
+        self, scenario_id: UUID, input_hash: str, result: ScenarioProjectionResult
+    ) -> ProjectionRun:
+        """Store a computed result."""
+        return self.repository.create(
+            scenario_id,
+            input_hash,
+            PROJECTION_ENGINE_VERSION,
+            result.model_dump(mode="json", exclude={"projections"}),
+            pack_columns([year.model_dump() for year in result.projections]),
+        )
+
+    def get_result(self, run_id: UUID) -> ScenarioProjectionResult | None:
+        """Full result of a stored run."""
+        run = self.repository.get_by_id(run_id)
+        return self.to_result(run) if run else None
+
+    def list_runs(self, scenario_id: UUID) -> list[ProjectionRunSummary]:
+        """Stored runs of a scenario, newest first."""
+        return [_summary(run) for run in self.repository.list_by_scenario(scenario_id)]
+
+    def diff_runs(self, base_id: UUID, other_id: UUID) -> ProjectionRunDiff | None:
+        """Differences of the other run from the base run, or None if either is missing."""
+        base = self.repository.get_by_id(base_id)
+        other = self.repository.get_by_id(other_id)
+        if not base or not other:
+            return None
+
+        summary: dict[str, Decimal | None] = {}
+        for key, value in base.summary.items():
+            if key in ("scenario_id", "scenario_name", "ss_start_age", "spending_policy"):
+                continue
+            other_value = other.summary.get(key)
+            summary[key] = (
+                None
+                if value is None or other_value is None
+                else Decimal(str(other_value)) - Decimal(str(value))
+            )
+
+        base_columns = unpack_columns(base.year_columns)
+        other_columns = unpack_columns(other.year_columns)
+        base_rows = {year: i for i, year in enumerate(base_columns.get("year", []))}
+        other_rows = {year: i for i, year in enumerate(other_columns.get("year", []))}
+        years = [year for year in base_rows if year in other_rows]
+        columns = {
+            name: [
+                Decimal(other_columns[name][other_rows[year]]) - Decimal(values[base_rows[year]])
+                for year in years
+            ]
+            for name, values in base_columns.items()
+            if name not in _KEY_COLUMNS and name in other_columns
+        }
+        return ProjectionRunDiff(
+            base_run_id=base.id,
+            other_run_id=other.id,
+            summary=summary,
+            years=years,
+            columns=columns,
+        )
+
+    @staticmethod
+    def to_result(run: ProjectionRun) -> ScenarioProjectionResult:
+        """Rebuild the projection result a run was stored from."""
+        return ScenarioProjectionResult.model_validate(
+            {**run.summary, "projections": columns_to_rows(unpack_columns(run.year_columns))}
+        )
+
+
+def _summary(run: ProjectionRun) -> ProjectionRunSummary:
+    """List entry of a run."""
+    return ProjectionRunSummary(
+        id=run.id,
+        scenario_id=run.scenario_id,
+        input_hash=run.input_hash,
+        engine_version=run.engine_version,
+        initial_portfolio=run.summary["initial_portfolio"],
+        final_portfolio=run.summary["final_portfolio"],
+        years_until_depletion=run.summary.get("years_until_depletion"),
+        created_at=run.created_at,
+    )
@@ -1,28 +1,59 @@
 """Retirement scenario modeling service."""
 
-from datetime import date
+import logging
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy.orm import Session
-
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.engine.glide_path import expected_return_path
+from app.engine.rmd import rmd_fractions
+from app.engine.spending import scenario_spending_policy
+from app.engine.tax import (
+    STATE_TAX_RATE,
+    IncomeTaxSchedule,
+    capital_gains_brackets,
+    federal_brackets,
+    net_investment_income_tax,
+)
+from app.engine.tax_lots import LotBasis, TaxLotTable
+from app.engine.withdrawal import BUCKETS, StrategyStack, get_strategy
 from app.models.scenario import SavedScenario
 from app.repositories.account_repository import AccountRepository
 from app.repositories.holding_repository import HoldingRepository
 from app.repositories.planned_spending_repository import PlannedSpendingRepository
-from app.repositories.scenario_repository import ScenarioRepository
+from app.repositories.scenario_repository import AsyncScenarioRepository, ScenarioRepository
 from app.repositories.social_security_repository import SocialSecurityRepository
+from app.repositories.tax_lot_repository import TaxLotRepository
 from app.schemas.scenario import (
     AssetAllocation,
     SavedScenarioCreate,
     SavedScenarioUpdate,
     SavedScenario as SavedScenarioSchema,
+    SavedScenarioSummary,
+    ScenarioOutcomeFilter,
     ScenarioProjectionResult,
+    ScenarioVariant,
     ScenarioYearProjection,
     ScenarioComparisonResult,
 )
 from app.services.asset_projection_service import AssetProjectionService
 from app.services.holding_service import HoldingService
+from app.services.projection_context import CashFlowSchedule, ProjectionContext
+from app.services.projection_run_service import ProjectionRunService
+from app.utils.cancellation import CancellationToken, OperationCancelledError
+from app.utils.input_hash import canonical_input_hash
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Concurrent identical requests (dashboard widgets, multiple tabs) share one computation
+_projection_flights = SingleFlight()
+_default_scenario_flights = SingleFlight()
 
 
 class RetirementScenarioService:
@@ -37,6 +68,7 @@ class RetirementScenarioService:
         self.holding_repository = HoldingRepository(db)
         self.planned_spending_repository = PlannedSpendingRepository(db)
         self.ss_repository = SocialSecurityRepository(db)
+        self.run_service = ProjectionRunService(db)
 
     # ===== CRUD Operations =====
 
@@ -45,6 +77,24 @@ class RetirementScenarioService:
         scenarios = self.repository.get_all()
         return [SavedScenarioSchema.model_validate(s) for s in scenarios]
 
+    def list_scenarios(
+        self,
+        limit: int | None = None,
+        cursor: str | None = None,
+        summary: bool = False,
+        outcome: ScenarioOutcomeFilter | None = None,
+    ) -> tuple[list[SavedScenarioSchema] | list[SavedScenarioSummary], str | None]:
+        """
+        A page of scenarios, most recently updated first, and the cursor of the next page.
+
+        Without a limit every scenario after the cursor is returned. The
+        cursor is None on the last page. outcome bounds the cached outcomes,
+        so scenarios not yet projected are left out when it is set.
+        """
+        after = _decode_cursor(cursor) if cursor else None
+        scenarios = self.repository.get_page(limit, after, summary=summary, outcome=outcome)
+        return _scenario_page(scenarios, limit, summary)
+
     def get_scenario_by_id(self, scenario_id: UUID) -> SavedScenarioSchema | None:
         """Get scenario by ID."""
         scenario = self.repository.get_by_id(scenario_id)
@@ -72,32 +122,20 @@ class RetirementScenarioService:
 
     def duplicate_scenario(self, scenario_id: UUID, new_name: str) -> SavedScenarioSchema | None:
         """Duplicate a scenario with a new name, including all fixed expenses."""
-        from app.models.fixed_expense import FixedExpense
-
         scenario = self.repository.duplicate(scenario_id, new_name)
         if not scenario:
             return None
-
-        # Copy fixed expenses from original scenario
-        original_fixed_expenses = (
-            self.db.query(FixedExpense).filter(FixedExpense.scenario_id == scenario_id).all()
-        )
-
-        for original_fe in original_fixed_expenses:
-            new_fe = FixedExpense(
-                scenario_id=scenario.id,
-                name=original_fe.name,
-                monthly_amount=original_fe.monthly_amount,
-                start_year=original_fe.start_year,
-                end_year=original_fe.end_year,
-                notes=original_fe.notes,
-            )
-            self.db.add(new_fe)
-
-        self.db.commit()
-
         return SavedScenarioSchema.model_validate(scenario)
 
+    def clone_variants(
+        self, scenario_id: UUID, variants: list[ScenarioVariant]
+    ) -> list[SavedScenarioSchema] | None:
+        """Copy a scenario once per variant, applying each variant's overrides."""
+        clones = self.repository.clone(scenario_id, [(v.name, v.overrides) for v in variants])
+        if clones is None:
+            return None
+        return [SavedScenarioSchema.model_validate(s) for s in clones]
+
     def generate_default_scenario(self) -> SavedScenarioSchema:
         """
         Generate a default scenario from all configured data sources.
@@ -110,7 +148,6 @@ class RetirementScenarioService:
         - Defaults for other fields
         """
         from app.models.planned_fixed_expense import PlannedFixedExpense
-        from app.models.fixed_expense import FixedExpense
 
         # Get Social Security config
         ss_config = self.ss_repository.get()
@@ -132,14 +169,13 @@ class RetirementScenarioService:
             monthly_spending = Decimal(str(planned_spending.monthly_spending))
             annual_lump_spending = Decimal(str(planned_spending.annual_lump_sum))
 
-        # Get Portfolio Allocation
+        # Get Portfolio Allocation (from the allocation snapshot)
         holding_service = HoldingService(self.db)
-        portfolio_allocation = holding_service.get_portfolio_allocation()
+        by_asset_class_pct = holding_service.get_asset_class_percentages()
 
         # Convert portfolio allocation percentages to AssetAllocation
         # Map asset classes from holdings to scenario asset classes
         asset_allocation = AssetAllocation()
-        by_asset_class_pct = portfolio_allocation.by_asset_class_percent
 
         # Map common asset class names
         asset_allocation.total_us_stock = Decimal(str(by_asset_class_pct.get("total_us_stock", 0)))
@@ -228,6 +264,30 @@ class RetirementScenarioService:
             inflation_rate=Decimal("2.5"),
         )
 
+        planned_fixed_expenses = self.db.query(PlannedFixedExpense).all()
+
+        # Concurrent page loads with identical configuration write the default once
+        flight_key = canonical_input_hash(
+            {
+                "scenario": default_scenario_data.model_dump(),
+                "planned_fixed_expenses": [
+                    [pfe.name, pfe.monthly_amount, pfe.start_year, pfe.end_year, pfe.notes]
+                    for pfe in planned_fixed_expenses
+                ],
+                "today": date.today(),
+            }
+        )
+        return _default_scenario_flights.do(
+            flight_key,
+            lambda: self._save_default_scenario(default_scenario_data, planned_fixed_expenses),
+        )
+
+    def _save_default_scenario(
+        self, default_scenario_data: SavedScenarioCreate, planned_fixed_expenses: list
+    ) -> SavedScenarioSchema:
+        """Create or update the default scenario and copy planned fixed expenses into it."""
+        from app.models.fixed_expense import FixedExpense
+
         # Check if default scenario already exists
         existing_scenarios = self.repository.get_all()
         default_scenario = None
@@ -245,11 +305,8 @@ class RetirementScenarioService:
             scenario = self.repository.create(default_scenario_data)
 
         # Copy planned fixed expenses to scenario fixed expenses
-        planned_fixed_expenses = self.db.query(PlannedFixedExpense).all()
         if planned_fixed_expenses:
             # Get current year to convert calendar years to projection years
-            from datetime import date
-
             current_year = date.today().year
 
             # Delete existing fixed expenses for this scenario
@@ -288,15 +345,15 @@ class RetirementScenarioService:
 
     # ===== Projection Generation =====
 
-    def generate_projection(
+    def load_projection_context(
         self,
         scenario_id: UUID | None = None,
         scenario_data: SavedScenarioCreate | None = None,
         birth_date: date | None = None,
         ss_fra_amount: Decimal | None = None,
-    ) -> ScenarioProjectionResult:
+    ) -> ProjectionContext:
         """
-        Generate a retirement projection.
+        Load everything a projection reads from the database.
 
         Can be called with either a saved scenario ID or ad-hoc scenario data.
         Requires birth_date and ss_fra_amount from Social Security configuration.
@@ -349,10 +406,7 @@ class RetirementScenarioService:
 
         # Get birth date and SS from database if not provided
         if birth_date is None or ss_fra_amount is None:
-            from app.repositories.social_security_repository import SocialSecurityRepository
-
-            ss_repo = SocialSecurityRepository(self.db)
-            ss_config = ss_repo.get()
+            ss_config = self.ss_repository.get()
             if ss_config:
                 birth_date = birth_date or ss_config.birth_date
                 ss_fra_amount = ss_fra_amount or Decimal(str(ss_config.fra_monthly_amount))
@@ -362,20 +416,6 @@ class RetirementScenarioService:
         if ss_fra_amount is None:
             ss_fra_amount = Decimal("0")
 
-        # Calculate current age
-        today = date.today()
-        current_age = today.year - birth_date.year
-        if (today.month, today.day) < (birth_date.month, birth_date.day):
-            current_age -= 1
-
-        # Get return rate
-        annual_return = self._get_annual_return(scenario_schema)
-
-        # Get other income
-        from app.services.other_income_service import OtherIncomeService
-
-        other_income_service = OtherIncomeService(self.db)
-
         # Get tax configuration
         from app.repositories.tax_config_repository import TaxConfigRepository
 
@@ -399,42 +439,138 @@ class RetirementScenarioService:
                 .all()
             )
 
-        # Generate year-by-year projections
-        projections = []
-        # Track balances by account type throughout projection
-        current_account_balances = {
-            "pretax": account_balances["pretax"],
-            "roth": account_balances["roth"],
-            "taxable": account_balances["taxable"],
-            "cash": account_balances["cash"],
-        }
+        # Other income sources are loaded once and evaluated per year in memory
+        from app.repositories.other_income_repository import OtherIncomeRepository
 
-        # Track cost basis by account type (for calculating taxable gains)
-        current_cost_basis = {
-            "pretax": account_cost_basis["pretax"],
-            "roth": account_cost_basis["roth"],
-            "taxable": account_cost_basis["taxable"],
-            "cash": account_cost_basis["cash"],
-        }
-        total_ss = Decimal("0")
-        total_other = Decimal("0")
-        total_spending = Decimal("0")
-        total_withdrawals = Decimal("0")
-        years_until_depletion = None
+        other_incomes = OtherIncomeRepository(self.db).get_all()
 
-        calendar_year = today.year
-        base_monthly_spending = scenario_schema.monthly_spending
+        # Tax lots only matter when the scenario relieves basis lot by lot
+        tax_lots = None
+        if scenario_schema.cost_basis_method != "average":
+            tax_lots = TaxLotTable.from_rows(TaxLotRepository(self.db).get_taxable_lot_rows())
 
-        for year_num in range(1, scenario_schema.projection_years + 1):
-            age = current_age + year_num - 1
-            # Calculate total starting balance from all account types
-            starting_balance = (
-                current_account_balances["pretax"]
-                + current_account_balances["roth"]
-                + current_account_balances["taxable"]
-                + current_account_balances["cash"]
+        return ProjectionContext(
+            scenario_id=scenario_id,
+            scenario=scenario_schema,
+            today=date.today(),
+            birth_date=birth_date,
+            ss_fra_amount=ss_fra_amount,
+            initial_portfolio=initial_portfolio,
+            account_balances=account_balances,
+            account_cost_basis=account_cost_basis,
+            filing_status=filing_status,
+            total_deductions=total_deductions,
+            fixed_expenses=fixed_expenses,
+            other_incomes=other_incomes,
+            tax_lots=tax_lots,
+            spouse_age=tax_config.spouse_age if tax_config else None,
+        )
+
+    def generate_projection(
+        self,
+        scenario_id: UUID | None = None,
+        scenario_data: SavedScenarioCreate | None = None,
+        birth_date: date | None = None,
+        ss_fra_amount: Decimal | None = None,
+        cancel_token: CancellationToken | None = None,
+        context: ProjectionContext | None = None,
+    ) -> ScenarioProjectionResult:
+        """
+        Generate a retirement projection.
+
+        Can be called with either a saved scenario ID, ad-hoc scenario data, or
+        a preloaded context. Concurrent calls with identical inputs (same
+        canonical input hash) share one computation. Runs of saved scenarios
+        are stored, along with their outcome, and a stored run with the same
+        inputs and engine version is served instead of recomputing.
+        If a cancel_token is given it is checked before each projection year.
+        """
+        if context is None:
+            context = self.load_projection_context(
+                scenario_id, scenario_data, birth_date, ss_fra_amount
             )
+        input_hash = context.input_hash()
+
+        def compute() -> ScenarioProjectionResult:
+            result = self._run_projection(context, cancel_token)
+            if context.scenario_id is not None:
+                # Stored once per computation, not once per caller sharing it
+                self.run_service.save(context.scenario_id, input_hash, result)
+                self._record_outcome(context.scenario_id, input_hash, result)
+            return result
+
+        result = None
+        if context.scenario_id is not None:
+            result = self.run_service.find_result(context.scenario_id, input_hash)
+        if result is None:
+            result = _projection_flights.do(input_hash, compute, cancel_token=cancel_token)
+        return result
+
+    def _record_outcome(
+        self, scenario_id: UUID, input_hash: str, result: ScenarioProjectionResult
+    ) -> None:
+        """Cache the headline of a saved scenario's projection for list pages and search."""
+        self.repository.record_outcome(
+            scenario_id,
+            input_hash,
+            result.final_portfolio,
+            result.years_until_depletion,
+            depletion_age=(
+                result.projections[result.years_until_depletion - 1].age
+                if result.years_until_depletion
+                else None
+            ),
+            lifetime_tax=sum((p.total_tax for p in result.projections), Decimal("0")),
+        )
+
+    def refresh_outcomes(self, scenario_ids: list[UUID] | None = None) -> int:
+        """
+        Project scenarios (all when scenario_ids is None) to refresh their
+        cached outcomes, returning how many were refreshed.
+
+        Scenarios that cannot be projected keep an empty outcome. Serving a
+        stored run does not record its outcome, so it is recorded here.
+        """
+        if scenario_ids is None:
+            scenario_ids = [s.id for s in self.repository.get_page(None, summary=True)]
+        refreshed = 0
+        for scenario_id in scenario_ids:
+            try:
+                context = self.load_projection_context(scenario_id)
+                result = self.generate_projection(context=context)
+                self._record_outcome(scenario_id, context.input_hash(), result)
+            except Exception:
+                logger.exception("Could not refresh the outcome of scenario %s", scenario_id)
+                self.db.rollback()
+                continue
+            refreshed += 1
+        return refreshed
+
+    def build_cash_flow_schedule(self, context: ProjectionContext) -> CashFlowSchedule:
+        """Compute per-year income and spending, which do not depend on balances."""
+        from app.services.other_income_service import OtherIncomeService
 
+        other_income_service = OtherIncomeService(self.db)
+        scenario_schema = context.scenario
+        birth_date = context.birth_date
+        ss_fra_amount = context.ss_fra_amount
+        fixed_expenses = context.fixed_expenses
+        base_monthly_spending = scenario_schema.monthly_spending
+        schedule = CashFlowSchedule()
+
+        # Inflation-linked income, which simulations re-index to realized inflation
+        ss_start_date = self._ss_start_date(
+            birth_date, scenario_schema.ss_start_age_years, scenario_schema.ss_start_age_months
+        )
+        schedule.ss_cola_start = ss_start_date.year - context.today.year
+        cola_incomes = [income for income in context.other_incomes if income.cola_rate]
+        schedule.cola_income_starts = [
+            income.start_year - context.today.year for income in cola_incomes
+        ]
+        schedule.cola_income = [[] for _ in cola_incomes]
+
+        calendar_year = context.today.year
+        for year_num in range(1, scenario_schema.projection_years + 1):
             # Calculate SS income for this year
             ss_age_years = scenario_schema.ss_start_age_years
             ss_age_months = scenario_schema.ss_start_age_months
@@ -449,7 +585,9 @@ class RetirementScenarioService:
             )
 
             # Get other income for this year
-            other_income = self._calculate_other_income(other_income_service, calendar_year)
+            other_income = self._calculate_other_income(
+                other_income_service, calendar_year, context.other_incomes
+            )
 
             # Calculate fixed expenses active this year (not subject to inflation)
             # Fixed expenses are ADDITIONAL to the base monthly spending
@@ -494,6 +632,129 @@ class RetirementScenarioService:
                 inflated_variable_monthly = variable_monthly
                 annual_lump = scenario_schema.annual_lump_spending
 
+            schedule.calendar_years.append(calendar_year)
+            schedule.ages.append(context.current_age + year_num - 1)
+            schedule.ss_income.append(ss_income)
+            schedule.other_income.append(other_income)
+            schedule.fixed_monthly.append(active_fixed_monthly)
+            schedule.variable_monthly_base.append(variable_monthly)
+            schedule.variable_monthly.append(inflated_variable_monthly)
+            schedule.annual_lump.append(annual_lump)
+            for income, amounts in zip(cola_incomes, schedule.cola_income):
+                amounts.append(
+                    self._calculate_other_income(other_income_service, calendar_year, [income])
+                )
+            calendar_year += 1
+
+        return schedule
+
+    def _run_projection(
+        self, context: ProjectionContext, cancel_token: CancellationToken | None = None
+    ) -> ScenarioProjectionResult:
+        """Run the year-by-year projection for a loaded context."""
+        scenario_id = context.scenario_id
+        scenario_schema = context.scenario
+        initial_portfolio = context.initial_portfolio
+        account_balances = context.account_balances
+        account_cost_basis = context.account_cost_basis
+        filing_status = context.filing_status
+        total_deductions = context.total_deductions
+
+        today = context.today
+        current_age = context.current_age
+
+        # Expected return per year (varies when the scenario has a glide path)
+        annual_returns = self._get_annual_returns(
+            scenario_schema, scenario_schema.projection_years, current_age
+        )
+
+        # Income and spending do not depend on balances, so compute them up front
+        schedule = self.build_cash_flow_schedule(context)
+
+        # Strategies other than the conventional sequence come from the engine
+        withdrawal_strategy = None
+        if scenario_schema.withdrawal_strategy != "conventional":
+            withdrawal_strategy = StrategyStack(
+                [get_strategy(scenario_schema.withdrawal_strategy)],
+                1,
+                IncomeTaxSchedule(filing_status),
+            )
+
+        # Taxable basis relieved lot by lot when the scenario uses tax lots
+        relief_curve = context.relief_curve()
+        lot_basis = LotBasis(relief_curve, 1) if relief_curve is not None else None
+
+        # Share of the start-of-year pretax balance forced out as an RMD, per year
+        rmd_shares = rmd_fractions(schedule.calendar_years, context.birth_date)
+
+        # A dynamic spending policy resets variable spending from each year's balance
+        spending_policy = scenario_spending_policy(scenario_schema)
+        if spending_policy.name != "fixed":
+            planned_variable = np.array(
+                [float(v * Decimal("12")) for v in schedule.variable_monthly], dtype=np.float64
+            )
+            policy_state = spending_policy.start(
+                planned_variable, np.array([float(sum(account_balances.values()))])
+            )
+
+        # Generate year-by-year projections
+        projections = []
+        # Track balances by account type throughout projection
+        current_account_balances = {
+            "pretax": account_balances["pretax"],
+            "roth": account_balances["roth"],
+            "taxable": account_balances["taxable"],
+            "cash": account_balances["cash"],
+        }
+
+        # Track cost basis by account type (for calculating taxable gains)
+        current_cost_basis = {
+            "pretax": account_cost_basis["pretax"],
+            "roth": account_cost_basis["roth"],
+            "taxable": account_cost_basis["taxable"],
+            "cash": account_cost_basis["cash"],
+        }
+        total_ss = Decimal("0")
+        total_other = Decimal("0")
+        total_spending = Decimal("0")
+        total_withdrawals = Decimal("0")
+        years_until_depletion = None
+
+        calendar_year = today.year
+
+        for year_num in range(1, scenario_schema.projection_years + 1):
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            age = current_age + year_num - 1
+            # Calculate total starting balance from all account types
+            starting_balance = (
+                current_account_balances["pretax"]
+                + current_account_balances["roth"]
+                + current_account_balances["taxable"]
+                + current_account_balances["cash"]
+            )
+
+            # Income and spending for this year (independent of balances)
+            i = year_num - 1
+            annual_return = annual_returns[i]
+            ss_income = schedule.ss_income[i]
+            other_income = schedule.other_income[i]
+            active_fixed_monthly = schedule.fixed_monthly[i]
+            inflated_variable_monthly = schedule.variable_monthly[i]
+            annual_lump = schedule.annual_lump[i]
+            if spending_policy.name != "fixed":
+                prior_return = float(annual_returns[i - 1]) / 100 if i > 0 else 0.0
+                variable_annual = spending_policy.variable_spending(
+                    i,
+                    planned_variable,
+                    np.array([float(starting_balance)]),
+                    np.array([prior_return]),
+                    policy_state,
+                )[0]
+                inflated_variable_monthly = Decimal(
+                    str(round(float(variable_annual), 2))
+                ) / Decimal("12")
+
             # Total monthly = variable (with inflation) + fixed (no inflation, ends when paid off)
             adjusted_monthly = inflated_variable_monthly + active_fixed_monthly
 
@@ -514,8 +775,13 @@ class RetirementScenarioService:
             )
             taxable_ss = ss_income * ss_taxable_pct
 
+            # Required minimum distribution, based on the start-of-year pretax balance
+            rmd = (current_account_balances["pretax"] * Decimal(str(rmd_shares[i]))).quantize(
+                Decimal("0.01")
+            )
+
             # Estimate taxes assuming pretax withdrawals (matches withdrawal sequencing)
-            estimated_taxable_withdrawal = max(Decimal("0"), gross_needed)
+            estimated_taxable_withdrawal = max(Decimal("0"), gross_needed, rmd)
             gross_taxable_income = taxable_ss + estimated_taxable_withdrawal + other_income
             estimated_taxable_income = max(Decimal("0"), gross_taxable_income - total_deductions)
 
@@ -525,7 +791,7 @@ class RetirementScenarioService:
             )
 
             # Calculate estimated state tax (Colorado flat 4.4%)
-            estimated_state_tax = estimated_taxable_income * Decimal("0.044")
+            estimated_state_tax = estimated_taxable_income * Decimal(STATE_TAX_RATE)
 
             estimated_total_tax = estimated_federal_tax + estimated_state_tax
 
@@ -551,36 +817,65 @@ class RetirementScenarioService:
             else:
                 # Withdrawal sequencing: pretax first, then taxable, then cash, preserve Roth
                 # Sequence: 1. Pretax, 2. Taxable, 3. Cash, 4. Roth (only if others depleted)
-                pretax_withdrawal = Decimal("0")
+                # Any RMD comes out of pretax first and counts toward the withdrawal
+                pretax_withdrawal = rmd
                 taxable_account_withdrawal = Decimal("0")
                 cash_withdrawal = Decimal("0")
                 roth_withdrawal = Decimal("0")
 
-                remaining_withdrawal = required_withdrawal
-
-                # 1. Withdraw from pretax first (100% of withdrawal until depleted)
-                if remaining_withdrawal > 0 and current_account_balances["pretax"] > 0:
-                    pretax_withdrawal = min(
-                        remaining_withdrawal, current_account_balances["pretax"]
+                remaining_withdrawal = max(Decimal("0"), required_withdrawal - rmd)
+
+                if withdrawal_strategy is not None:
+                    # Other strategies split the withdrawal with the engine's strategy object
+                    (
+                        pretax_split,
+                        roth_withdrawal,
+                        taxable_account_withdrawal,
+                        cash_withdrawal,
+                    ) = self._split_withdrawal(
+                        withdrawal_strategy,
+                        {
+                            **current_account_balances,
+                            "pretax": current_account_balances["pretax"] - rmd,
+                        },
+                        remaining_withdrawal,
+                        taxable_ss + other_income - total_deductions + rmd,
                     )
-                    remaining_withdrawal -= pretax_withdrawal
-
-                # 2. If pretax depleted, withdraw from taxable
-                if remaining_withdrawal > 0 and current_account_balances["taxable"] > 0:
-                    taxable_account_withdrawal = min(
-                        remaining_withdrawal, current_account_balances["taxable"]
+                    pretax_withdrawal += pretax_split
+                    remaining_withdrawal -= (
+                        pretax_split
+                        + roth_withdrawal
+                        + taxable_account_withdrawal
+                        + cash_withdrawal
                     )
-                    remaining_withdrawal -= taxable_account_withdrawal
+                else:
+                    # 1. Withdraw from pretax first (100% of withdrawal until depleted)
+                    pretax_available = current_account_balances["pretax"] - pretax_withdrawal
+                    if remaining_withdrawal > 0 and pretax_available > 0:
+                        pretax_step = min(remaining_withdrawal, pretax_available)
+                        pretax_withdrawal += pretax_step
+                        remaining_withdrawal -= pretax_step
+
+                    # 2. If pretax depleted, withdraw from taxable
+                    if remaining_withdrawal > 0 and current_account_balances["taxable"] > 0:
+                        taxable_account_withdrawal = min(
+                            remaining_withdrawal, current_account_balances["taxable"]
+                        )
+                        remaining_withdrawal -= taxable_account_withdrawal
 
-                # 3. If taxable also depleted, withdraw from cash
-                if remaining_withdrawal > 0 and current_account_balances["cash"] > 0:
-                    cash_withdrawal = min(remaining_withdrawal, current_account_balances["cash"])
-                    remaining_withdrawal -= cash_withdrawal
+                    # 3. If taxable also depleted, withdraw from cash
+                    if remaining_withdrawal > 0 and current_account_balances["cash"] > 0:
+                        cash_withdrawal = min(
+                            remaining_withdrawal, current_account_balances["cash"]
+                        )
+                        remaining_withdrawal -= cash_withdrawal
 
-                # 4. Only use Roth if pretax + taxable + cash are all depleted
-                if remaining_withdrawal > 0 and current_account_balances["roth"] > 0:
-                    roth_withdrawal = min(remaining_withdrawal, current_account_balances["roth"])
-                    remaining_withdrawal -= roth_withdrawal
+                    # 4. Only use Roth if pretax + taxable + cash are all depleted
+                    if remaining_withdrawal > 0 and current_account_balances["roth"] > 0:
+                        roth_withdrawal = min(
+                            remaining_withdrawal, current_account_balances["roth"]
+                        )
+                        remaining_withdrawal -= roth_withdrawal
 
                 # Calculate actual withdrawal amount (may be less than required if accounts depleted)
                 actual_withdrawal = (
@@ -601,7 +896,7 @@ class RetirementScenarioService:
 
             # Recalculate taxes based on actual withdrawals (only if we actually withdrew)
             # If no withdrawals, taxes should be based on SS and other income only
-            if required_withdrawal > 0:
+            if required_withdrawal > 0 or rmd > 0:
                 # Pretax withdrawals: 100% taxable
                 # Taxable account withdrawals: gains only (calculate from cost basis)
                 # Roth withdrawals: 0% taxable
@@ -609,7 +904,12 @@ class RetirementScenarioService:
 
                 # Calculate taxable gains from taxable account withdrawals
                 taxable_gains = Decimal("0")
-                if taxable_account_withdrawal > 0 and current_account_balances["taxable"] > 0:
+                if lot_basis is not None:
+                    # Gains come from the lots the scenario's cost basis method sells
+                    taxable_gains = self._lot_gains(
+                        lot_basis, taxable_account_withdrawal, current_account_balances["taxable"]
+                    )
+                elif taxable_account_withdrawal > 0 and current_account_balances["taxable"] > 0:
                     # Calculate cost basis ratio for taxable accounts
                     cost_basis_ratio = (
                         current_cost_basis["taxable"] / current_account_balances["taxable"]
@@ -631,9 +931,14 @@ class RetirementScenarioService:
                     Decimal("0"), actual_gross_taxable_income - total_deductions
                 )
 
-                # Recalculate taxes
-                federal_tax = self._calculate_federal_tax(actual_taxable_income, filing_status)
-                state_tax = actual_taxable_income * Decimal("0.044")
+                # Recalculate taxes (realized gains are taxed at capital gains rates)
+                federal_tax = self._calculate_federal_tax(
+                    actual_taxable_income,
+                    filing_status,
+                    capital_gains=taxable_gains,
+                    magi=actual_gross_taxable_income,
+                )
+                state_tax = actual_taxable_income * Decimal(STATE_TAX_RATE)
                 total_tax = federal_tax + state_tax
 
                 # Optimization: If Roth was used, recalculate optimal required_withdrawal
@@ -663,13 +968,21 @@ class RetirementScenarioService:
                     Decimal("0"), actual_gross_taxable_income - total_deductions
                 )
                 federal_tax = self._calculate_federal_tax(actual_taxable_income, filing_status)
-                state_tax = actual_taxable_income * Decimal("0.044")
+                state_tax = actual_taxable_income * Decimal(STATE_TAX_RATE)
                 total_tax = federal_tax + state_tax
 
+            # An RMD beyond what spending and tax need is reinvested in the taxable account
+            rmd_reinvested = Decimal("0")
+            if rmd > 0:
+                rmd_reinvested = max(
+                    Decimal("0"), rmd - max(Decimal("0"), gross_needed + total_tax)
+                )
+                required_withdrawal = actual_withdrawal - rmd_reinvested
+
             # Calculate balances after withdrawals (before returns)
             pretax_after_withdrawal = current_account_balances["pretax"] - pretax_withdrawal
             taxable_after_withdrawal = (
-                current_account_balances["taxable"] - taxable_account_withdrawal
+                current_account_balances["taxable"] - taxable_account_withdrawal + rmd_reinvested
             )
             cash_after_withdrawal = current_account_balances["cash"] - cash_withdrawal
             roth_after_withdrawal = current_account_balances["roth"] - roth_withdrawal
@@ -682,6 +995,14 @@ class RetirementScenarioService:
                 current_cost_basis["taxable"] -= cost_basis_reduction
                 # Ensure cost basis doesn't go negative
                 current_cost_basis["taxable"] = max(Decimal("0"), current_cost_basis["taxable"])
+            # Reinvested RMD money has already been taxed, so all of it is basis
+            current_cost_basis["taxable"] += rmd_reinvested
+            if lot_basis is not None:
+                lot_basis.relieve(
+                    np.array([float(taxable_account_withdrawal)]),
+                    np.array([float(current_account_balances["taxable"])]),
+                )
+                lot_basis.add(np.array([float(rmd_reinvested)]))
 
             # Calculate average balance per account type (for return calculation)
             # Average = (starting + after_withdrawal) / 2
@@ -782,7 +1103,14 @@ class RetirementScenarioService:
                     # Calculate taxable gains from taxable account withdrawals (including additional)
                     updated_taxable_gains = Decimal("0")
                     total_taxable_withdrawal = taxable_account_withdrawal + additional_taxable
-                    if total_taxable_withdrawal > 0 and taxable_ending > 0:
+                    if lot_basis is not None:
+                        # The extra sale continues along the lots from the year-end balance
+                        balance_before = np.array([float(taxable_ending + additional_taxable)])
+                        updated_taxable_gains = taxable_gains + self._lot_gains(
+                            lot_basis, additional_taxable, balance_before[0]
+                        )
+                        lot_basis.relieve(np.array([float(additional_taxable)]), balance_before)
+                    elif total_taxable_withdrawal > 0 and taxable_ending > 0:
                         # Use current cost basis ratio (already updated from initial withdrawal)
                         cost_basis_ratio = (
                             current_cost_basis["taxable"] / taxable_ending
@@ -812,8 +1140,13 @@ class RetirementScenarioService:
                     updated_taxable_income = max(
                         Decimal("0"), updated_gross_taxable_income - total_deductions
                     )
-                    federal_tax = self._calculate_federal_tax(updated_taxable_income, filing_status)
-                    state_tax = updated_taxable_income * Decimal("0.044")
+                    federal_tax = self._calculate_federal_tax(
+                        updated_taxable_income,
+                        filing_status,
+                        capital_gains=updated_taxable_gains,
+                        magi=updated_gross_taxable_income,
+                    )
+                    state_tax = updated_taxable_income * Decimal(STATE_TAX_RATE)
                     total_tax = federal_tax + state_tax
 
                 # Recalculate after_tax_income with additional withdrawal and updated taxes
@@ -879,6 +1212,8 @@ class RetirementScenarioService:
                     annual_lump_spending=annual_lump.quantize(Decimal("0.01")),
                     total_spending=total_year_spending.quantize(Decimal("0.01")),
                     portfolio_withdrawal=required_withdrawal.quantize(Decimal("0.01")),
+                    required_minimum_distribution=rmd,
+                    rmd_reinvested=rmd_reinvested.quantize(Decimal("0.01")),
                     investment_return=investment_return.quantize(Decimal("0.01")),
                     return_percent=annual_return.quantize(Decimal("0.01")),
                     taxable_income=actual_taxable_income.quantize(Decimal("0.01")),
@@ -925,18 +1260,27 @@ class RetirementScenarioService:
             total_spending=total_spending.quantize(Decimal("0.01")),
             total_withdrawals=total_withdrawals.quantize(Decimal("0.01")),
             ss_start_age=ss_start_age_str,
-            average_return_percent=annual_return.quantize(Decimal("0.01")),
+            spending_policy=spending_policy.name,
+            average_return_percent=(sum(annual_returns) / len(annual_returns)).quantize(
+                Decimal("0.01")
+            ),
             inflation_rate=scenario_schema.inflation_rate.quantize(Decimal("0.01")),
             projections=projections,
         )
 
-    def compare_scenarios(self, scenario_ids: list[UUID]) -> ScenarioComparisonResult:
+    def compare_scenarios(
+        self, scenario_ids: list[UUID], cancel_token: CancellationToken | None = None
+    ) -> ScenarioComparisonResult:
         """Compare multiple scenarios."""
         results = []
         for scenario_id in scenario_ids:
             try:
-                result = self.generate_projection(scenario_id=scenario_id)
+                result = self.generate_projection(
+                    scenario_id=scenario_id, cancel_token=cancel_token
+                )
                 results.append(result)
+            except OperationCancelledError:
+                raise
             except Exception as e:
                 # Skip scenarios that fail to generate
                 continue
@@ -956,93 +1300,67 @@ class RetirementScenarioService:
             comparison_summary=summary,
         )
 
-    def _get_annual_return(self, scenario) -> Decimal:
-        """Get annual return based on scenario configuration."""
-        if hasattr(scenario, "return_source"):
-            return_source = scenario.return_source
-        else:
-            return_source = "10_year_projections"
-
-        if (
-            return_source == "custom"
-            and hasattr(scenario, "custom_return_percent")
-            and scenario.custom_return_percent is not None
-        ):
-            return Decimal(str(scenario.custom_return_percent))
-        elif return_source == "historical_average":
-            return Decimal("10.0")  # Long-term historical average
-        else:  # 10_year_projections
-            # Calculate blended return from asset allocation
-            if hasattr(scenario, "asset_allocation"):
-                allocation = scenario.asset_allocation
-                if isinstance(allocation, dict):
-                    # 10-year expected returns by asset class (Vanguard ETFs)
-                    returns = {
-                        # US Equities
-                        "total_us_stock": Decimal("7.5"),  # VTI
-                        "us_small_cap_value": Decimal("8.5"),  # VBR
-                        # International Equities
-                        "total_foreign_stock": Decimal("7.0"),  # VXUS
-                        "international_small_cap_value": Decimal("8.0"),  # VSS
-                        "developed_markets": Decimal("6.5"),  # VEA
-                        "emerging_markets": Decimal("8.0"),  # VWO
-                        # Real Estate
-                        "reits": Decimal("9.5"),  # VNQ - 10-year forecast
-                        # Fixed Income
-                        "bonds": Decimal("4.5"),  # BND
-                        "short_term_treasuries": Decimal("4.0"),  # VGSH
-                        "intermediate_term_treasuries": Decimal("4.2"),  # VGIT
-                        "municipal_bonds": Decimal("3.5"),  # VTEB (tax-exempt)
-                        # Cash & Other
-                        "cash": Decimal("3.5"),  # VMFXX
-                        "other": Decimal("5.0"),  # Default assumption
-                    }
-                    blended = Decimal("0")
-                    for key, pct in allocation.items():
-                        if key in returns:
-                            blended += Decimal(str(pct)) * returns[key] / Decimal("100")
-                    return blended if blended > 0 else Decimal("6.0")
-            return Decimal("6.0")  # Default
-
-    def _calculate_federal_tax(self, taxable_income: Decimal, filing_status: str) -> Decimal:
-        """Calculate federal income tax based on 2024 brackets."""
+    def _get_annual_returns(
+        self, scenario, n_years: int, start_age: int | None = None
+    ) -> list[Decimal]:
+        """Expected annual return (percent) for each projection year."""
+        return [
+            Decimal(str(round(float(r), 10)))
+            for r in expected_return_path(scenario, n_years, start_age)
+        ]
+
+    def _split_withdrawal(
+        self,
+        strategy,
+        balances: dict[str, Decimal],
+        amount: Decimal,
+        base_income: Decimal,
+    ) -> tuple[Decimal, Decimal, Decimal, Decimal]:
+        """Pretax, Roth, taxable and cash parts of a withdrawal under a strategy."""
+        account_balances = np.array([[float(balances[bucket]) for bucket in BUCKETS]])
+        split = strategy.withdraw(
+            account_balances, np.array([float(amount)]), np.array([float(base_income)])
+        )[0]
+        return tuple(
+            min(Decimal(str(round(float(value), 2))), balances[bucket])
+            for bucket, value in zip(BUCKETS, split)
+        )
+
+    def _lot_gains(self, lot_basis: LotBasis, amount: Decimal, balance: Decimal) -> Decimal:
+        """Gain on selling amount out of the taxable balance, relieved lot by lot."""
+        gains = lot_basis.gains(np.array([float(amount)]), np.array([float(balance)]))[0]
+        return Decimal(str(round(float(gains), 2)))
+
+    def _calculate_federal_tax(
+        self,
+        taxable_income: Decimal,
+        filing_status: str,
+        capital_gains: Decimal = Decimal("0"),
+        magi: Decimal | None = None,
+    ) -> Decimal:
+        """
+        Calculate federal income tax based on 2024 brackets.
+
+        Long-term capital_gains included in taxable_income are stacked on top
+        of the ordinary income and taxed at capital gains rates instead.
+        """
         if taxable_income <= 0:
             return Decimal("0")
 
-        # 2024 Federal Tax Brackets
-        if filing_status == "married_filing_jointly":
-            brackets = [
-                (Decimal("23200"), Decimal("0.10")),
-                (Decimal("94300"), Decimal("0.12")),
-                (Decimal("201050"), Decimal("0.22")),
-                (Decimal("383900"), Decimal("0.24")),
-                (Decimal("487450"), Decimal("0.32")),
-                (Decimal("731200"), Decimal("0.35")),
-                (Decimal("999999999"), Decimal("0.37")),
-            ]
-        elif filing_status == "single":
-            brackets = [
-                (Decimal("11600"), Decimal("0.10")),
-                (Decimal("47150"), Decimal("0.12")),
-                (Decimal("100525"), Decimal("0.22")),
-                (Decimal("191950"), Decimal("0.24")),
-                (Decimal("243725"), Decimal("0.32")),
-                (Decimal("609350"), Decimal("0.35")),
-                (Decimal("999999999"), Decimal("0.37")),
-            ]
-        else:  # head_of_household or default
-            brackets = [
-                (Decimal("16550"), Decimal("0.10")),
-                (Decimal("63100"), Decimal("0.12")),
-                (Decimal("100500"), Decimal("0.22")),
-                (Decimal("191950"), Decimal("0.24")),
-                (Decimal("243700"), Decimal("0.32")),
-                (Decimal("609350"), Decimal("0.35")),
-                (Decimal("999999999"), Decimal("0.37")),
-            ]
+        brackets = [
+            (Decimal(limit), Decimal(rate)) for limit, rate in federal_brackets(filing_status)
+        ]
 
+        ordinary_income = max(Decimal("0"), taxable_income - capital_gains)
         tax = Decimal("0")
-        remaining_income = taxable_income
+        if ordinary_income < taxable_income:
+            tax += self._calculate_capital_gains_tax(
+                ordinary_income,
+                taxable_income - ordinary_income,
+                taxable_income if magi is None else magi,
+                filing_status,
+            )
+        remaining_income = ordinary_income
         prev_bracket = Decimal("0")
 
         for bracket_limit, rate in brackets:
@@ -1055,6 +1373,26 @@ class RetirementScenarioService:
 
         return tax
 
+    def _calculate_capital_gains_tax(
+        self, ordinary_income: Decimal, gains: Decimal, magi: Decimal, filing_status: str
+    ) -> Decimal:
+        """
+        Tax on gains above ordinary taxable income (0/15/20%), plus NIIT over
+        the MAGI threshold.
+        """
+        tax = Decimal("0")
+        prev_bracket = Decimal("0")
+        for limit, rate in capital_gains_brackets(filing_status):
+            bracket_limit = Decimal(limit)
+            taxed = min(ordinary_income + gains, bracket_limit) - max(ordinary_income, prev_bracket)
+            if taxed > 0:
+                tax += taxed * Decimal(rate)
+            prev_bracket = bracket_limit
+
+        niit_rate, niit_threshold = net_investment_income_tax(filing_status)
+        investment_income_taxed = min(gains, max(Decimal("0"), magi - Decimal(niit_threshold)))
+        return tax + investment_income_taxed * Decimal(niit_rate)
+
     def _calculate_ss_income(
         self,
         birth_date: date,
@@ -1066,17 +1404,7 @@ class RetirementScenarioService:
         inflation_rate: Decimal = Decimal("2.5"),
     ) -> Decimal:
         """Calculate Social Security income for a given year with COLA adjustments."""
-        # Calculate the date when SS starts
-        ss_start_date = date(
-            birth_date.year + ss_start_age_years,
-            birth_date.month + ss_start_age_months,
-            birth_date.day,
-        )
-        # Adjust for month overflow
-        while ss_start_date.month > 12:
-            ss_start_date = date(
-                ss_start_date.year + 1, ss_start_date.month - 12, min(ss_start_date.day, 28)
-            )
+        ss_start_date = self._ss_start_date(birth_date, ss_start_age_years, ss_start_age_months)
 
         # Calculate FRA age (simplified - assume 67 for most)
         fra_age = 67
@@ -1132,13 +1460,78 @@ class RetirementScenarioService:
             # Full year of SS
             return monthly_ss * Decimal("12")
 
-    def _calculate_other_income(self, other_income_service, calendar_year: int) -> Decimal:
+    def _ss_start_date(
+        self, birth_date: date, ss_start_age_years: int, ss_start_age_months: int
+    ) -> date:
+        """Date Social Security benefits start."""
+        ss_start_date = date(
+            birth_date.year + ss_start_age_years,
+            birth_date.month + ss_start_age_months,
+            birth_date.day,
+        )
+        # Adjust for month overflow
+        while ss_start_date.month > 12:
+            ss_start_date = date(
+                ss_start_date.year + 1, ss_start_date.month - 12, min(ss_start_date.day, 28)
+            )
+        return ss_start_date
+
+    def _calculate_other_income(
+        self, other_income_service, calendar_year: int, incomes=None
+    ) -> Decimal:
         """Calculate other income for a given year."""
         try:
-            total = Decimal("0")
-            for month in range(1, 13):
-                monthly = other_income_service.get_total_monthly_income(calendar_year, month)
-                total += monthly
-            return total
+            return other_income_service.get_total_annual_income(calendar_year, incomes)
         except Exception:
             return Decimal("0")
+
+
+def refresh_outcomes_in_background(
+    session_factory: sessionmaker, scenario_ids: list[UUID] | None = None
+) -> None:
+    """
+    Refresh cached outcomes after the request has ended, in a session of
+    its own from session_factory (see get_session_factory).
+    """
+    with session_factory() as db:
+        RetirementScenarioService(db).refresh_outcomes(scenario_ids)
+
+
+async def list_scenarios_async(
+    db: AsyncSession,
+    limit: int | None = None,
+    cursor: str | None = None,
+    summary: bool = False,
+    outcome: ScenarioOutcomeFilter | None = None,
+) -> tuple[list[SavedScenarioSchema] | list[SavedScenarioSummary], str | None]:
+    """RetirementScenarioService.list_scenarios on an async session."""
+    after = _decode_cursor(cursor) if cursor else None
+    scenarios = await AsyncScenarioRepository(db).get_page(
+        limit, after, summary=summary, outcome=outcome
+    )
+    return _scenario_page(scenarios, limit, summary)
+
+
+def _scenario_page(
+    scenarios: list[SavedScenario], limit: int | None, summary: bool
+) -> tuple[list[SavedScenarioSchema] | list[SavedScenarioSummary], str | None]:
+    """Schemas of a page of scenarios and the cursor of the next page."""
+    schema = SavedScenarioSummary if summary else SavedScenarioSchema
+    next_cursor = None
+    if limit is not None and len(scenarios) == limit:
+        next_cursor = _encode_cursor(scenarios[-1].updated_at, scenarios[-1].id)
+    return [schema.model_validate(s) for s in scenarios], next_cursor
+
+
+def _encode_cursor(updated_at: datetime, scenario_id: UUID) -> str:
+    """Opaque keyset cursor for the position after a scenario."""
+    return urlsafe_b64encode(f"{updated_at.isoformat()}|{scenario_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """(updated_at, id) of a keyset cursor."""
+    try:
+        updated_at, scenario_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(updated_at), UUID(scenario_id)
+    except ValueError:
+        raise ValueError("Invalid cursor")
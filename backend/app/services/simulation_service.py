@@ -0,0 +1,416 @@
+"""Monte Carlo simulation of retirement scenarios."""
+
+import secrets
+from dataclasses import replace
+from decimal import Decimal
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.engine.buckets import BucketPlan, segment_allocation_matrix, segment_expected_returns
+from app.engine.glide_path import allocation_matrix, expected_return_path
+from app.engine.inflation import InflationIndexing
+from app.engine.mortality import Life
+from app.engine.parallel import ResultBuffers, SimulationJob, execute_job
+from app.engine.path_library import get_path_library
+from app.engine.return_model import get_return_model
+from app.engine.rmd import rmd_fractions
+from app.engine.simulation import BUCKETS, PathInputs, score_results, simulate_paths
+from app.engine.spending import scenario_spending_policy
+from app.engine.tax import IncomeTaxSchedule
+from app.engine.withdrawal import STRATEGIES, StrategyStack, get_strategy
+from app.schemas.scenario import (
+    SavedScenarioCreate,
+    SimulationResult,
+    SimulationYearBand,
+    WithdrawalStrategyComparison,
+    WithdrawalStrategyOutcome,
+)
+from app.services.projection_context import CashFlowSchedule, ProjectionContext
+from app.services.retirement_scenario_service import RetirementScenarioService
+from app.utils.cancellation import CancellationToken
+
+DEFAULT_PATHS = 5000
+MAX_PATHS = 100000
+
+# Paths per strategy when comparing withdrawal strategies (every strategy runs them all)
+DEFAULT_STRATEGY_PATHS = 1000
+MAX_STRATEGY_PATHS = 20000
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class SimulationService:
+    """Service for Monte Carlo simulation of retirement scenarios."""
+
+    def __init__(self, db: Session):
+        """Initialize service with database session."""
+        self.db = db
+        self.scenario_service = RetirementScenarioService(db)
+
+    def build_path_inputs(
+        self, context: ProjectionContext, schedule: CashFlowSchedule
+    ) -> PathInputs:
+        """Convert a projection context and its cash-flow schedule to kernel inputs."""
+        spending = [
+            (variable + fixed) * Decimal("12") + lump
+            for variable, fixed, lump in zip(
+                schedule.variable_monthly, schedule.fixed_monthly, schedule.annual_lump
+            )
+        ]
+        buckets = context.scenario.bucket_strategy
+        bucket_plan = (
+            BucketPlan(buckets.cash_years, buckets.balanced_years) if buckets is not None else None
+        )
+        inflation_indexing = InflationIndexing(
+            rate=float(context.scenario.inflation_rate) / 100,
+            spending=np.array(
+                [
+                    variable * Decimal("12") + lump
+                    for variable, lump in zip(schedule.variable_monthly, schedule.annual_lump)
+                ],
+                dtype=np.float64,
+            ),
+            ss_start=schedule.ss_cola_start,
+            other_income=np.array(schedule.cola_income, dtype=np.float64).reshape(
+                len(schedule.cola_income), schedule.years
+            ),
+            other_starts=np.array(schedule.cola_income_starts, dtype=np.int64),
+        )
+        return PathInputs(
+            balances=np.array([float(context.account_balances[b]) for b in BUCKETS]),
+            taxable_cost_basis=float(context.account_cost_basis["taxable"]),
+            ss_income=np.array(schedule.ss_income, dtype=np.float64),
+            other_income=np.array(schedule.other_income, dtype=np.float64),
+            spending=np.array(spending, dtype=np.float64),
+            deductions=float(context.total_deductions),
+            tax_schedule=IncomeTaxSchedule(context.filing_status),
+            variable_spending=np.array(
+                [variable * Decimal("12") for variable in schedule.variable_monthly],
+                dtype=np.float64,
+            ),
+            spending_policy=scenario_spending_policy(context.scenario),
+            bucket_plan=bucket_plan,
+            withdrawal_strategy=get_strategy(context.scenario.withdrawal_strategy),
+            rmd_fractions=rmd_fractions(schedule.calendar_years, context.birth_date),
+            relief_curve=context.relief_curve(),
+            inflation_indexing=inflation_indexing,
+        )
+
+    def build_job(
+        self,
+        context: ProjectionContext,
+        schedule: CashFlowSchedule,
+        inputs: PathInputs,
+        n_paths: int,
+        seed: int | None,
+        stochastic_inflation: bool = False,
+    ) -> tuple[SimulationJob, float, float]:
+        """
+        Simulation job for a scenario, with its headline expected return and volatility.
+
+        Without a seed, the first library seed is used if there is a library,
+        otherwise a random one. With stochastic inflation, each path's
+        inflation is drawn with its returns and centred on the scenario's rate.
+        """
+        # Serve paths from the precomputed library when it covers the request
+        library = get_path_library()
+        if seed is None:
+            seed = library.seeds[0] if library else secrets.randbits(32)
+        use_library = library is not None and library.covers(seed, n_paths, schedule.years)
+
+        # Per-year weights and expected returns follow the glide path, if any
+        model = get_return_model()
+        scenario = context.scenario
+        asset_weights = allocation_matrix(
+            scenario.asset_allocation, scenario.glide_path, schedule.years, context.current_age
+        )
+        weights = model.series_weights(asset_weights / 100.0)
+        expected_return = expected_return_path(scenario, schedule.years, context.current_age) / 100
+        portfolio_weights = weights
+        if inputs.bucket_plan is not None:
+            # Bucket segments have fixed mixes of their own, in place of the allocation
+            weights = model.series_weights(segment_allocation_matrix() / 100.0)
+            expected_return = segment_expected_returns() / 100.0
+            initial = inputs.initial_segment_fractions()
+            portfolio_weights = initial @ weights
+            job_expected_return = float(initial @ expected_return)
+        else:
+            job_expected_return = float(np.mean(expected_return))
+        job = SimulationJob(
+            inputs=inputs,
+            weights=weights,
+            expected_return=expected_return,
+            seed=seed,
+            n_paths=n_paths,
+            library_dir=str(library.directory) if use_library else None,
+            expected_inflation=(
+                float(scenario.inflation_rate) / 100 if stochastic_inflation else None
+            ),
+        )
+        return job, job_expected_return, model.portfolio_volatility(portfolio_weights)
+
+    def run_simulation(
+        self,
+        scenario_id: UUID | None = None,
+        scenario_data: SavedScenarioCreate | None = None,
+        n_paths: int = DEFAULT_PATHS,
+        seed: int | None = None,
+        mortality: str | None = None,
+        sex: str = "unisex",
+        spouse_sex: str = "unisex",
+        inflation: str = "fixed",
+        cancel_token: CancellationToken | None = None,
+    ) -> SimulationResult:
+        """
+        Simulate a scenario over correlated random return paths.
+
+        Cash flows and taxes follow the deterministic projection; only the
+        annual returns vary. The return distribution is centred on the
+        scenario's expected return, with volatility and correlation estimated
+        from the historical series for the scenario's asset allocation. With a
+        bucket strategy each segment is simulated with its own mix instead.
+
+        With stochastic inflation, each path also draws an inflation series
+        jointly with its returns (historical rows from the path library, or
+        a fitted AR(1) when sampling), and inflation-linked spending, Social
+        Security and other-income COLAs follow it.
+
+        With mortality, each path also gets a sampled death year for the
+        person (single) or the last survivor of the couple (joint), and the
+        result reports how often the money runs out while someone is alive.
+        """
+        if n_paths < 1 or n_paths > MAX_PATHS:
+            raise ValueError(f"n_paths must be between 1 and {MAX_PATHS}")
+        if inflation not in ("fixed", "stochastic"):
+            raise ValueError(f"Unknown inflation model: {inflation}")
+
+        context = self.scenario_service.load_projection_context(scenario_id, scenario_data)
+        schedule = self.scenario_service.build_cash_flow_schedule(context)
+        inputs = self.build_path_inputs(context, schedule)
+        lives = self._lives(context, mortality, sex, spouse_sex)
+
+        job, expected_return, volatility = self.build_job(
+            context, schedule, inputs, n_paths, seed, stochastic_inflation=inflation == "stochastic"
+        )
+        seed = job.seed
+        death_year = job.death_years(lives) if lives else None
+
+        # Large runs go to the worker pool, which writes results into shared memory
+        workers = settings.simulation_workers
+        parallel = workers > 0 and n_paths >= settings.simulation_parallel_min_paths
+        with ResultBuffers(n_paths, schedule.years, shared=parallel) as buffers:
+            execute_job(job, buffers, workers=workers if parallel else 0, cancel_token=cancel_token)
+            result = self._summarize(
+                context,
+                schedule,
+                buffers.ending_balance,
+                buffers.depletion_year,
+                buffers.spending,
+                n_paths=n_paths,
+                seed=seed,
+                path_source="sampled" if job.library_dir is None else "library",
+                expected_return=expected_return,
+                volatility=volatility,
+                inflation=inflation,
+                mortality=mortality,
+                death_year=death_year,
+            )
+        # Only the default model is comparable across scenarios in outcome searches
+        if (
+            context.scenario_id is not None
+            and n_paths == DEFAULT_PATHS
+            and mortality is None
+            and inflation == "fixed"
+        ):
+            self.scenario_service.repository.record_success_probability(
+                context.scenario_id, context.input_hash(), result.success_probability
+            )
+        return result
+
+    def _lives(
+        self, context: ProjectionContext, mortality: str | None, sex: str, spouse_sex: str
+    ) -> list[Life]:
+        """Lives whose death ends the plan: none, the person, or the person and spouse."""
+        if mortality is None:
+            return []
+        lives = [Life(sex, context.current_age)]
+        if mortality == "joint":
+            if context.spouse_age is None:
+                raise ValueError(
+                    "Spouse age required for joint mortality - configure in Tax Configuration page"
+                )
+            lives.append(Life(spouse_sex, context.spouse_age))
+        elif mortality != "single":
+            raise ValueError(f"Unknown mortality: {mortality}")
+        return lives
+
+    def compare_withdrawal_strategies(
+        self,
+        scenario_id: UUID,
+        rank_by: str = "after_tax_wealth",
+        n_paths: int = DEFAULT_STRATEGY_PATHS,
+        seed: int | None = None,
+        pretax_tax_rate: float = 0.22,
+        cancel_token: CancellationToken | None = None,
+    ) -> WithdrawalStrategyComparison:
+        """
+        Evaluate every withdrawal strategy for a scenario and rank them.
+
+        The context and cash flows are loaded once and strategies are stacked
+        as blocks of kernel rows: one row each along the expected-return path
+        for taxes and terminal wealth, then strategies x paths over the same
+        simulated paths for the probability of success.
+        """
+        if n_paths < 0 or n_paths > MAX_STRATEGY_PATHS:
+            raise ValueError(f"n_paths must be between 0 and {MAX_STRATEGY_PATHS}")
+
+        context = self.scenario_service.load_projection_context(scenario_id)
+        schedule = self.scenario_service.build_cash_flow_schedule(context)
+        inputs = self.build_path_inputs(context, schedule)
+        strategies = list(STRATEGIES.values())
+        n_strategies = len(strategies)
+
+        expected = replace(
+            inputs,
+            bucket_plan=None,
+            withdrawal_strategy=StrategyStack(strategies, 1, inputs.tax_schedule),
+        )
+        annual_returns = expected_return_path(context.scenario, schedule.years, context.current_age)
+        results = simulate_paths(
+            expected, np.broadcast_to(annual_returns / 100, (n_strategies, schedule.years))
+        )
+
+        success = None
+        if n_paths:
+            job, _, _ = self.build_job(context, schedule, inputs, n_paths, seed)
+            seed = job.seed
+            funded = np.zeros(n_strategies)
+            for index, start, size in job.chunks():
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                returns = job.returns(index, start, size)
+                stacked = replace(
+                    inputs,
+                    withdrawal_strategy=StrategyStack(strategies, size, inputs.tax_schedule),
+                )
+                chunk = simulate_paths(stacked, np.concatenate([returns] * n_strategies))
+                funded += chunk.success.reshape(n_strategies, size).sum(axis=1)
+            success = funded / n_paths
+
+        after_tax = score_results(results, "after_tax_wealth", pretax_tax_rate)
+        lifetime_tax = -score_results(results, "lifetime_tax", pretax_tax_rate)
+        lasts = np.where(results.depletion_year == 0, schedule.years + 1, results.depletion_year)
+        if rank_by == "depletion_year":
+            ranking = np.lexsort((-after_tax, -lasts))
+        else:
+            objective = after_tax if rank_by == "after_tax_wealth" else -lifetime_tax
+            ranking = np.lexsort((-lasts, -objective))
+
+        return WithdrawalStrategyComparison(
+            scenario_id=context.scenario_id,
+            scenario_name=context.scenario.name,
+            rank_by=rank_by,
+            n_paths=n_paths,
+            seed=seed if n_paths else None,
+            strategies=[
+                WithdrawalStrategyOutcome(
+                    strategy=strategies[i].name,
+                    rank=rank + 1,
+                    lifetime_tax=_money(lifetime_tax[i]),
+                    after_tax_terminal_wealth=_money(after_tax[i]),
+                    final_portfolio=_money(results.final_balances[i].sum()),
+                    years_until_depletion=int(results.depletion_year[i]) or None,
+                    success_probability=None if success is None else _fraction(success[i]),
+                )
+                for rank, i in enumerate(ranking)
+            ],
+        )
+
+    def _summarize(
+        self,
+        context: ProjectionContext,
+        schedule: CashFlowSchedule,
+        ending_balance: np.ndarray,
+        depletion_year: np.ndarray,
+        spending: np.ndarray,
+        n_paths: int,
+        seed: int,
+        path_source: str,
+        expected_return: float,
+        volatility: float,
+        inflation: str = "fixed",
+        mortality: str | None = None,
+        death_year: np.ndarray | None = None,
+    ) -> SimulationResult:
+        """Reduce per-path results to percentile bands and success metrics."""
+
+        bands = np.percentile(ending_balance, PERCENTILES, axis=0)
+        spending_bands = np.percentile(spending, (10, 50, 90), axis=0)
+        # A path is funded in year y if it has not failed in any year up to y
+        year_numbers = np.arange(1, schedule.years + 1)
+        failed_by_year = (depletion_year[:, None] > 0) & (depletion_year[:, None] <= year_numbers)
+        funded = 1.0 - failed_by_year.mean(axis=0)
+
+        failed = depletion_year[depletion_year > 0]
+        median_depletion = int(np.median(failed)) if len(failed) else None
+
+        survival = outliving = None
+        if death_year is not None:
+            # Paths with death_year 0 are alive past the horizon
+            died_by_year = (death_year[:, None] > 0) & (death_year[:, None] <= year_numbers)
+            survival = 1.0 - died_by_year.mean(axis=0)
+            alive_at_depletion = (death_year == 0) | (depletion_year <= death_year)
+            outliving = float(np.mean((depletion_year > 0) & alive_at_depletion))
+
+        years = [
+            SimulationYearBand(
+                year=i + 1,
+                calendar_year=schedule.calendar_years[i],
+                age=schedule.ages[i],
+                p10_balance=_money(bands[0, i]),
+                p25_balance=_money(bands[1, i]),
+                p50_balance=_money(bands[2, i]),
+                p75_balance=_money(bands[3, i]),
+                p90_balance=_money(bands[4, i]),
+                p10_spending=_money(spending_bands[0, i]),
+                p50_spending=_money(spending_bands[1, i]),
+                p90_spending=_money(spending_bands[2, i]),
+                funded_probability=_fraction(funded[i]),
+                survival_probability=None if survival is None else _fraction(survival[i]),
+            )
+            for i in range(schedule.years)
+        ]
+
+        return SimulationResult(
+            scenario_id=context.scenario_id,
+            scenario_name=context.scenario.name,
+            n_paths=n_paths,
+            seed=seed,
+            path_source=path_source,
+            success_probability=_fraction(np.mean(depletion_year == 0)),
+            median_final_portfolio=(
+                _money(np.median(ending_balance[:, -1]))
+                if schedule.years
+                else context.initial_portfolio
+            ),
+            median_depletion_year=median_depletion,
+            expected_return_percent=_money(expected_return * 100),
+            volatility_percent=_money(volatility * 100),
+            inflation=inflation,
+            mortality=mortality if death_year is not None else None,
+            probability_outliving_assets=None if outliving is None else _fraction(outliving),
+            years=years,
+        )
+
+
+def _money(value: float) -> Decimal:
+    """Round a float amount to cents."""
+    return Decimal(str(round(float(value), 2)))
+
+
+def _fraction(value: float) -> Decimal:
+    """Round a probability to four decimal places."""
+    return Decimal(str(round(float(value), 4)))
@@ -0,0 +1,52 @@
+"""Service for tax lot business logic."""
+
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.repositories.holding_repository import HoldingRepository
+from app.repositories.tax_lot_repository import TaxLotRepository
+from app.schemas.tax_lot import TaxLot, TaxLotCreate, TaxLotUpdate
+
+
+class TaxLotService:
+    """Service for tax lot operations."""
+
+    def __init__(self, db: Session):
+        """Initialize service with database session."""
+        self.db = db
+        self.repository = TaxLotRepository(db)
+        self.holding_repository = HoldingRepository(db)
+
+    def get_lots_by_holding(self, holding_id: UUID) -> list[TaxLot]:
+        """Get all lots of a holding."""
+        lots = self.repository.get_by_holding(holding_id)
+        return [TaxLot.model_validate(lot) for lot in lots]
+
+    def get_lot_by_id(self, lot_id: UUID) -> TaxLot | None:
+        """Get tax lot by ID."""
+        lot = self.repository.get_by_id(lot_id)
+        if not lot:
+            return None
+        return TaxLot.model_validate(lot)
+
+    def create_lot(self, lot_data: TaxLotCreate) -> TaxLot:
+        """Create a new tax lot."""
+        # Verify holding exists
+        holding = self.holding_repository.get_by_id(lot_data.holding_id)
+        if not holding:
+            raise ValueError(f"Holding {lot_data.holding_id} not found")
+
+        lot = self.repository.create(lot_data)
+        return TaxLot.model_validate(lot)
+
+    def update_lot(self, lot_id: UUID, lot_data: TaxLotUpdate) -> TaxLot | None:
+        """Update an existing tax lot."""
+        lot = self.repository.update(lot_id, lot_data)
+        if not lot:
+            return None
+        return TaxLot.model_validate(lot)
+
+    def delete_lot(self, lot_id: UUID) -> bool:
+        """Delete a tax lot."""
+        return self.repository.delete(lot_id)
@@ -0,0 +1,75 @@
+"""Cooperative cancellation for long-running computations."""
+
+import threading
+
+
+class OperationCancelledError(Exception):
+    """Raised at a cancellation checkpoint after the operation was cancelled."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Operation cancelled: {reason}")
+        self.reason = reason
+
+
+class CancellationToken:
+    """
+    Flag shared between a request and the computation it started.
+
+    Heavy computations call raise_if_cancelled() between units of work
+    (projection years, compared scenarios, simulation chunks) so an abandoned
+    request stops consuming CPU at the next checkpoint.
+    """
+
+    def __init__(self):
+        """Initialize an uncancelled token."""
+        self._event = threading.Event()
+        self.reason: str | None = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Request cancellation. Only the first reason is kept."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        """Cancellation checkpoint."""
+        if self._event.is_set():
+            raise OperationCancelledError(self.reason or "cancelled")
+
+
+class SupersessionRegistry:
+    """
+    Tracks the latest in-flight token per (session key, operation).
+
+    Registering a new token cancels the previous one for the same key, so only
+    the most recent request from a client session keeps running.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._latest: dict[tuple[str, str], CancellationToken] = {}
+
+    def register(self, session_key: str, operation: str) -> CancellationToken:
+        """Create the token for a new request, superseding any older one."""
+        token = CancellationToken()
+        with self._lock:
+            previous = self._latest.get((session_key, operation))
+            self._latest[(session_key, operation)] = token
+        if previous is not None:
+            previous.cancel("superseded")
+        return token
+
+    def release(self, session_key: str, operation: str, token: CancellationToken) -> None:
+        """Forget a finished request's token if it is still the latest."""
+        with self._lock:
+            if self._latest.get((session_key, operation)) is token:
+                del self._latest[(session_key, operation)]
+
+
+supersession_registry = SupersessionRegistry()
@@ -0,0 +1,35 @@
+"""Canonical hashing of computation inputs."""
+
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+def _canonical_default(value):
+    """JSON encoder for the non-JSON types that appear in projection inputs."""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Decimal):
+        # Normalize so 2.5 and 2.50 hash identically
+        return format(value.normalize(), "f")
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Enum)):
+        return str(value.value if isinstance(value, Enum) else value)
+    raise TypeError(f"Cannot hash value of type {type(value).__name__}")
+
+
+def canonical_input_hash(payload) -> str:
+    """
+    Return a stable SHA-256 hex digest of a JSON-like payload.
+
+    Keys are sorted and Decimals normalized, so logically identical inputs
+    produce the same hash regardless of dict ordering or number formatting.
+    """
+    encoded = json.dumps(payload, default=_canonical_default, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
@@ -0,0 +1,100 @@
+"""Connection pool wait metrics and idle-connection pre-ping."""
+
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Checkout counters of one pool; wait is the time connect() takes to hand out a connection."""
+
+    def __init__(self):
+        """Initialize zeroed counters."""
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        """Count one checkout (or timed-out attempt) that waited this long."""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def snapshot(self) -> dict:
+        """Counters as plain values."""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds, 6),
+                "wait_seconds_mean": round(self.wait_seconds / attempts, 6) if attempts else 0.0,
+                "wait_seconds_max": round(self.max_wait_seconds, 6),
+            }
+
+
+class _TimedPool:
+    """Pool mixin timing every checkout into self.metrics."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the pool with zeroed metrics."""
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        """Check out a connection, recording how long it took."""
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        """Recreate the pool (after dispose), keeping its counters."""
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedPool, QueuePool):
+    """QueuePool with checkout metrics."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout metrics."""
+
+
+def ping_when_idle(engine: Engine, idle_seconds: float) -> None:
+    """
+    Ping connections on checkout only if they sat in the pool at least idle_seconds.
+
+    A failed ping raises DisconnectionError, so the pool discards the
+    connection and checks out another, as pool_pre_ping does on every checkout.
+    """
+    dialect = engine.dialect
+
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            dialect.do_ping(dbapi_connection)
+        except Exception:
+            raise exc.DisconnectionError("Idle connection failed its pre-ping")
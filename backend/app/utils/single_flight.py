@@ -0,0 +1,82 @@
+"""Single-flight coalescing of concurrent identical computations."""
+
+import threading
+from typing import Callable, TypeVar
+
+from app.utils.cancellation import CancellationToken, OperationCancelledError
+
+T = TypeVar("T")
+
+WAIT_POLL_SECONDS = 0.1
+
+
+class _Flight:
+    """A computation in progress and its eventual outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait and receive the same result or exception.
+    Nothing is cached once the flight lands, so later calls recompute.
+    """
+
+    def __init__(self):
+        """Initialize with no flights in progress."""
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], T],
+        cancel_token: CancellationToken | None = None,
+    ) -> T:
+        """
+        Run fn for key, or wait for the in-flight run with the same key.
+
+        If the leader is cancelled (its client went away), waiting callers
+        retry and one of them becomes the new leader. A waiter's own
+        cancel_token is honoured while it waits.
+        """
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                is_leader = flight is None
+                if is_leader:
+                    flight = _Flight()
+                    self._flights[key] = flight
+
+            if is_leader:
+                try:
+                    flight.result = fn()
+                    return flight.result
+                except BaseException as e:
+                    flight.error = e
+                    raise
+                finally:
+                    with self._lock:
+                        del self._flights[key]
+                    flight.done.set()
+
+            while not flight.done.wait(WAIT_POLL_SECONDS):
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+
+            if isinstance(flight.error, OperationCancelledError):
+                continue
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        with self._lock:
+            return len(self._flights)
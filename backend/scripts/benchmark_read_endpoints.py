@@ -0,0 +1,116 @@
+"""Benchmark concurrent throughput of the read-only API endpoints.
+
+Fires many concurrent GET requests at the app in-process (no network) and
+reports requests per second and latency per endpoint, so sync and async
+database paths can be compared under the same load. Uses the database in
+DATABASE_URL; --seed first fills it with accounts, holdings and scenarios.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app.schemas.account import AccountCreate
+from app.schemas.holding import HoldingCreate
+from app.schemas.scenario import SavedScenarioCreate
+from app.services.account_service import AccountService
+from app.services.holding_service import HoldingService
+from app.services.retirement_scenario_service import RetirementScenarioService
+
+ENDPOINTS = (
+    "/accounts",
+    "/holdings",
+    "/saved-scenarios?fields=summary&limit=50",
+    "/social-security",
+    "/tax-config",
+    "/planned-spending",
+    "/tax-tables/us-federal",
+)
+
+
+def _seed(accounts: int, scenarios: int) -> None:
+    """Add accounts with two holdings each, and scenarios."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        account_service = AccountService(db)
+        holding_service = HoldingService(db)
+        for i in range(accounts):
+            account = account_service.create_account(
+                AccountCreate(name=f"Bench {i}", account_type="taxable", balance=Decimal("1000"))
+            )
+            for asset_class in ("total_us_stock", "bonds"):
+                holding_service.create_holding(
+                    HoldingCreate(
+                        account_id=account.id, asset_class=asset_class, amount=Decimal("500")
+                    )
+                )
+        scenario_service = RetirementScenarioService(db)
+        for i in range(scenarios):
+            scenario_service.create_scenario(SavedScenarioCreate(name=f"Bench {i}"))
+    finally:
+        db.close()
+
+
+async def _run(client: httpx.AsyncClient, path: str, requests: int, concurrency: int):
+    """Wall time and per-request latencies of requests GETs, concurrency at a time."""
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    await client.get(path)  # warm up
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - started, latencies
+
+
+async def _run_all(requests: int, concurrency: int) -> None:
+    """Benchmark each endpoint in turn on one event loop (the async pool is bound to it)."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint in ENDPOINTS:
+            elapsed, latencies = await _run(client, f"/api/v1{endpoint}", requests, concurrency)
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            print(
+                f"  {endpoint:44s} {requests / elapsed:8.0f} req/s"
+                f"  p50 {p50:7.1f} ms  p99 {p99:7.1f} ms"
+            )
+
+
+def main():
+    """Benchmark each read endpoint and print throughput and latency."""
+    parser = argparse.ArgumentParser(description="Benchmark read endpoint throughput")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--seed", action="store_true", help="Add benchmark data first")
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--scenarios", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.seed:
+        _seed(args.accounts, args.scenarios)
+
+    print(f"{args.requests:,} requests per endpoint, {args.concurrency} concurrent")
+    asyncio.run(_run_all(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark result transfer from process-pool simulation workers.
+
+Compares workers that pickle their per-path results back through the pool's
+result queue with workers that write into shared-memory buffers, using the
+same job, chunking and worker count. No database is needed.
+"""
+
+import argparse
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import multiprocessing
+
+import numpy as np
+
+from app.engine.parallel import ResultBuffers, SimulationJob, execute_job, get_worker_pool
+from app.engine.return_model import get_return_model
+from app.engine.simulation import PathInputs, simulate_paths
+from app.engine.tax import IncomeTaxSchedule
+
+
+def _simulate_chunk_pickled(job: SimulationJob, index: int, start: int, size: int):
+    """Pool task returning the chunk's result arrays through the result queue."""
+    results = simulate_paths(job.inputs, job.returns(index, start, size))
+    return start, results.ending_balance, results.depletion_year, results.spending
+
+
+def _example_job(n_paths: int, n_years: int) -> SimulationJob:
+    """A representative household: mixed buckets, Social Security, MFJ brackets."""
+    model = get_return_model()
+    return SimulationJob(
+        inputs=PathInputs(
+            balances=np.array([1200000.0, 300000.0, 400000.0, 100000.0]),
+            taxable_cost_basis=250000.0,
+            ss_income=np.full(n_years, 42000.0),
+            other_income=np.zeros(n_years),
+            spending=np.full(n_years, 110000.0),
+            deductions=29200.0,
+            tax_schedule=IncomeTaxSchedule("married_filing_jointly"),
+        ),
+        weights=model.allocation_weights({"total_us_stock": 60, "bonds": 40}),
+        expected_return=0.06,
+        seed=1,
+        n_paths=n_paths,
+    )
+
+
+def _run_pickled(job: SimulationJob, workers: int) -> tuple[float, int, np.ndarray]:
+    """Wall time, bytes moved through the result queue, and ending balances."""
+    ending_balance = np.empty((job.n_paths, job.n_years))
+    depletion_year = np.empty(job.n_paths, dtype=np.int32)
+    transferred = 0
+    context = multiprocessing.get_context("forkserver")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        list(pool.map(int, range(workers)))  # warm up workers
+        started = time.perf_counter()
+        futures = [
+            pool.submit(_simulate_chunk_pickled, job, index, start, size)
+            for index, start, size in job.chunks()
+        ]
+        for future in futures:
+            start, balances, depletion, spending = future.result()
+            transferred += len(pickle.dumps((start, balances, depletion, spending), protocol=5))
+            ending_balance[start : start + len(balances)] = balances
+            depletion_year[start : start + len(depletion)] = depletion
+        elapsed = time.perf_counter() - started
+    return elapsed, transferred, ending_balance
+
+
+def _run_shared(job: SimulationJob, workers: int) -> tuple[float, int, np.ndarray]:
+    """Wall time, bytes moved through the result queue, and ending balances."""
+    pool = get_worker_pool(workers)
+    list(pool.map(int, range(workers)))  # warm up workers
+    with ResultBuffers(job.n_paths, job.n_years, shared=True) as buffers:
+        started = time.perf_counter()
+        execute_job(job, buffers, workers=workers)
+        elapsed = time.perf_counter() - started
+        ending_balance = buffers.ending_balance.copy()
+        metadata = len(job.chunks()) * len(pickle.dumps((0, 0), protocol=5))
+    return elapsed, metadata, ending_balance
+
+
+def main():
+    """Run both transfer modes and print a comparison."""
+    parser = argparse.ArgumentParser(description="Benchmark simulation result transfer")
+    parser.add_argument("--paths", type=int, default=100000)
+    parser.add_argument("--years", type=int, default=35)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    job = _example_job(args.paths, args.years)
+    print(f"{args.paths:,} paths x {args.years} years, {args.workers} workers")
+
+    with ResultBuffers(job.n_paths, job.n_years) as buffers:
+        started = time.perf_counter()
+        execute_job(job, buffers)
+        print(f"  in-process          {time.perf_counter() - started:8.3f}s")
+
+    pickled = [_run_pickled(job, args.workers) for _ in range(args.repeat)]
+    shared = [_run_shared(job, args.workers) for _ in range(args.repeat)]
+    np.testing.assert_array_equal(pickled[0][2], shared[0][2])
+
+    best_pickled = min(run[0] for run in pickled)
+    best_shared = min(run[0] for run in shared)
+    print(f"  pickled results     {best_pickled:8.3f}s  {pickled[0][1] / 1e6:10.1f} MB via queue")
+    print(f"  shared memory       {best_shared:8.3f}s  {shared[0][1] / 1e6:10.4f} MB via queue")
+    print(f"  transfer overhead   {best_pickled - best_shared:8.3f}s saved")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 
 from app.database import SessionLocal, engine, Base
 from app.models.account import Account
+from app.repositories.portfolio_snapshot_repository import PortfolioSnapshotRepository
 from app.schemas.account import AccountCreate
 from app.services.account_service import AccountService
 
@@ -103,6 +104,9 @@ def bootstrap_accounts(csv_file: Path = None):
             except Exception as e:
                 print(f"✗ Error creating {account_data['name']}: {e}")
 
+        # Recompute the allocation snapshot, so it also covers rows written outside the API
+        PortfolioSnapshotRepository(db).rebuild()
+
         # Display summary
         if created_accounts:
             total = sum(float(acc.balance) for acc in created_accounts)
@@ -16,6 +16,7 @@ from sqlalchemy.orm import sessionmaker
 from app.database import Base
 from app.models.account import Account
 from app.models.holding import Holding
+from app.repositories.portfolio_snapshot_repository import PortfolioSnapshotRepository
 
 # Database URL - use environment variable or default for Docker
 DATABASE_URL = os.getenv(
@@ -114,7 +115,9 @@ def bootstrap_holdings(clear_existing: bool = True):
                 f"  Added: {h['ticker'] or h['asset_class']} - ${h['amount']:,.2f} to {h['account_name']}"
             )
 
-        session.commit()
+        # Holdings were written directly, so recompute the allocation snapshot
+        # in the same transaction
+        PortfolioSnapshotRepository(session).rebuild()
         print(f"\nBootstrap complete: {created} holdings created, {skipped} skipped")
 
         # Print summary
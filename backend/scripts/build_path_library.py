@@ -0,0 +1,43 @@
+"""Build the precomputed Monte Carlo return-path library."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.engine.path_library import build_path_library, library_is_current
+
+
+def main():
+    """Generate bootstrapped return paths for the configured seeds."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dir", default=settings.path_library_dir, help="Output directory")
+    parser.add_argument(
+        "--seeds", type=int, nargs="+", default=settings.path_library_seeds, help="Seeds to build"
+    )
+    parser.add_argument("--paths", type=int, default=settings.path_library_paths)
+    parser.add_argument("--years", type=int, default=settings.path_library_years)
+    parser.add_argument("--force", action="store_true", help="Rebuild even if up to date")
+    args = parser.parse_args()
+
+    directory = Path(args.dir)
+    if not args.force and library_is_current(directory, args.seeds, args.paths, args.years):
+        print(f"✓ Path library in {directory} is up to date")
+        return
+
+    started = time.perf_counter()
+    manifest = build_path_library(directory, args.seeds, args.paths, args.years)
+    elapsed = time.perf_counter() - started
+    size = sum(f.stat().st_size for f in directory.glob("*.npy"))
+    print(
+        f"✓ Built {len(manifest['seeds'])} seeds x {args.paths:,} paths x {args.years} years "
+        f"in {elapsed:.1f}s ({size / 1e6:,.0f} MB) -> {directory}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,12 @@
 
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
 
-from app.database import Base, get_db
+from app.database import Base, get_async_db, get_db, get_read_db, get_session_factory
 from app.main import app
 
 # Test database (SQLite in-memory for speed)
@@ -14,6 +16,11 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only endpoints use an async session on the same database; TestClient may
+# run each request on a new event loop, so connections are not pooled
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -27,6 +34,13 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="function")
+async def async_db_session(db_session):
+    """Async session on the same fresh database, for the read-only async path."""
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a test client with database override."""
@@ -37,6 +51,14 @@ def client(db_session):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Background tasks open their own sessions on the test database
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
     yield TestClient(app)
     app.dependency_overrides.clear()
@@ -1,5 +1,6 @@
 """Tests for account API endpoints."""
 
+import json
 from decimal import Decimal
 from uuid import uuid4
 
@@ -116,3 +117,94 @@ def test_delete_account(client):
     # Verify deleted
     get_response = client.get(f"/api/v1/accounts/{account_id}")
     assert get_response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_import_accounts_and_holdings(client):
+    """Test bulk imports, the per-row error report and all-or-nothing transactions."""
+    accounts_csv = (
+        "name,account_type,balance\n"
+        "401k,pretax,1000.00\n"
+        "Roth,roth,500.00\n"
+        "Bad,checking,10\n"
+    )
+    response = client.post(
+        "/api/v1/accounts/import", files={"file": ("accounts.csv", accounts_csv, "text/csv")}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["imported"] == 0
+    assert response.json()["errors"][0]["row"] == 3
+    assert client.get("/api/v1/accounts").json() == []
+
+    response = client.post(
+        "/api/v1/accounts/import?partial=true",
+        files={"file": ("accounts.csv", accounts_csv, "text/csv")},
+    )
+    assert response.json()["imported"] == 2
+    assert response.json()["rejected"] == 1
+
+    holdings = [
+        {"account_name": "401k", "asset_class": "total_us_stock", "amount": "600"},
+        {"account_name": "401k", "asset_class": "bonds", "amount": "400", "ticker": "BND"},
+        {"account_name": "Roth", "asset_class": "total_us_stock", "amount": "500"},
+        {"account_name": "Missing", "asset_class": "bonds", "amount": "1"},
+        {"account_name": "Roth", "asset_class": "bonds", "amount": "-1"},
+    ]
+    response = client.post(
+        "/api/v1/holdings/import?partial=true",
+        files={"file": ("holdings.json", json.dumps(holdings), "application/json")},
+    )
+    result = response.json()
+    assert result["imported"] == 3
+    assert [e["row"] for e in result["errors"]] == [4, 5]
+    assert result["errors"][0]["errors"] == ["Account 'Missing' not found"]
+
+    allocation = client.get("/api/v1/holdings/portfolio-allocation").json()
+    assert allocation["total_portfolio_value"] == "1500.00"
+    assert allocation["by_asset_class"] == {"bonds": "400.00", "total_us_stock": "1100.00"}
+
+    response = client.post(
+        "/api/v1/holdings/import", files={"file": ("holdings.json", "{}", "application/json")}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # A name shared by two accounts is ambiguous: those rows must give account_id
+    client.post(
+        "/api/v1/accounts",
+        json={"name": "Roth", "account_type": "roth", "balance": "100.00"},
+    )
+    roth_ids = [a["id"] for a in client.get("/api/v1/accounts").json() if a["name"] == "Roth"]
+    holdings = [
+        {"account_name": "Roth", "asset_class": "cash", "amount": "1"},
+        {"account_id": roth_ids[1], "account_name": "Roth", "asset_class": "cash", "amount": "1"},
+    ]
+    response = client.post(
+        "/api/v1/holdings/import?partial=true",
+        files={"file": ("holdings.json", json.dumps(holdings), "application/json")},
+    )
+    result = response.json()
+    assert result["imported"] == 1
+    assert result["errors"] == [
+        {"row": 1, "errors": ["Account name 'Roth' matches 2 accounts; use account_id"]}
+    ]
+
+
+def test_import_streams_json_uploads(client, monkeypatch):
+    """Test JSON arrays are decoded incrementally, across chunks and insert batches."""
+    monkeypatch.setattr("app.services.import_service.JSON_CHUNK_SIZE", 64)
+    accounts = [
+        {"name": f"Account {i}", "account_type": "taxable", "balance": "10.00"} for i in range(1500)
+    ]
+    upload = json.dumps(accounts, indent=2)
+    response = client.post(
+        "/api/v1/accounts/import", files={"file": ("accounts.json", upload, "application/json")}
+    )
+    assert response.json() == {"imported": 1500, "rejected": 0, "errors": []}
+
+    # A syntax error after the first batch still rolls the whole upload back
+    response = client.post(
+        "/api/v1/accounts/import",
+        files={"file": ("accounts.json", upload[:-1] + ", {]", "application/json")},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"].startswith("Invalid JSON")
+    assert len(client.get("/api/v1/accounts").json()) == 1500
@@ -0,0 +1,65 @@
+"""Tests for cooperative cancellation of heavy computations."""
+
+import pytest
+
+from app.utils.cancellation import (
+    CancellationToken,
+    OperationCancelledError,
+    SupersessionRegistry,
+)
+
+
+def test_token_checkpoint_raises_after_cancel():
+    """Test that a cancelled token raises at the next checkpoint."""
+    token = CancellationToken()
+    token.raise_if_cancelled()
+
+    token.cancel("client disconnected")
+    assert token.cancelled
+    with pytest.raises(OperationCancelledError) as exc_info:
+        token.raise_if_cancelled()
+    assert exc_info.value.reason == "client disconnected"
+
+
+def test_token_keeps_first_reason():
+    """Test that only the first cancellation reason is kept."""
+    token = CancellationToken()
+    token.cancel("superseded")
+    token.cancel("client disconnected")
+    assert token.reason == "superseded"
+
+
+def test_newer_request_supersedes_older():
+    """Test that registering the same session key cancels the previous token."""
+    registry = SupersessionRegistry()
+    first = registry.register("tab-1", "adhoc-projection")
+    second = registry.register("tab-1", "adhoc-projection")
+    other = registry.register("tab-2", "adhoc-projection")
+
+    assert first.cancelled
+    assert first.reason == "superseded"
+    assert not second.cancelled
+    assert not other.cancelled
+
+
+def test_release_of_stale_token_keeps_latest():
+    """Test that releasing a superseded token does not drop the latest one."""
+    registry = SupersessionRegistry()
+    first = registry.register("tab-1", "compare")
+    second = registry.register("tab-1", "compare")
+
+    registry.release("tab-1", "compare", first)
+    third = registry.register("tab-1", "compare")
+    assert second.cancelled
+    assert not third.cancelled
+
+
+def test_adhoc_projection_requires_birth_date(client):
+    """Test that the cancellable projection endpoint still maps errors to 400."""
+    response = client.post(
+        "/api/v1/saved-scenarios/projection",
+        json={"name": "Slider preview"},
+        headers={"X-Session-Key": "tab-1"},
+    )
+    assert response.status_code == 400
+    assert "Birth date required" in response.json()["detail"]
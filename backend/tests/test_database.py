@@ -0,0 +1,83 @@
+"""Tests for engine configuration: statement caching, pool metrics and pre-ping."""
+
+from datetime import datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import event, text
+from sqlalchemy.engine.interfaces import CacheStats
+
+from app import database
+from app.config import settings
+from app.repositories.account_repository import AccountRepository
+from app.repositories.holding_repository import HoldingRepository
+from app.repositories.projection_run_repository import ProjectionRunRepository
+from app.repositories.scenario_repository import ScenarioRepository
+from app.schemas.account import AccountCreate
+from app.schemas.scenario import ScenarioOutcomeFilter
+
+
+def test_repository_queries_reuse_compiled_statements(db_session):
+    """Test repeated repository reads are served from the compiled statement cache."""
+    account = AccountRepository(db_session).create(
+        AccountCreate(name="IRA", account_type="pretax", balance=Decimal("1000"))
+    )
+
+    def reads():
+        AccountRepository(db_session).get_all()
+        AccountRepository(db_session).get_by_id(account.id)
+        AccountRepository(db_session).get_by_ids([account.id, uuid4()])
+        HoldingRepository(db_session).get_by_account(account.id)
+        scenarios = ScenarioRepository(db_session)
+        scenarios.get_page(10, summary=True)
+        scenarios.get_page(
+            10, (datetime.now(), uuid4()), outcome=ScenarioOutcomeFilter(min_final=Decimal("1"))
+        )
+        ProjectionRunRepository(db_session).list_by_scenario(uuid4())
+
+    cache_hits = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, stmt, params, context, many: cache_hits.append(  # noqa: E731
+        context.cache_hit
+    )
+    reads()
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        reads()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert len(cache_hits) == 7
+    assert set(cache_hits) == {CacheStats.CACHE_HIT}
+
+
+def test_pool_records_checkouts_and_pings_idle_connections(tmp_path, monkeypatch):
+    """Test checkout metrics, and that a connection failing its idle ping is replaced."""
+    monkeypatch.setattr(settings, "db_pre_ping", "idle")
+    monkeypatch.setattr(settings, "db_pre_ping_idle_seconds", 0.0)
+    engine = database.create_database_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    pings = []
+
+    def do_ping(dbapi_connection):
+        pings.append(dbapi_connection)
+        if len(pings) == 1:
+            raise RuntimeError("server closed the connection")
+        return True
+
+    monkeypatch.setattr(engine.dialect, "do_ping", do_ping)
+    try:
+        with engine.connect() as connection:  # fresh connection, not pinged
+            first = connection.connection.dbapi_connection
+        with engine.connect() as connection:  # idle ping fails: replaced
+            assert connection.execute(text("select 1")).scalar() == 1
+            assert connection.connection.dbapi_connection is not first
+        with engine.connect():  # idle ping succeeds
+            pass
+        assert len(pings) == 2
+        metrics = engine.pool.metrics.snapshot()
+        assert metrics["checkouts"] == 3
+        assert metrics["timeouts"] == 0
+        assert metrics["wait_seconds_max"] >= metrics["wait_seconds_mean"] > 0
+    finally:
+        engine.dispose()
+    assert engine.pool.metrics.snapshot()["checkouts"] == 3
+    assert set(database.pool_status()) >= {"primary", "async"}
@@ -0,0 +1,156 @@
+"""Tests for holding service layer."""
+
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from app.models.holding import Holding
+from app.models.portfolio_snapshot import PortfolioAllocationSnapshot
+from app.repositories.portfolio_snapshot_repository import PortfolioSnapshotRepository
+from app.schemas.account import AccountCreate, AccountUpdate
+from app.schemas.batch import BatchRequest
+from app.schemas.holding import HoldingBatchUpdate, HoldingCreate, HoldingUpdate
+from app.services.account_service import AccountService
+from app.services.holding_service import HoldingService
+
+
+def test_portfolio_allocation_uses_fixed_number_of_queries(db_session):
+    """Test allocation totals and that the query count does not grow with accounts."""
+    accounts = AccountService(db_session)
+    service = HoldingService(db_session)
+    assert service.get_asset_class_percentages() == {}
+    for i in range(20):
+        account = accounts.create_account(
+            AccountCreate(name=f"Account {i}", account_type="taxable", balance=Decimal("1000"))
+        )
+        for asset_class, amount in (("total_us_stock", "600"), ("bonds", "300")):
+            service.create_holding(
+                HoldingCreate(
+                    account_id=account.id, asset_class=asset_class, amount=Decimal(amount)
+                )
+            )
+    accounts.create_account(AccountCreate(name="Empty", account_type="cash", balance=Decimal("0")))
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        allocation = service.get_portfolio_allocation()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 3
+    assert allocation.total_portfolio_value == Decimal("20000")
+    assert allocation.by_asset_class == {
+        "total_us_stock": Decimal("12000.00"),
+        "bonds": Decimal("6000.00"),
+    }
+    assert allocation.by_asset_class_percent["total_us_stock"] == Decimal("60.00")
+    assert len(allocation.by_account) == 21
+    first = allocation.by_account[0]
+    assert first.holdings_total == Decimal("900.00")
+    assert first.difference == Decimal("100.00")
+    assert [h.allocation_percent for h in first.holdings] == [Decimal("60.00"), Decimal("30.00")]
+    assert allocation.by_account[-1].holdings == []
+    # The single-account summary agrees with the portfolio view
+    assert service.get_account_holdings_summary(first.account_id) == first
+
+
+def test_allocation_snapshot_follows_holding_and_account_writes(db_session):
+    """Test the incrementally maintained snapshot matches one rebuilt from scratch."""
+    accounts = AccountService(db_session)
+    service = HoldingService(db_session)
+
+    ira = accounts.create_account(
+        AccountCreate(name="IRA", account_type="pretax", balance=Decimal("1000"))
+    )
+    brokerage = accounts.create_account(
+        AccountCreate(name="Brokerage", account_type="taxable", balance=Decimal("500"))
+    )
+    stock = service.create_holding(
+        HoldingCreate(account_id=ira.id, asset_class="total_us_stock", amount=Decimal("700"))
+    )
+    bonds = service.create_holding(
+        HoldingCreate(account_id=ira.id, asset_class="bonds", amount=Decimal("300"))
+    )
+    service.create_holding(
+        HoldingCreate(account_id=brokerage.id, asset_class="reits", amount=Decimal("500"))
+    )
+    service.update_holding(stock.id, HoldingUpdate(asset_class="cash", amount=Decimal("650.5")))
+    service.delete_holding(bonds.id)
+    accounts.update_account(ira.id, AccountUpdate(balance=Decimal("650.50")))
+    accounts.delete_account(brokerage.id)
+
+    snapshot = PortfolioSnapshotRepository(db_session)
+    maintained = snapshot.get()
+    assert maintained == (Decimal("650.50"), {"cash": Decimal("650.50")})
+    snapshot.rebuild()
+    assert snapshot.get() == maintained
+    assert service.get_asset_class_percentages() == {"cash": Decimal("100.00")}
+
+    # Reconciling leaves a matching snapshot alone and rebuilds a missing or drifted one
+    assert not snapshot.reconcile()
+    db_session.query(PortfolioAllocationSnapshot).delete()
+    db_session.commit()
+    assert snapshot.get() == (Decimal("0"), {})
+    assert snapshot.reconcile()
+    assert snapshot.get() == maintained
+    snapshot.adjust({"cash": (Decimal("1"), 0)})
+    db_session.commit()
+    assert snapshot.reconcile()
+    assert snapshot.get() == maintained
+
+
+def test_startup_picks_up_holdings_written_outside_the_repositories(client, db_session):
+    """Test app startup rebuilds a snapshot that rows written directly left stale."""
+    account = AccountService(db_session).create_account(
+        AccountCreate(name="IRA", account_type="pretax", balance=Decimal("1000"))
+    )
+    # As scripts/bootstrap_holdings.py did before it rebuilt the snapshot
+    db_session.add(Holding(account_id=account.id, asset_class="bonds", amount=Decimal("400")))
+    db_session.commit()
+    assert PortfolioSnapshotRepository(db_session).get() == (Decimal("1000.00"), {})
+
+    with client:
+        allocation = client.get("/api/v1/holdings/portfolio-allocation").json()
+    assert allocation["by_asset_class"] == {"bonds": "400.00"}
+
+
+def test_batch_applies_all_items_or_none(db_session):
+    """Test a holdings batch is validated as a whole and applied in one transaction."""
+    account = AccountService(db_session).create_account(
+        AccountCreate(name="IRA", account_type="pretax", balance=Decimal("1000"))
+    )
+    service = HoldingService(db_session)
+    stock = service.create_holding(
+        HoldingCreate(account_id=account.id, asset_class="total_us_stock", amount=Decimal("700"))
+    )
+    bonds = service.create_holding(
+        HoldingCreate(account_id=account.id, asset_class="bonds", amount=Decimal("300"))
+    )
+
+    batch = BatchRequest[HoldingCreate, HoldingBatchUpdate](
+        create=[HoldingCreate(account_id=account.id, asset_class="cash", amount=Decimal("50"))],
+        update=[HoldingBatchUpdate(id=stock.id, amount=Decimal("650"))],
+        delete=[bonds.id, uuid4()],
+    )
+    result = service.apply_batch(batch)
+    assert not result.applied
+    assert [r.status for r in result.results] == ["skipped", "skipped", "skipped", "error"]
+    assert len(service.get_all_holdings()) == 2
+
+    batch.delete = [bonds.id]
+    result = service.apply_batch(batch)
+    assert result.applied
+    assert [(r.operation, r.status) for r in result.results] == [
+        ("create", "created"),
+        ("update", "updated"),
+        ("delete", "deleted"),
+    ]
+    assert service.get_holding_by_id(result.results[0].id).amount == Decimal("50")
+    assert PortfolioSnapshotRepository(db_session).get() == (
+        Decimal("1000.00"),
+        {"cash": Decimal("50.00"), "total_us_stock": Decimal("650.00")},
+    )
@@ -0,0 +1,136 @@
+"""Tests for saved scenario API endpoints."""
+
+import logging
+from datetime import date
+from decimal import Decimal
+
+from fastapi import status
+
+from app.database import get_read_db
+from app.main import app
+from app.models.social_security import SocialSecurity
+
+
+def test_outcomes_are_refreshed_in_the_background(client, db_session, caplog):
+    """Test writes project the scenario after responding, and failed projections are logged."""
+    with caplog.at_level(logging.ERROR):
+        response = client.post("/api/v1/saved-scenarios", json={"name": "Base"})
+    assert response.status_code == status.HTTP_201_CREATED
+    scenario_id = response.json()["id"]
+    assert client.get(f"/api/v1/saved-scenarios/{scenario_id}").json()["final_portfolio"] is None
+    assert f"Could not refresh the outcome of scenario {scenario_id}" in caplog.text
+
+    db_session.add(
+        SocialSecurity(
+            birth_date=date(1960, 6, 15),
+            fra_monthly_amount=Decimal("3000"),
+            fra_age=Decimal("67"),
+        )
+    )
+    db_session.commit()
+    client.post(
+        "/api/v1/accounts", json={"name": "IRA", "account_type": "pretax", "balance": "1000000"}
+    )
+    response = client.put(f"/api/v1/saved-scenarios/{scenario_id}", json={"projection_years": 10})
+    assert response.json()["final_portfolio"] is None
+    scenario = client.get(f"/api/v1/saved-scenarios/{scenario_id}").json()
+    assert scenario["final_portfolio"] is not None
+    assert scenario["years_until_depletion"] is None
+
+
+def test_input_writes_refresh_outcomes_in_the_background(client):
+    """Test fixed expense, Social Security and other input writes re-project scenarios."""
+    client.post(
+        "/api/v1/social-security",
+        json={"birth_date": "1960-06-15", "fra_monthly_amount": "3000", "fra_age": "67"},
+    )
+    client.post(
+        "/api/v1/accounts", json={"name": "IRA", "account_type": "pretax", "balance": "1000000"}
+    )
+    scenarios = [
+        client.post("/api/v1/saved-scenarios", json={"name": name, "projection_years": 10}).json()
+        for name in ("A", "B")
+    ]
+
+    def final_portfolios() -> list[str]:
+        return [
+            client.get(f"/api/v1/saved-scenarios/{s['id']}").json()["final_portfolio"]
+            for s in scenarios
+        ]
+
+    before = final_portfolios()
+    expense = client.post(
+        "/api/v1/fixed-expenses",
+        json={"scenario_id": scenarios[0]["id"], "name": "Car", "monthly_amount": "500"},
+    ).json()
+    after_create = final_portfolios()
+    assert after_create[0] != before[0] and after_create[1] == before[1]
+
+    client.put(f"/api/v1/fixed-expenses/{expense['id']}", json={"monthly_amount": "900"})
+    after_update = final_portfolios()
+    assert after_update[0] != after_create[0] and after_update[1] == before[1]
+
+    response = client.patch(
+        "/api/v1/fixed-expenses:batch",
+        json={
+            "create": [{"scenario_id": scenarios[1]["id"], "name": "Car", "monthly_amount": "900"}]
+        },
+    )
+    assert response.json()["applied"]
+    assert final_portfolios() == [after_update[0], after_update[0]]
+
+    # Social Security applies to every scenario
+    client.put("/api/v1/social-security", json={"fra_monthly_amount": "3500"})
+    after_ss = final_portfolios()
+    assert all(a != b for a, b in zip(after_ss, after_update))
+
+    other_income = {
+        "name": "Pension",
+        "income_type": "pension",
+        "monthly_amount": "1000",
+        "start_month": 1,
+        "start_year": date.today().year,
+    }
+    response = client.patch("/api/v1/other-income:batch", json={"create": [other_income]})
+    assert response.json()["applied"]
+    assert all(a != b for a, b in zip(final_portfolios(), after_ss))
+    after_income = final_portfolios()
+
+    accounts_csv = "name,account_type,balance\nBrokerage,taxable,50000\n"
+    client.post(
+        "/api/v1/accounts/import", files={"file": ("accounts.csv", accounts_csv, "text/csv")}
+    )
+    after_import = final_portfolios()
+    assert all(a != b for a, b in zip(after_import, after_income))
+
+    # Single-item edits refresh them too
+    account = client.get("/api/v1/accounts").json()[0]
+    client.put(f"/api/v1/accounts/{account['id']}", json={"balance": "800000"})
+    assert all(a != b for a, b in zip(final_portfolios(), after_import))
+
+
+def test_projection_runs_are_read_from_the_primary(client):
+    """Test a run stored by a projection is served at once, whatever the replica holds."""
+    client.post(
+        "/api/v1/social-security",
+        json={"birth_date": "1960-06-15", "fra_monthly_amount": "3000", "fra_age": "67"},
+    )
+    client.post(
+        "/api/v1/accounts", json={"name": "IRA", "account_type": "pretax", "balance": "500000"}
+    )
+    scenario = client.post(
+        "/api/v1/saved-scenarios", json={"name": "Base", "projection_years": 10}
+    ).json()
+    projection = client.get(f"/api/v1/saved-scenarios/{scenario['id']}/projection").json()
+
+    def lagging_replica():
+        raise AssertionError("projection runs read from the replica")
+        yield
+
+    app.dependency_overrides[get_read_db] = lagging_replica
+    runs = client.get("/api/v1/projection-runs", params={"scenario_id": scenario["id"]}).json()
+    assert len(runs) == 1
+    run = client.get(f"/api/v1/projection-runs/{runs[0]['id']}").json()
+    assert run["final_portfolio"] == projection["final_portfolio"]
+    diff = client.get(f"/api/v1/projection-runs/{runs[0]['id']}/diff/{runs[0]['id']}")
+    assert diff.status_code == status.HTTP_200_OK
@@ -0,0 +1,279 @@
+"""Tests for saved scenario repository and service layers."""
+
+from dataclasses import replace
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+
+from app.models.fixed_expense import FixedExpense
+from app.models.scenario import SavedScenario
+from app.models.social_security import SocialSecurity
+from app.repositories.scenario_repository import AsyncScenarioRepository, ScenarioRepository
+from app.schemas.account import AccountCreate, AccountUpdate
+from app.schemas.scenario import (
+    BucketStrategy,
+    SavedScenarioCreate,
+    SavedScenarioSummary,
+    SavedScenarioUpdate,
+    ScenarioOutcomeFilter,
+    ScenarioVariant,
+)
+from app.services.account_service import AccountService
+from app.services.retirement_scenario_service import (
+    RetirementScenarioService,
+    list_scenarios_async,
+)
+from app.services.simulation_service import SimulationService
+
+
+def test_clone_variants_copies_scenario_and_fixed_expenses(db_session):
+    """Test set-based cloning keeps every column and fixed expense, applying overrides."""
+    service = RetirementScenarioService(db_session)
+    original = service.create_scenario(
+        SavedScenarioCreate(
+            name="Base",
+            monthly_spending=Decimal("8000"),
+            spending_policy="guardrails",
+            withdrawal_strategy="roth_last",
+            cost_basis_method="hifo",
+            bucket_strategy=BucketStrategy(),
+        )
+    )
+    for name in ("Mortgage", "Car"):
+        db_session.add(
+            FixedExpense(scenario_id=original.id, name=name, monthly_amount=Decimal("500"))
+        )
+    db_session.commit()
+
+    variants = service.clone_variants(
+        original.id,
+        [
+            ScenarioVariant(name="Spend 7k", overrides={"monthly_spending": Decimal("7000")}),
+            ScenarioVariant(
+                name="Spend 9k",
+                overrides=SavedScenarioUpdate(monthly_spending=Decimal("9000"), name="ignored"),
+            ),
+        ],
+    )
+    assert [v.name for v in variants] == ["Spend 7k", "Spend 9k"]
+    assert [v.monthly_spending for v in variants] == [Decimal("7000"), Decimal("9000")]
+    for variant in variants:
+        assert variant.id != original.id
+        assert variant.model_dump(exclude={"id", "name", "monthly_spending"}) == (
+            original.model_dump(exclude={"id", "name", "monthly_spending"})
+            | {"created_at": variant.created_at, "updated_at": variant.updated_at}
+        )
+        expenses = db_session.query(FixedExpense).filter(FixedExpense.scenario_id == variant.id)
+        assert sorted(e.name for e in expenses) == ["Car", "Mortgage"]
+        assert all(e.created_at == e.updated_at is not None for e in expenses)
+
+    copy = service.duplicate_scenario(original.id, "Copy")
+    assert copy.bucket_strategy == original.bucket_strategy
+    assert db_session.query(FixedExpense).count() == 8
+    assert ScenarioRepository(db_session).duplicate(uuid4(), "Missing") is None
+
+
+def test_keyset_pages_carry_cached_outcomes(db_session):
+    """Test summary pages walk every scenario once and show the last projection's headline."""
+    db_session.add(
+        SocialSecurity(
+            birth_date=date(1960, 6, 15),
+            fra_monthly_amount=Decimal("3000"),
+            fra_age=Decimal("67"),
+        )
+    )
+    db_session.commit()
+    AccountService(db_session).create_account(
+        AccountCreate(name="IRA", account_type="pretax", balance=Decimal("500000"))
+    )
+    service = RetirementScenarioService(db_session)
+    created = [
+        service.create_scenario(SavedScenarioCreate(name=f"S{i}", projection_years=10))
+        for i in range(5)
+    ]
+
+    projection = service.generate_projection(scenario_id=created[0].id)
+    pages, cursor = [], None
+    while True:
+        page, cursor = service.list_scenarios(limit=2, cursor=cursor, summary=True)
+        pages.append(page)
+        if cursor is None:
+            break
+    assert [len(page) for page in pages] == [2, 2, 1]
+    listed = [s for page in pages for s in page]
+    assert sorted(s.id for s in listed) == sorted(s.id for s in created)
+    assert isinstance(listed[0], SavedScenarioSummary)
+
+    outcome = next(s for s in listed if s.id == created[0].id)
+    assert outcome.final_portfolio == projection.final_portfolio
+    assert outcome.updated_at == created[0].updated_at
+    assert all(s.final_portfolio is None for s in listed if s.id != created[0].id)
+    # The cached headline is not an input: the next run hashes to the same inputs
+    stored = ScenarioRepository(db_session).get_by_id(created[0].id)
+    context = service.load_projection_context(created[0].id)
+    assert stored.outcome_input_hash == context.input_hash()
+
+    # Serving the stored run writes nothing; a refresh records the outcome again
+    db_session.execute(
+        update(SavedScenario)
+        .where(SavedScenario.id == created[0].id)
+        .values(final_portfolio=None, outcome_input_hash=None)
+    )
+    db_session.commit()
+    assert service.generate_projection(scenario_id=created[0].id) == projection
+    assert service.get_scenario_by_id(created[0].id).final_portfolio is None
+    assert service.refresh_outcomes([created[0].id]) == 1
+    assert service.get_scenario_by_id(created[0].id).final_portfolio == projection.final_portfolio
+
+    # The hash moves with the calendar year and age, not with every day
+    assert replace(context, today=date(context.today.year, 1, 1)).input_hash() == (
+        replace(context, today=date(context.today.year, 6, 14)).input_hash()
+    )
+    assert replace(context, today=date(2030, 6, 14)).input_hash() != (
+        replace(context, today=date(2030, 6, 15)).input_hash()
+    )
+
+    # Editing the scenario drops its cached headline
+    service.update_scenario(created[0].id, SavedScenarioUpdate(projection_years=12))
+    assert service.get_scenario_by_id(created[0].id).final_portfolio is None
+
+
+def test_projection_runs_are_stored_served_and_diffed(db_session, monkeypatch):
+    """Test saved-scenario projections are stored, served on repeat and diffable."""
+    db_session.add(
+        SocialSecurity(
+            birth_date=date(1960, 6, 15),
+            fra_monthly_amount=Decimal("3000"),
+            fra_age=Decimal("67"),
+        )
+    )
+    db_session.commit()
+    AccountService(db_session).create_account(
+        AccountCreate(name="IRA", account_type="pretax", balance=Decimal("500000"))
+    )
+    service = RetirementScenarioService(db_session)
+    scenario = service.create_scenario(SavedScenarioCreate(name="Base", projection_years=10))
+
+    first = service.generate_projection(scenario_id=scenario.id)
+    monkeypatch.setattr(service, "_run_projection", lambda *args: pytest.fail("recomputed"))
+    assert service.generate_projection(scenario_id=scenario.id) == first
+    monkeypatch.undo()
+
+    service.update_scenario(scenario.id, SavedScenarioUpdate(monthly_spending=Decimal("6000")))
+    second = service.generate_projection(scenario_id=scenario.id)
+    runs = service.run_service.list_runs(scenario.id)
+    assert len(runs) == 2
+    base, other = sorted(runs, key=lambda r: r.final_portfolio == second.final_portfolio)
+    assert service.run_service.get_result(base.id) == first
+
+    diff = service.run_service.diff_runs(base.id, other.id)
+    assert diff.years == list(range(1, 11))
+    assert diff.summary["final_portfolio"] == second.final_portfolio - first.final_portfolio
+    assert diff.columns["ending_balance"] == [
+        b.ending_balance - a.ending_balance for a, b in zip(first.projections, second.projections)
+    ]
+    assert "age" not in diff.columns
+    assert service.run_service.diff_runs(base.id, uuid4()) is None
+
+
+def test_outcome_search_filters_on_cached_outcomes(db_session):
+    """Test scenario search bounds the cached outcomes and skips unprojected scenarios."""
+    db_session.add(
+        SocialSecurity(
+            birth_date=date(1960, 6, 15),
+            fra_monthly_amount=Decimal("3000"),
+            fra_age=Decimal("67"),
+        )
+    )
+    db_session.commit()
+    AccountService(db_session).create_account(
+        AccountCreate(name="IRA", account_type="pretax", balance=Decimal("1000000"))
+    )
+    service = RetirementScenarioService(db_session)
+    lean, lavish, unprojected = (
+        service.create_scenario(
+            SavedScenarioCreate(name=name, monthly_spending=Decimal(spending), projection_years=30)
+        )
+        for name, spending in (("Lean", "3000"), ("Lavish", "20000"), ("New", "3000"))
+    )
+    assert service.refresh_outcomes([lean.id, lavish.id]) == 2
+    lean, lavish = service.get_scenario_by_id(lean.id), service.get_scenario_by_id(lavish.id)
+    assert lean.years_until_depletion is None and lean.lifetime_tax > 0
+    projections = service.generate_projection(scenario_id=lavish.id).projections
+    assert lavish.depletion_age == projections[lavish.years_until_depletion - 1].age
+
+    def search(**bounds) -> list[str]:
+        scenarios, _ = service.list_scenarios(outcome=ScenarioOutcomeFilter(**bounds))
+        return sorted(s.name for s in scenarios)
+
+    assert search() == ["Lavish", "Lean", "New"]
+    assert search(min_final=lean.final_portfolio) == ["Lean"]
+    assert search(min_depletion_age=95) == ["Lean"]
+    assert search(max_depletion_year=lavish.years_until_depletion) == ["Lavish"]
+    assert search(min_success_probability=Decimal("0.5")) == []
+
+
+def test_success_probability_is_cached_for_default_simulations_of_the_cached_inputs(db_session):
+    """Test only default simulations of the projected inputs cache a success probability."""
+    db_session.add(
+        SocialSecurity(
+            birth_date=date(1960, 6, 15),
+            fra_monthly_amount=Decimal("3000"),
+            fra_age=Decimal("67"),
+        )
+    )
+    db_session.commit()
+    account = AccountService(db_session).create_account(
+        AccountCreate(name="IRA", account_type="pretax", balance=Decimal("1000000"))
+    )
+    service = RetirementScenarioService(db_session)
+    scenario = service.create_scenario(SavedScenarioCreate(name="Base", projection_years=10))
+    simulations = SimulationService(db_session)
+
+    def cached() -> Decimal | None:
+        return service.get_scenario_by_id(scenario.id).success_probability
+
+    # Nothing projected yet, then runs off the default model
+    simulations.run_simulation(scenario_id=scenario.id, seed=1)
+    assert cached() is None
+    service.refresh_outcomes([scenario.id])
+    simulations.run_simulation(scenario_id=scenario.id, n_paths=100, seed=1)
+    simulations.run_simulation(scenario_id=scenario.id, seed=1, mortality="single")
+    simulations.run_simulation(scenario_id=scenario.id, seed=1, inflation="stochastic")
+    assert cached() is None
+
+    result = simulations.run_simulation(scenario_id=scenario.id, seed=1)
+    assert cached() == result.success_probability
+    # A projection of other inputs drops it
+    AccountService(db_session).update_account(account.id, AccountUpdate(balance=Decimal("900000")))
+    service.refresh_outcomes([scenario.id])
+    assert cached() is None
+
+
+async def test_async_repository_pages_match_sync(db_session, async_db_session):
+    """Test the async read path returns the same keyset pages as the sync repository."""
+    service = RetirementScenarioService(db_session)
+    for i in range(5):
+        service.create_scenario(SavedScenarioCreate(name=f"S{i}"))
+
+    cursor, pages = None, []
+    while True:
+        page, cursor = await list_scenarios_async(
+            async_db_session, limit=2, cursor=cursor, summary=True
+        )
+        pages.append([s.id for s in page])
+        if cursor is None:
+            break
+    scenario = await AsyncScenarioRepository(async_db_session).get_by_id(pages[0][0])
+
+    cursor, expected = None, []
+    while True:
+        page, cursor = service.list_scenarios(limit=2, cursor=cursor, summary=True)
+        expected.append([s.id for s in page])
+        if cursor is None:
+            break
+    assert pages == expected
+    assert scenario.name == service.get_scenario_by_id(pages[0][0]).name
@@ -0,0 +1,637 @@
+"""Tests for the vectorized return model and simulation kernel."""
+
+from dataclasses import replace
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from app.engine.glide_path import allocation_matrix, expected_return_path
+from app.engine.return_model import get_return_model
+from app.engine.simulation import PathInputs, simulate_paths, withdraw_in_order
+from app.engine.spending import make_spending_policy
+from app.engine.tax import BracketSchedule, IncomeTaxSchedule, federal_brackets
+from app.schemas.account import AccountCreate
+from app.schemas.scenario import (
+    AssetAllocation,
+    GlidePath,
+    SavedScenarioCreate,
+    SavedScenarioUpdate,
+)
+from app.services.account_service import AccountService
+from app.services.retirement_scenario_service import RetirementScenarioService
+from app.services.simulation_service import SimulationService
+
+
+def _setup_household(db_session):
+    """Create Social Security config and a pretax and taxable account."""
+    from app.models.social_security import SocialSecurity
+
+    db_session.add(
+        SocialSecurity(
+            birth_date=date(1960, 6, 15),
+            fra_monthly_amount=Decimal("3000"),
+            fra_age=Decimal("67"),
+        )
+    )
+    db_session.commit()
+    accounts = AccountService(db_session)
+    accounts.create_account(
+        AccountCreate(name="IRA", account_type="pretax", balance=Decimal("800000"))
+    )
+    accounts.create_account(
+        AccountCreate(
+            name="Brokerage",
+            account_type="taxable",
+            balance=Decimal("200000"),
+            cost_basis=Decimal("150000"),
+        )
+    )
+
+
+def test_return_model_is_consistent():
+    """Test that the cached model has a valid covariance and samples the requested mean."""
+    model = get_return_model()
+    assert model is get_return_model()
+    assert model.asset_class_mapping.shape == (13, model.n_series)
+    np.testing.assert_allclose(model.asset_class_mapping.sum(axis=1), 1.0)
+    np.testing.assert_allclose(model.cholesky @ model.cholesky.T, model.cov)
+
+    weights = model.allocation_weights({"total_us_stock": 60, "bonds": 40})
+    assert abs(weights.sum() - 1.0) < 1e-12
+    draws = model.sample_portfolio(20000, 10, weights, 0.05, np.random.default_rng(1))
+    assert abs(draws.mean() - 0.05) < 0.005
+
+
+def test_bracket_schedule_matches_decimal_calculation(db_session):
+    """Test that the vectorized brackets agree with the projection's Decimal tax."""
+    service = RetirementScenarioService(db_session)
+    incomes = np.array([0.0, 10000.0, 23200.0, 90000.0, 250000.0, 1000000.0])
+    for status in ("married_filing_jointly", "single", "head_of_household"):
+        vectorized = BracketSchedule(federal_brackets(status)).tax(incomes)
+        for income, tax in zip(incomes, vectorized):
+            expected = service._calculate_federal_tax(Decimal(str(income)), status)
+            assert abs(float(expected) - tax) < 0.01
+
+
+def test_capital_gains_stack_on_ordinary_income(db_session):
+    """Test 0/15/20% gains stacking plus NIIT, vectorized and in Decimal."""
+    schedule = IncomeTaxSchedule("single", state_rate=0.0)
+    # 40,000 ordinary and 20,000 of gains: gains above the 47,025 threshold pay 15%
+    ordinary_tax = BracketSchedule(federal_brackets("single")).tax(40000.0)
+    np.testing.assert_allclose(
+        schedule.tax(np.array([60000.0]), np.array([20000.0])),
+        ordinary_tax + (60000.0 - 47025.0) * 0.15,
+    )
+    # Above the NIIT threshold the surtax applies to the smaller of gains and the excess
+    np.testing.assert_allclose(
+        schedule.tax(np.array([250000.0]), np.array([100000.0]))
+        - schedule.tax(np.array([250000.0]), np.array([100000.0]), np.array([199999.0])),
+        50000.0 * 0.038,
+    )
+
+    service = RetirementScenarioService(db_session)
+    incomes = np.array([20000.0, 60000.0, 140000.0, 250000.0, 700000.0])
+    gains = np.array([50000.0, 20000.0, 100000.0, 100000.0, 50000.0])
+    vectorized = schedule.tax(incomes, gains)
+    for income, gain, tax in zip(incomes, gains, vectorized):
+        expected = service._calculate_federal_tax(
+            Decimal(str(income)), "single", capital_gains=Decimal(str(gain))
+        )
+        assert abs(float(expected) - tax) < 0.01
+
+
+def test_glide_path_interpolates_allocation_and_returns(db_session):
+    """Test keyframe interpolation by age and the per-year returns it produces."""
+    stocks = AssetAllocation(total_us_stock=Decimal("100"))
+    bonds = AssetAllocation(bonds=Decimal("100"))
+    glide_path = GlidePath(
+        basis="age",
+        keyframes=[{"age": 70, "allocation": stocks}, {"age": 80, "allocation": bonds}],
+    )
+
+    weights = allocation_matrix(stocks, glide_path, n_years=25, start_age=65)
+    np.testing.assert_allclose(weights.sum(axis=1), 100.0)
+    assert weights[0, 0] == 100.0  # held flat before age 70 (year 6)
+    np.testing.assert_allclose(weights[10, [0, 7]], [50.0, 50.0])  # age 75
+    assert weights[-1, 7] == 100.0  # held flat after age 80
+
+    scenario = SavedScenarioCreate(name="Glide", projection_years=25, glide_path=glide_path)
+    returns = expected_return_path(scenario, 25, start_age=65)
+    assert returns[0] == 7.5 and returns[-1] == 4.5
+    np.testing.assert_allclose(returns[10], 6.0)
+
+    from app.repositories.scenario_repository import ScenarioRepository
+
+    saved = RetirementScenarioService(db_session).create_scenario(scenario)
+    assert saved.glide_path == glide_path
+    copy = ScenarioRepository(db_session).duplicate(saved.id, "Glide copy")
+    assert GlidePath.model_validate(copy.glide_path) == saved.glide_path
+
+
+def test_withdraw_in_order_drains_buckets_in_sequence():
+    """Test sequencing pretax, taxable, cash and Roth across a batch."""
+    balances = np.array([[100.0, 50.0, 30.0, 20.0], [0.0, 50.0, 30.0, 20.0]])
+    withdrawals = withdraw_in_order(balances, np.array([120.0, 60.0]))
+    np.testing.assert_allclose(withdrawals[0], [100.0, 0.0, 20.0, 0.0])
+    np.testing.assert_allclose(withdrawals[1], [0.0, 10.0, 30.0, 20.0])
+
+
+def test_kernel_depletes_when_spending_exceeds_portfolio():
+    """Test that a path with no income and high spending records its depletion year."""
+    inputs = PathInputs(
+        balances=np.array([0.0, 0.0, 0.0, 100000.0]),
+        taxable_cost_basis=0.0,
+        ss_income=np.zeros(10),
+        other_income=np.zeros(10),
+        spending=np.full(10, 30000.0),
+        deductions=0.0,
+        tax_schedule=IncomeTaxSchedule("single"),
+    )
+    results = simulate_paths(inputs, np.zeros((2, 10)))
+    assert results.depletion_year.tolist() == [4, 4]
+    assert not results.success.any()
+
+
+def test_required_minimum_distributions_are_forced_and_reinvested(db_session):
+    """Test RMD fractions by age reached, forced kernel distributions and the projection."""
+    from app.engine.data_registry import rmd_start_year
+    from app.engine.rmd import rmd_fractions
+
+    np.testing.assert_allclose(
+        rmd_fractions([2027, 2028, 2030, 2085], date(1955, 3, 1)),
+        [0.0, 1 / 26.5, 1 / 24.6, 1 / 2.0],
+    )
+    assert rmd_fractions([2034], date(1960, 1, 1))[0] == 0
+    # A December birthday still starts in the year the start age is reached
+    np.testing.assert_allclose(
+        rmd_fractions([2031, 2032, 2033], date(1959, 12, 31)), [0.0, 1 / 26.5, 1 / 25.5]
+    )
+    # 70 1/2 for those born before July 1, 1949
+    assert rmd_start_year(date(1949, 6, 30)) == 2019
+    assert rmd_start_year(date(1948, 9, 10)) == 2019
+    assert rmd_start_year(date(1949, 7, 1)) == 2021
+
+    inputs = PathInputs(
+        balances=np.array([1000000.0, 0.0, 0.0, 0.0]),
+        taxable_cost_basis=0.0,
+        ss_income=np.zeros(2),
+        other_income=np.zeros(2),
+        spending=np.full(2, 10000.0),
+        deductions=0.0,
+        tax_schedule=IncomeTaxSchedule("single"),
+        rmd_fractions=np.full(2, 0.05),
+    )
+    results = simulate_paths(inputs, np.zeros((1, 2)))
+    np.testing.assert_allclose(results.rmds[0], [50000.0, 47500.0])
+    # What spending and tax do not use moves to the taxable account
+    assert results.final_balances[0, 2] > 0
+    np.testing.assert_allclose(
+        results.final_balances.sum() + results.taxes.sum() + 20000.0, 1000000.0
+    )
+
+    _setup_household(db_session)
+    scenario = RetirementScenarioService(db_session).create_scenario(
+        SavedScenarioCreate(name="RMD", projection_years=12, monthly_spending=Decimal("500"))
+    )
+    projections = (
+        RetirementScenarioService(db_session)
+        .generate_projection(scenario_id=scenario.id)
+        .projections
+    )
+    # Born 1960: distributions start in 2035, and Social Security covers the spending
+    assert all(
+        year.required_minimum_distribution == 0 for year in projections if year.calendar_year < 2035
+    )
+    first = next(year for year in projections if year.calendar_year == 2035)
+    expected = first.pretax_starting_balance / Decimal("24.6")
+    assert abs(first.required_minimum_distribution - expected) < Decimal("0.01")
+    assert first.rmd_reinvested > 0
+    assert first.taxable_ending_balance > first.taxable_starting_balance
+
+
+def test_spending_policies_respond_to_returns(db_session):
+    """Test guardrail cuts, floor/ceiling bounds and policy spending in the projection."""
+    planned = np.full(5, 40000.0)
+
+    def run(policy, annual_return):
+        inputs = PathInputs(
+            balances=np.array([0.0, 0.0, 0.0, 1000000.0]),
+            taxable_cost_basis=0.0,
+            ss_income=np.zeros(5),
+            other_income=np.zeros(5),
+            spending=planned + 10000.0,
+            deductions=0.0,
+            tax_schedule=IncomeTaxSchedule("single"),
+            variable_spending=planned,
+            spending_policy=make_spending_policy(policy),
+        )
+        return simulate_paths(inputs, np.full((1, 5), annual_return)).spending[0]
+
+    np.testing.assert_allclose(run("fixed", -0.2), 50000.0)
+    crash = run("guardrails", -0.2)
+    assert crash[0] == 50000.0 and (np.diff(crash) < 0).all()
+    assert run("guardrails", 0.15)[-1] > 50000.0
+    bounded = run("floor_ceiling", -0.3) - 10000.0
+    np.testing.assert_allclose(bounded[-1], 36000.0)
+    assert (run("constant_percentage", 0.0)[1:] < 50000.0).all()
+
+    _setup_household(db_session)
+    scenario = SavedScenarioCreate(
+        name="Percent",
+        projection_years=5,
+        monthly_spending=Decimal("5000"),
+        spending_policy="constant_percentage",
+        spending_policy_params={"withdrawal_rate": "5"},
+    )
+    projection = RetirementScenarioService(db_session).generate_projection(scenario_data=scenario)
+    assert projection.spending_policy == "constant_percentage"
+    for year in projection.projections:
+        assert abs(year.variable_spending - year.starting_balance * Decimal("0.05")) <= Decimal("1")
+
+
+def test_bucket_plan_spends_cash_first_and_refills_after_up_years(db_session):
+    """Test bucket targets, down-year cash draws and the simulated bucket mode."""
+    from app.engine.buckets import BucketPlan
+
+    plan = BucketPlan(cash_years=3, balanced_years=4)
+    targets = plan.targets(np.full(10, 10000.0))
+    np.testing.assert_allclose(targets[0], [30000.0, 40000.0])
+    np.testing.assert_allclose(targets[8], [20000.0, 0.0])
+
+    inputs = PathInputs(
+        balances=np.array([0.0, 0.0, 0.0, 200000.0]),
+        taxable_cost_basis=0.0,
+        ss_income=np.zeros(4),
+        other_income=np.zeros(4),
+        spending=np.full(4, 10000.0),
+        deductions=0.0,
+        tax_schedule=IncomeTaxSchedule("single"),
+        bucket_plan=plan,
+    )
+    # Cash earns nothing; stocks fall in every year for path 0 and rise for path 1
+    returns = np.zeros((2, 4, 3))
+    returns[0, :, 2] = -0.1
+    returns[1, :, 2] = 0.1
+    results = simulate_paths(inputs, returns)
+    flat = simulate_paths(replace(inputs, bucket_plan=None), np.zeros((2, 4)))
+    assert results.ending_balance[0, -1] < flat.ending_balance[0, -1]
+    assert results.ending_balance[1, -1] > flat.ending_balance[1, -1]
+    assert results.success.all()
+
+    _setup_household(db_session)
+    scenario = SavedScenarioCreate(
+        name="Buckets", projection_years=15, bucket_strategy={"cash_years": 3}
+    )
+    result = SimulationService(db_session).run_simulation(
+        scenario_data=scenario, n_paths=300, seed=5
+    )
+    assert len(result.years) == 15
+    assert Decimal("0") < result.volatility_percent < Decimal("20")
+
+
+def test_roth_conversions_fill_bracket_and_endpoint_ranks_policies(client, db_session):
+    """Test bracket-filling conversions in the kernel and the optimizer endpoint."""
+    from app.engine.roth_conversion import bracket_fill_candidates
+
+    inputs = PathInputs(
+        balances=np.array([500000.0, 0.0, 100000.0, 0.0]),
+        taxable_cost_basis=100000.0,
+        ss_income=np.zeros(3),
+        other_income=np.zeros(3),
+        spending=np.zeros(3),
+        deductions=14600.0,
+        tax_schedule=IncomeTaxSchedule("single"),
+    )
+    candidates = bracket_fill_candidates(inputs.tax_schedule, [0.12], 3)
+    assert len(candidates) == 1 + 6
+    results = simulate_paths(
+        inputs, np.zeros((len(candidates), 3)), conversion_targets=candidates.targets
+    )
+    assert results.conversions[0].sum() == 0
+    # Filling the 12% bracket in every year converts deductions plus the bracket top
+    full = int(np.nonzero((candidates.start_years == 1) & (candidates.end_years == 3))[0][0])
+    np.testing.assert_allclose(results.conversions[full], 14600.0 + 47150.0)
+    np.testing.assert_allclose(
+        results.final_balances[full].sum() + results.taxes[full].sum(), 600000.0
+    )
+
+    _setup_household(db_session)
+    scenario = RetirementScenarioService(db_session).create_scenario(
+        SavedScenarioCreate(name="Convert", projection_years=10, monthly_spending=Decimal("4000"))
+    )
+    response = client.post(
+        f"/api/v1/saved-scenarios/{scenario.id}/optimize/roth-conversions",
+        json={"objective": "lifetime_tax", "bracket_percents": ["12", "22"]},
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["candidates_evaluated"] == 1 + 2 * 55
+    assert Decimal(result["improvement"]) >= 0
+    assert len(result["years"]) == 10
+
+    response = client.post(
+        f"/api/v1/saved-scenarios/{scenario.id}/optimize/roth-conversions",
+        json={"bracket_percents": ["13"]},
+    )
+    assert response.status_code == 400
+
+
+def test_strategy_stack_and_endpoint_rank_withdrawal_strategies(client, db_session):
+    """Test stacked withdrawal strategies in one batch and the comparison endpoint."""
+    from app.engine.withdrawal import STRATEGIES, StrategyStack
+
+    schedule = IncomeTaxSchedule("single")
+    stack = StrategyStack(
+        [STRATEGIES[name] for name in ("conventional", "proportional", "bracket_filling")],
+        1,
+        schedule,
+    )
+    balances = np.tile([100.0, 50.0, 30.0, 20.0], (3, 1))
+    top = schedule.federal.top_of_bracket(0.12)
+    withdrawals = stack.withdraw(balances, np.full(3, 100.0), np.full(3, top - 40.0))
+    np.testing.assert_allclose(withdrawals[0], [100.0, 0.0, 0.0, 0.0])
+    np.testing.assert_allclose(withdrawals[1], [50.0, 25.0, 15.0, 10.0])
+    # Pretax only up to the bracket top, then taxable, cash and Roth
+    np.testing.assert_allclose(withdrawals[2], [40.0, 10.0, 30.0, 20.0])
+
+    _setup_household(db_session)
+    scenario = RetirementScenarioService(db_session).create_scenario(
+        SavedScenarioCreate(name="Order", projection_years=15, monthly_spending=Decimal("5000"))
+    )
+    response = client.post(
+        f"/api/v1/saved-scenarios/{scenario.id}/withdrawal-strategies",
+        params={"rank_by": "lifetime_tax", "paths": 200, "seed": 3},
+    )
+    assert response.status_code == 200
+    result = response.json()
+    outcomes = result["strategies"]
+    assert [o["rank"] for o in outcomes] == list(range(1, len(STRATEGIES) + 1))
+    assert {o["strategy"] for o in outcomes} == set(STRATEGIES)
+    taxes = [Decimal(o["lifetime_tax"]) for o in outcomes]
+    assert taxes == sorted(taxes)
+    assert all(o["success_probability"] is not None for o in outcomes)
+
+    # Each stacked row matches the deterministic kernel run of that strategy alone
+    service = SimulationService(db_session)
+    context = service.scenario_service.load_projection_context(scenario.id)
+    cash_flows = service.scenario_service.build_cash_flow_schedule(context)
+    inputs = service.build_path_inputs(context, cash_flows)
+    returns = expected_return_path(context.scenario, cash_flows.years, context.current_age) / 100
+    for outcome in outcomes:
+        single = replace(
+            inputs, bucket_plan=None, withdrawal_strategy=STRATEGIES[outcome["strategy"]]
+        )
+        alone = simulate_paths(single, returns[None, :])
+        assert float(outcome["final_portfolio"]) == round(alone.final_balances[0].sum(), 2)
+
+    # The deterministic projection follows the scenario's strategy: taxable money goes first
+    scenarios = RetirementScenarioService(db_session)
+    scenarios.update_scenario(scenario.id, SavedScenarioUpdate(withdrawal_strategy="roth_last"))
+    first_year = scenarios.generate_projection(scenario_id=scenario.id).projections[0]
+    assert first_year.pretax_ending_balance > first_year.pretax_starting_balance
+    assert first_year.taxable_ending_balance < first_year.taxable_starting_balance
+
+
+def test_tax_lots_relieve_basis_in_method_order(client, db_session):
+    """Test FIFO / HIFO / specific-ID lot order, lot gains and lot-based projections."""
+    from app.engine.tax_lots import AverageCostBasis, LotBasis, TaxLotTable
+
+    rows = [
+        ("h", date(2010, 1, 1), 10, 20000, 1, 100000),
+        ("h", date(2020, 1, 1), 10, 110000, None, 100000),
+        ("h", date(2015, 1, 1), 20, 60000, 0, 100000),
+    ]
+    lots = TaxLotTable.from_rows(rows)
+    np.testing.assert_allclose(lots.value, [25000.0, 25000.0, 50000.0])
+    assert lots.relief_order("fifo").tolist() == [0, 2, 1]
+    assert lots.relief_order("hifo").tolist() == [1, 2, 0]
+    assert lots.relief_order("spec_id").tolist() == [2, 0, 1]
+
+    # 50,000 of unlotted money at the account's average cost ratio follows the lots
+    curve = lots.relief_curve("fifo", 150000.0, 75000.0)
+    assert (curve.extra_value, curve.extra_basis) == (50000.0, 25000.0)
+    sale, balance = np.array([25000.0]), np.array([150000.0])
+    lot_basis = LotBasis(curve, 1)
+    np.testing.assert_allclose(lot_basis.gains(sale, balance), [5000.0])
+    lot_basis.relieve(sale, balance)
+    # The next sale comes from the 2015 lot at the new price
+    np.testing.assert_allclose(lot_basis.gains(sale, np.array([250000.0])), [10000.0])
+    np.testing.assert_allclose(AverageCostBasis(75000.0, 1).gains(sale, balance), [12500.0])
+
+    _setup_household(db_session)
+    brokerage = next(
+        a for a in AccountService(db_session).get_all_accounts() if a.account_type == "taxable"
+    )
+    holding = client.post(
+        "/api/v1/holdings",
+        json={"account_id": str(brokerage.id), "asset_class": "total_us_stock", "amount": "200000"},
+    ).json()
+    for acquired, cost in (("2010-01-01", "20000"), ("2020-01-01", "180000")):
+        response = client.post(
+            "/api/v1/tax-lots",
+            json={
+                "holding_id": holding["id"],
+                "acquired_on": acquired,
+                "quantity": "50",
+                "cost_basis": cost,
+            },
+        )
+        assert response.status_code == 201
+    assert len(client.get(f"/api/v1/tax-lots/holding/{holding['id']}").json()) == 2
+
+    scenarios = RetirementScenarioService(db_session)
+    scenario = scenarios.create_scenario(
+        SavedScenarioCreate(
+            name="Lots",
+            projection_years=3,
+            monthly_spending=Decimal("10000"),
+            withdrawal_strategy="taxable_first",
+        )
+    )
+
+    def first_year_income(method):
+        scenarios.update_scenario(scenario.id, SavedScenarioUpdate(cost_basis_method=method))
+        return scenarios.generate_projection(scenario_id=scenario.id).projections[0].taxable_income
+
+    # FIFO sells the cheap 2010 lot first; HIFO sells the 2020 lot at a loss
+    # FIFO sells the cheap 2010 lot first; HIFO sells the 2020 lot at a loss
+    assert first_year_income("fifo") > first_year_income("average") > first_year_income("hifo")
+
+
+def test_mortality_samples_death_years_and_outliving_probability(client, db_session):
+    """Test sampled death years against the survival curve and the simulation metrics."""
+    from app.engine.mortality import Life, sample_death_years, survival_curve
+
+    single = [Life("female", 65)]
+    joint = [Life("male", 67), Life("female", 65)]
+    rng = np.random.default_rng(0)
+    for lives in (single, joint):
+        death_year = sample_death_years(lives, 200000, 40, rng)
+        alive = (death_year[:, None] == 0) | (death_year[:, None] > np.arange(1, 41))
+        np.testing.assert_allclose(alive.mean(axis=0), survival_curve(lives, 40), atol=0.005)
+    assert np.all(survival_curve(joint, 40) > survival_curve(single, 40))
+    # Nobody outlives the table
+    assert sample_death_years([Life("male", 100)], 1000, 30, rng).min() > 0
+
+    _setup_household(db_session)
+    scenario = RetirementScenarioService(db_session).create_scenario(
+        SavedScenarioCreate(name="Lifetime", projection_years=35, monthly_spending=Decimal("6500"))
+    )
+    url = f"/api/v1/saved-scenarios/{scenario.id}/simulation"
+    fixed = client.post(url, params={"paths": 500, "seed": 11}).json()
+    assert fixed["probability_outliving_assets"] is None
+    result = client.post(url, params={"paths": 500, "seed": 11, "mortality": "single"}).json()
+    assert result["mortality"] == "single"
+    # Returns are unchanged; only failures after death stop counting
+    assert result["years"][-1]["p50_balance"] == fixed["years"][-1]["p50_balance"]
+    outliving = float(result["probability_outliving_assets"])
+    assert 0 < outliving < 1 - float(fixed["success_probability"])
+    survival = [float(year["survival_probability"]) for year in result["years"]]
+    assert survival == sorted(survival, reverse=True)
+    # Joint mortality needs the spouse's age from the tax configuration
+    response = client.post(url, params={"paths": 10, "mortality": "joint"})
+    assert response.status_code == 400
+
+
+def test_stochastic_inflation_reindexes_cash_flows(client, db_session):
+    """Test AR(1) inflation draws, re-indexed cash flows and the stochastic endpoint."""
+    from app.engine.inflation import InflationIndexing
+    from app.engine.return_model import INFLATION
+
+    model = get_return_model()
+    draws = model.sample(20000, 30, np.random.default_rng(4), inflation=True)
+    inflation = model.inflation_rates(draws, 0.025)
+    assert abs(inflation.mean() - 0.025) < 0.002
+    lagged = np.corrcoef(inflation[:, 1:].ravel(), inflation[:, :-1].ravel())[0, 1]
+    assert abs(lagged - model.inflation_persistence) < 0.02
+    # Asset draws keep their historical covariance
+    np.testing.assert_allclose(
+        model.sampling_cholesky[:INFLATION, :INFLATION], model.cholesky[:INFLATION, :INFLATION]
+    )
+    # Drawing inflation leaves a seed's asset returns unchanged
+    assets = model.sample(50, 30, np.random.default_rng(4))
+    np.testing.assert_array_equal(assets[:, :, :INFLATION], draws[:50, :, :INFLATION])
+
+    indexing = InflationIndexing(
+        rate=0.02,
+        spending=np.full(4, 100.0),
+        ss_start=2,
+        other_income=np.zeros((0, 4)),
+        other_starts=np.zeros(0, dtype=np.int64),
+    )
+    spending_index, ss_income, _ = indexing.realized(
+        np.full((1, 4), 0.05), np.full(4, 10.0), np.zeros(4)
+    )
+    np.testing.assert_allclose(spending_index[0], (1.05 / 1.02) ** np.arange(4))
+    np.testing.assert_allclose(ss_income[0], 10.0 * (1.05 / 1.02) ** np.array([0, 0, 0, 1]))
+
+    _setup_household(db_session)
+    scenario = RetirementScenarioService(db_session).create_scenario(
+        SavedScenarioCreate(
+            name="Prices",
+            projection_years=25,
+            monthly_spending=Decimal("4000"),
+            inflation_adjusted_percent=Decimal("100"),
+        )
+    )
+    service = SimulationService(db_session)
+    context = service.scenario_service.load_projection_context(scenario.id)
+    cash_flows = service.scenario_service.build_cash_flow_schedule(context)
+    inputs = replace(service.build_path_inputs(context, cash_flows), bucket_plan=None)
+    returns = np.full((2, 25), 0.05)
+    # Realizing exactly the assumed rate reproduces the fixed-inflation run
+    fixed = simulate_paths(inputs, returns)
+    assumed = simulate_paths(inputs, returns, inflation=np.full((2, 25), 0.025))
+    np.testing.assert_allclose(assumed.ending_balance, fixed.ending_balance)
+    stagflation = simulate_paths(inputs, returns, inflation=np.full((2, 25), 0.08))
+    assert np.all(stagflation.spending[:, 1:] > fixed.spending[:, 1:])
+    assert np.all(stagflation.ending_balance[:, -1] < fixed.ending_balance[:, -1])
+
+    url = f"/api/v1/saved-scenarios/{scenario.id}/simulation"
+    baseline = client.post(url, params={"paths": 400, "seed": 5}).json()
+    result = client.post(url, params={"paths": 400, "seed": 5, "inflation": "stochastic"}).json()
+    assert (baseline["inflation"], result["inflation"]) == ("fixed", "stochastic")
+    last, fixed_last = result["years"][-1], baseline["years"][-1]
+    assert float(last["p90_spending"]) > float(fixed_last["p90_spending"])
+    assert float(last["p10_spending"]) < float(fixed_last["p10_spending"])
+
+
+def test_simulation_is_reproducible_and_tracks_deterministic_projection(db_session):
+    """Test seeded runs and that zero volatility reproduces the deterministic balances."""
+    _setup_household(db_session)
+    scenario = SavedScenarioCreate(
+        name="Sim", projection_years=20, monthly_spending=Decimal("5000")
+    )
+
+    service = SimulationService(db_session)
+    first = service.run_simulation(scenario_data=scenario, n_paths=500, seed=7)
+    second = service.run_simulation(scenario_data=scenario, n_paths=500, seed=7)
+    assert first == second
+    assert len(first.years) == 20
+    assert Decimal("0") <= first.success_probability <= Decimal("1")
+
+    context = service.scenario_service.load_projection_context(scenario_data=scenario)
+    schedule = service.scenario_service.build_cash_flow_schedule(context)
+    annual_returns = expected_return_path(context.scenario, 20, context.current_age) / 100
+    results = simulate_paths(service.build_path_inputs(context, schedule), annual_returns[None, :])
+    deterministic = service.scenario_service.generate_projection(context=context)
+    for year, balance in zip(deterministic.projections, results.ending_balance[0]):
+        assert abs(float(year.ending_balance) - balance) <= 0.01 * float(year.starting_balance)
+
+
+def test_path_library_serves_memory_mapped_paths(db_session, tmp_path, monkeypatch):
+    """Test that a built library is reproducible, read-only and sliced without copying."""
+    from app.engine import path_library
+    from app.services import simulation_service
+
+    manifest = path_library.build_path_library(tmp_path, [3], n_paths=300, n_years=12)
+    assert path_library.library_is_current(tmp_path, [3], 300, 12)
+    library = path_library.open_path_library(tmp_path)
+    assert library.covers(3, 300, 12) and not library.covers(4, 10, 12)
+
+    view = library.paths(3, 100, 50, 10)
+    assert view.shape == (50, 10, len(manifest["series"]))
+    assert np.shares_memory(view, library.paths(3, 0, 300, 12))
+    assert not view.flags.writeable
+
+    rebuilt = path_library.build_path_library(tmp_path / "again", [3], n_paths=300, n_years=12)
+    again = path_library.open_path_library(tmp_path / "again")
+    assert rebuilt == manifest
+    np.testing.assert_array_equal(again.paths(3, 0, 300, 12), library.paths(3, 0, 300, 12))
+
+    _setup_household(db_session)
+    monkeypatch.setattr(simulation_service, "get_path_library", lambda: library)
+    scenario = SavedScenarioCreate(name="Lib", projection_years=12)
+    result = SimulationService(db_session).run_simulation(scenario_data=scenario, n_paths=300)
+    assert result.path_source == "library"
+    assert result.seed == 3
+
+
+def test_pool_workers_write_identical_results_to_shared_memory():
+    """Test that chunks run on the process pool match an in-process run exactly."""
+    from app.engine.parallel import ResultBuffers, SimulationJob, execute_job
+
+    model = get_return_model()
+    job = SimulationJob(
+        inputs=PathInputs(
+            balances=np.array([600000.0, 100000.0, 200000.0, 50000.0]),
+            taxable_cost_basis=120000.0,
+            ss_income=np.full(30, 36000.0),
+            other_income=np.zeros(30),
+            spending=np.full(30, 80000.0),
+            deductions=29200.0,
+            tax_schedule=IncomeTaxSchedule("married_filing_jointly"),
+        ),
+        weights=model.allocation_weights({"total_us_stock": 60, "bonds": 40}),
+        expected_return=0.06,
+        seed=11,
+        n_paths=5000,
+    )
+
+    with ResultBuffers(job.n_paths, job.n_years) as serial:
+        execute_job(job, serial)
+        with ResultBuffers(job.n_paths, job.n_years, shared=True) as shared:
+            execute_job(job, shared, workers=2)
+            np.testing.assert_array_equal(shared.ending_balance, serial.ending_balance)
+            np.testing.assert_array_equal(shared.depletion_year, serial.depletion_year)
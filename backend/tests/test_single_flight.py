@@ -0,0 +1,141 @@
+"""Tests for single-flight request coalescing."""
+
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.schemas.account import AccountCreate
+from app.schemas.scenario import SavedScenarioCreate
+from app.services.account_service import AccountService
+from app.services.retirement_scenario_service import RetirementScenarioService
+from app.utils.cancellation import OperationCancelledError
+from app.utils.input_hash import canonical_input_hash
+from app.utils.single_flight import SingleFlight
+
+
+def _run_concurrently(count: int, target) -> list:
+    """Start count threads running target and collect their return values."""
+    results = [None] * count
+
+    def worker(index: int):
+        results[index] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_identical_calls_share_one_computation():
+    """Test that callers with the same key wait on a single run."""
+    flights = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"value": 42}
+
+    def call():
+        return flights.do("same-key", compute)
+
+    timer = threading.Timer(0.3, release.set)
+    timer.start()
+    results = _run_concurrently(5, call)
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flights.in_flight() == 0
+
+
+def test_errors_are_shared_with_waiters():
+    """Test that waiters receive the leader's exception."""
+    flights = SingleFlight()
+
+    def compute():
+        time.sleep(0.2)
+        raise ValueError("bad input")
+
+    def call():
+        try:
+            flights.do("key", compute)
+        except ValueError as e:
+            return str(e)
+
+    assert _run_concurrently(3, call) == ["bad input"] * 3
+
+
+def test_waiter_recomputes_when_leader_is_cancelled():
+    """Test that a cancelled leader does not cancel the requests waiting on it."""
+    flights = SingleFlight()
+    leader_started = threading.Event()
+    outcomes = {}
+
+    def cancelled_compute():
+        leader_started.set()
+        time.sleep(0.2)
+        raise OperationCancelledError("client disconnected")
+
+    def leader():
+        with pytest.raises(OperationCancelledError):
+            flights.do("key", cancelled_compute)
+
+    def waiter():
+        leader_started.wait(timeout=5)
+        outcomes["waiter"] = flights.do("key", lambda: "fresh result")
+
+    threads = [threading.Thread(target=leader), threading.Thread(target=waiter)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert outcomes["waiter"] == "fresh result"
+
+
+def test_canonical_hash_ignores_key_order_and_decimal_formatting():
+    """Test that logically identical inputs hash identically."""
+    first = canonical_input_hash({"rate": Decimal("2.5"), "years": 35})
+    second = canonical_input_hash({"years": 35, "rate": Decimal("2.50")})
+    assert first == second
+    assert first != canonical_input_hash({"years": 35, "rate": Decimal("3")})
+
+
+def test_projection_context_hash_tracks_inputs(db_session):
+    """Test that the projection input hash changes when account balances change."""
+    from app.models.social_security import SocialSecurity
+
+    db_session.add(
+        SocialSecurity(
+            birth_date=date(1960, 6, 15),
+            fra_monthly_amount=Decimal("3000"),
+            fra_age=Decimal("67"),
+        )
+    )
+    db_session.commit()
+    AccountService(db_session).create_account(
+        AccountCreate(name="IRA", account_type="pretax", balance=Decimal("500000"))
+    )
+
+    service = RetirementScenarioService(db_session)
+    scenario = SavedScenarioCreate(name="Adhoc", projection_years=5)
+    before = service.load_projection_context(scenario_data=scenario)
+    assert (
+        before.input_hash() == service.load_projection_context(scenario_data=scenario).input_hash()
+    )
+
+    AccountService(db_session).create_account(
+        AccountCreate(name="Brokerage", account_type="taxable", balance=Decimal("1000"))
+    )
+    after = service.load_projection_context(scenario_data=scenario)
+    assert before.input_hash() != after.input_hash()
+
+    result = service.generate_projection(context=after)
+    assert len(result.projections) == 5
+    assert result.initial_portfolio == Decimal("501000.00")
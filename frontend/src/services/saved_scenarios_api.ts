@@ -3,16 +3,22 @@ import type {
   SavedScenario,
   SavedScenarioCreate,
   SavedScenarioUpdate,
+  ScenarioVariant,
   ScenarioProjectionResult,
   ScenarioComparisonResult,
 } from '../types/saved_scenario';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8005';
 
+// Identifies this browser tab so the backend can cancel projection requests
+// superseded by a newer one (e.g. while a slider is being dragged).
+const SESSION_KEY = crypto.randomUUID();
+
 const apiClient = axios.create({
   baseURL: `${API_URL}/api/v1`,
   headers: {
     'Content-Type': 'application/json',
+    'X-Session-Key': SESSION_KEY,
   },
 });
 
@@ -48,6 +54,13 @@ export const savedScenariosApi = {
     return response.data;
   },
 
+  cloneVariants: async (id: string, variants: ScenarioVariant[]): Promise<SavedScenario[]> => {
+    const response = await apiClient.post<SavedScenario[]>(`/saved-scenarios/${id}/variants`, {
+      variants,
+    });
+    return response.data;
+  },
+
   getProjection: async (id: string): Promise<ScenarioProjectionResult> => {
     const response = await apiClient.get<ScenarioProjectionResult>(
       `/saved-scenarios/${id}/projection`
@@ -14,6 +14,42 @@ export interface AssetAllocation {
   other: string;                 // Other investments
 }
 
+export interface GlidePathKeyframe {
+  year?: number | null;  // Projection year (1-based), when basis is 'year'
+  age?: number | null;   // Age, when basis is 'age'
+  allocation: AssetAllocation;
+}
+
+export interface GlidePath {
+  basis: 'year' | 'age';
+  keyframes: GlidePathKeyframe[];  // Linearly interpolated between keyframes
+}
+
+export interface BucketStrategy {
+  cash_years: number;      // Years of net spending held in cash
+  balanced_years: number;  // Following years held in a 50/50 balanced mix; stocks hold the rest
+}
+
+export type SpendingPolicy = 'fixed' | 'guardrails' | 'constant_percentage' | 'floor_ceiling';
+
+export type WithdrawalStrategy =
+  | 'conventional'
+  | 'proportional'
+  | 'bracket_filling'
+  | 'roth_last'
+  | 'taxable_first';
+
+export type CostBasisMethod = 'average' | 'fifo' | 'hifo' | 'spec_id';
+
+export interface SpendingPolicyParams {
+  withdrawal_rate?: string;          // % of portfolio (percentage policies)
+  floor_percent?: string;            // % of planned spending (floor_ceiling)
+  ceiling_percent?: string;          // % of planned spending (floor_ceiling)
+  upper_guardrail_percent?: string;  // Rate rise over initial rate that cuts spending
+  lower_guardrail_percent?: string;  // Rate fall under initial rate that raises spending
+  adjustment_percent?: string;       // % change when a guardrail is hit
+}
+
 export interface SavedScenario {
   id: string;
   name: string;
@@ -25,13 +61,45 @@ export interface SavedScenario {
   inflation_adjusted_percent: string;
   spending_reduction_percent: string;
   spending_reduction_start_year: number | null;
+  spending_policy: SpendingPolicy;
+  spending_policy_params: SpendingPolicyParams | null;
   projection_years: number;
   asset_allocation: AssetAllocation;
+  glide_path: GlidePath | null;
+  bucket_strategy: BucketStrategy | null;
+  withdrawal_strategy: WithdrawalStrategy;
+  cost_basis_method: CostBasisMethod;
   return_source: 'ten_year_projections' | 'historical_average' | 'custom';
   custom_return_percent: string | null;
   inflation_rate: string;
   created_at: string;
   updated_at: string;
+  // Headline of the last projection (null until projected or after an edit)
+  final_portfolio: string | null;
+  years_until_depletion: number | null;
+  depletion_age: number | null;
+  lifetime_tax: string | null;
+  success_probability: string | null;
+  outcome_computed_at: string | null;
+}
+
+// List entry returned by GET /saved-scenarios?fields=summary
+export interface SavedScenarioSummary {
+  id: string;
+  name: string;
+  description: string | null;
+  monthly_spending: string;
+  projection_years: number;
+  spending_policy: SpendingPolicy;
+  withdrawal_strategy: WithdrawalStrategy;
+  created_at: string;
+  updated_at: string;
+  final_portfolio: string | null;
+  years_until_depletion: number | null;
+  depletion_age: number | null;
+  lifetime_tax: string | null;
+  success_probability: string | null;
+  outcome_computed_at: string | null;
 }
 
 export interface SavedScenarioCreate {
@@ -44,8 +112,14 @@ export interface SavedScenarioCreate {
   inflation_adjusted_percent: string;
   spending_reduction_percent: string;
   spending_reduction_start_year?: number | null;
+  spending_policy?: SpendingPolicy;
+  spending_policy_params?: SpendingPolicyParams | null;
   projection_years: number;
   asset_allocation: AssetAllocation;
+  glide_path?: GlidePath | null;
+  bucket_strategy?: BucketStrategy | null;
+  withdrawal_strategy?: WithdrawalStrategy;
+  cost_basis_method?: CostBasisMethod;
   return_source: '10_year_projections' | 'historical_average' | 'custom';
   custom_return_percent?: string | null;
   inflation_rate: string;
@@ -61,13 +135,25 @@ export interface SavedScenarioUpdate {
   inflation_adjusted_percent?: string;
   spending_reduction_percent?: string;
   spending_reduction_start_year?: number | null;
+  spending_policy?: SpendingPolicy;
+  spending_policy_params?: SpendingPolicyParams | null;
   projection_years?: number;
   asset_allocation?: AssetAllocation;
+  glide_path?: GlidePath | null;
+  bucket_strategy?: BucketStrategy | null;
+  withdrawal_strategy?: WithdrawalStrategy;
+  cost_basis_method?: CostBasisMethod;
   return_source?: '10_year_projections' | 'historical_average' | 'custom';
   custom_return_percent?: string | null;
   inflation_rate?: string;
 }
 
+// A copy of a scenario under a new name with some fields overridden
+export interface ScenarioVariant {
+  name: string;
+  overrides?: SavedScenarioUpdate;
+}
+
 export interface ScenarioYearProjection {
   year: number;
   calendar_year: number;
@@ -94,6 +180,8 @@ export interface ScenarioYearProjection {
   annual_lump_spending: string;
   total_spending: string;
   portfolio_withdrawal: string;
+  required_minimum_distribution: string;
+  rmd_reinvested: string;
   investment_return: string;
   return_percent: string;
   taxable_income: string;
@@ -115,6 +203,7 @@ export interface ScenarioProjectionResult {
   total_spending: string;
   total_withdrawals: string;
   ss_start_age: string;
+  spending_policy: SpendingPolicy;
   average_return_percent: string;
   inflation_rate: string;
   projections: ScenarioYearProjection[];
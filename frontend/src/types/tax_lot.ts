@@ -0,0 +1,25 @@
+export interface TaxLot {
+  id: string;
+  holding_id: string;
+  acquired_on: string;
+  quantity: string;
+  cost_basis: string;
+  sale_priority: number | null;  // Specific-ID sale order; lower sells first
+  created_at: string;
+  updated_at: string;
+}
+
+export interface TaxLotCreate {
+  holding_id: string;
+  acquired_on: string;
+  quantity: string;
+  cost_basis: string;
+  sale_priority?: number | null;
+}
+
+export interface TaxLotUpdate {
+  acquired_on?: string;
+  quantity?: string;
+  cost_basis?: string;
+  sale_priority?: number | null;
+}